@@ -1,9 +1,16 @@
 import streamlit as st
 from pathlib import Path
+from ranvier import http_pool, logs, metrics
 
 # Set page config once here
 st.set_page_config(page_title='Ranvier - Kronika', page_icon='🧠')
 
+# Set up logging, open the LLM providers' connections in the background for
+# the first crew, and start exporting metrics
+logs.configure()
+http_pool.prewarm()
+metrics.start_exporters()
+
 
 # Function to load CSS
 def load_css(file_name):
@@ -1,11 +1,25 @@
 import streamlit as st
-import pandas as pd
-import os
-from crewai import Agent, Task, Crew
-from langchain_groq import ChatGroq
+import hashlib
+from ranvier import http_pool, logs, metrics, pipeline
+from ranvier.crew_factory import LLMConfig
+from ranvier.crews import groq_ml
+from ranvier.data_profile import profile_csv
+from ranvier.jobs import DONE
+from ranvier.result_store import get_result_store
+from ranvier.ui import (connection_pool_status, follow_job,
+                        joined_runs_status, keep_run, kept_run,
+                        rate_limit_status, require_api_keys,
+                        response_cache_toggle, run_downloads,
+                        run_profile_expander, session_footprint, start_job)
 
 
 def main():
+    # Logging is set up, provider connections are opened and metrics
+    # exported from the first load
+    logs.configure()
+    http_pool.prewarm()
+    metrics.start_exporters()
+    require_api_keys(['groq'])
 
     # Set up the customization options
     st.sidebar.title('Customization')
@@ -14,11 +28,16 @@ def main():
         ['llama3-8b-8192', 'mixtral-8x7b-32768', 'gemma-7b-it']
     )
 
-    llm = ChatGroq(
-            temperature=0, 
-            groq_api_key = os.getenv("GROQ_API_KEY"), 
-            model_name=model
-        )
+    # The Groq client is shared across reruns and sessions by the crew factory
+    use_cache = response_cache_toggle()
+    rate_limit_status()
+    connection_pool_status()
+    joined_runs_status()
+    session_footprint()
+    llm_config = LLMConfig(provider='groq',
+                           model=model,
+                           temperature=0,
+                           use_cache=use_cache)
     
     # Streamlit UI
     st.title('CrewAI Machine Learning Assistant')
@@ -33,161 +52,102 @@ def main():
     with col:  
         st.image('groqcloud_darkmode.png')
 
-
-    Problem_Definition_Agent = Agent(
-        role='Problem_Definition_Agent',
-        goal="""clarify the machine learning problem the user wants to solve, 
-            identifying the type of problem (e.g., classification, regression) and any specific requirements.""",
-        backstory="""You are an expert in understanding and defining machine learning problems. 
-            Your goal is to extract a clear, concise problem statement from the user's input, 
-            ensuring the project starts with a solid foundation.""",
-        verbose=True,
-        allow_delegation=False,
-        llm=llm,
-    )
-
-    Data_Assessment_Agent = Agent(
-        role='Data_Assessment_Agent',
-        goal="""evaluate the data provided by the user, assessing its quality, 
-            suitability for the problem, and suggesting preprocessing steps if necessary.""",
-        backstory="""You specialize in data evaluation and preprocessing. 
-            Your task is to guide the user in preparing their dataset for the machine learning model, 
-            including suggestions for data cleaning and augmentation.""",
-        verbose=True,
-        allow_delegation=False,
-        llm=llm,
-    )
-
-    Model_Recommendation_Agent = Agent(
-        role='Model_Recommendation_Agent',
-        goal="""suggest the most suitable machine learning models based on the problem definition 
-            and data assessment, providing reasons for each recommendation.""",
-        backstory="""As an expert in machine learning algorithms, you recommend models that best fit 
-            the user's problem and data. You provide insights into why certain models may be more effective than others,
-            considering classification vs regression and supervised vs unsupervised frameworks.""",
-        verbose=True,
-        allow_delegation=False,
-        llm=llm,
-    )
-
-
-    Starter_Code_Generator_Agent = Agent(
-        role='Starter_Code_Generator_Agent',
-        goal="""generate starter Python code for the project, including data loading, 
-            model definition, and a basic training loop, based on findings from the problem definitions,
-            data assessment and model recommendation""",
-        backstory="""You are a code wizard, able to generate starter code templates that users 
-            can customize for their projects. Your goal is to give users a head start in their coding efforts.""",
-        verbose=True,
-        allow_delegation=False,
-        llm=llm,
-    )
-
-    # Summarization_Agent = Agent(
-    #     role='Starter_Code_Generator_Agent',
-    #     goal="""Summarize findings from each of the previous steps of the ML discovery process.
-    #         Include all findings from the problem definitions, data assessment and model recommendation 
-    #         and all code provided from the starter code generator.
-    #         """,
-    #     backstory="""You are a seasoned data scientist, able to break down machine learning problems for
-    #         less experienced practitioners, provide valuable insight into the problem and why certain ML models
-    #         are appropriate, and write good, simple code to help get started on solving the problem.
-    #         """,
-    #     verbose=True,
-    #     allow_delegation=False,
-    #     llm=llm,
-    # )
-
     user_question = st.text_input("Describe your ML problem:")
     data_upload = False
     uploaded_file = st.file_uploader("Upload a sample .csv of your data (optional)")
     if uploaded_file is not None:
         try:
-            # Attempt to read the uploaded file as a DataFrame
-            df = pd.read_csv(uploaded_file).head(5)
+            # Profile the whole upload in one chunked pass, so large files
+            # never sit parsed in memory; reruns reuse the profile of the
+            # same upload
+            cached = st.session_state.get('ml_profile')
+            if cached is None or cached[0] != uploaded_file.file_id:
+                data_hash = hashlib.sha256(uploaded_file.getvalue()).hexdigest()
+                cached = (uploaded_file.file_id, profile_csv(uploaded_file),
+                          data_hash)
+                st.session_state['ml_profile'] = cached
+            _, profile, data_hash = cached
+            sample = profile.sample
+            df = sample.frame
             
             # If successful, set 'data_upload' to True
             data_upload = True
             
-            # Display the DataFrame in the app
-            st.write("Data successfully uploaded and read as DataFrame:")
+            # Display the sample in the app
+            scanned = f"{sample.rows_seen:,} rows"
+            if sample.truncated:
+                scanned = f"the first {scanned}"
+            st.write(f"Data successfully uploaded; {len(df)} rows sampled "
+                     f"from {scanned}:")
             st.dataframe(df)
+            with st.expander("Dataset profile sent to the assistant"):
+                st.text(profile.text())
         except Exception as e:
             st.error(f"Error reading the file: {e}")
 
-    if user_question:
-
-        task_define_problem = Task(
-        description="""Clarify and define the machine learning problem, 
-            including identifying the problem type and specific requirements.
-            
-            Here is the user's problem:
-
-            {ml_problem}
-            """.format(ml_problem=user_question),
-        agent=Problem_Definition_Agent,
-        expected_output="A clear and concise definition of the machine learning problem."
-        )
-
-        if data_upload:
-            task_assess_data = Task(
-                description="""Evaluate the user's data for quality and suitability, 
-                suggesting preprocessing or augmentation steps if needed.
-                
-                Here is a sample of the user's data:
-
-                {df}
-
-                The file name is called {uploaded_file}
-                
-                """.format(df=df.head(),uploaded_file=uploaded_file),
-                agent=Data_Assessment_Agent,
-                expected_output="An assessment of the data's quality and suitability, with suggestions for preprocessing or augmentation if necessary."
-            )
+    # The crew only runs on request; editing the question, the model or the
+    # upload just reruns the script
+    if st.button('Run Assistant'):
+        if not user_question:
+            st.warning("Please describe your ML problem.")
         else:
-            task_assess_data = Task(
-                description="""The user has not uploaded any specific data for this problem,
-                but please go ahead and consider a hypothetical dataset that might be useful
-                for their machine learning problem. 
-                """,
-                agent=Data_Assessment_Agent,
-                expected_output="A hypothetical dataset that might be useful for the user's machine learning problem, along with any necessary preprocessing steps."
-            )
-
-        task_recommend_model = Task(
-        description="""Suggest suitable machine learning models for the defined problem 
-            and assessed data, providing rationale for each suggestion.""",
-        agent=Model_Recommendation_Agent,
-        expected_output="A list of suitable machine learning models for the defined problem and assessed data, along with the rationale for each suggestion."
-        )
-
-
-        task_generate_code = Task(
-        description="""Generate starter Python code tailored to the user's project using the model recommendation agent's recommendation(s), 
-            including snippets for package import, data handling, model definition, and training
-            """,
-        agent=Starter_Code_Generator_Agent,
-        expected_output="Python code snippets for package import, data handling, model definition, and training, tailored to the user's project, plus a brief summary of the problem and model recommendations."
-        )
-
-        # task_summarize = Task(
-        #     description="""
-        #     Summarize the results of the problem definition, data assessment, model recommendation and starter code generator.
-        #     Keep the summarization brief and don't forget to share the entirety of the starter code!
-        #     """,
-        #     agent=Summarization_Agent
-        # )
-
-
-        crew = Crew(
-            agents=[Problem_Definition_Agent, Data_Assessment_Agent, Model_Recommendation_Agent,  Starter_Code_Generator_Agent], #, Summarization_Agent],
-            tasks=[task_define_problem, task_assess_data, task_recommend_model,  task_generate_code], #, task_summarize],
-            verbose=2
-        )
+            inputs = {"ml_problem": user_question}
+            if data_upload:
+                inputs["data_profile"] = profile.text()
+                inputs["file_name"] = uploaded_file.name
+            spec = groq_ml.DATA_CREW if data_upload else groq_ml.CREW
+
+            # Answers are memoized by problem, uploaded data and model
+            store = get_result_store()
+            result_key = store.key(
+                spec.name,
+                user_question,
+                llm_config,
+                spec.fingerprint,
+                options={
+                    'data': data_hash if data_upload else None,
+                    'file_name': inputs.get('file_name'),
+                },
+                free_text=True)
+            stored = store.get(result_key)
+            if stored:
+                st.success("Answer loaded from stored results!")
+                keep_run('ml_run', {'result': stored['result']})
+            else:
+                # The crew runs in the background job runner, not in this
+                # script
+                def run_assistant(job):
+                    run = pipeline.run(spec, llm_config, inputs, job=job)
+                    store.put(result_key, run['result'],
+                              run['detailed_results'])
+                    return run
+
+                st.session_state.pop('ml_run', None)
+                job = start_job('ml_job',
+                                spec.name,
+                                run_assistant,
+                                dedup_key=result_key)
+                if job.requesters > 1:
+                    st.info("The same question is already being answered; "
+                            "its answer will be shown here too.")
+
+    # Follow the background run; results survive reruns and reconnects
+    job = follow_job('ml_job', 'Running CrewAI tasks...')
+    if job is not None:
+        if job.status == DONE:
+            # Only a handle stays in the session; see ranvier.run_records
+            keep_run('ml_run', dict(job.result, profile=job.profile))
+        else:
+            st.error(f"An error occurred: {job.error}")
 
-        result = crew.kickoff()
+    run = kept_run('ml_run')
+    if run is not None:
+        st.write(run['result'])
+        run_downloads('ml_run', run, 'groq_ml')
 
-        st.write(result)
+        # Show the timing waterfall of the last run
+        if run.get('profile') is not None:
+            run_profile_expander(run['profile'])
 
 
 if __name__ == "__main__":
@@ -0,0 +1,61 @@
+import streamlit as st
+from datetime import datetime
+from ranvier.archive import get_archive
+from ranvier.ui import run_downloads
+
+
+def show_run(run_id):
+    run = get_archive().get(run_id)
+    if run is None:
+        st.warning("This run is no longer in the archive.")
+        return
+    st.write(run['result'])
+    run_downloads(f'archive_{run_id}', run, f"{run['page']}_{run_id}")
+    with st.expander("Show detailed results"):
+        for detail in run['detailed_results']:
+            st.write(f"**Task:** {detail['task']}")
+            result = detail['result']
+            st.write("**Result:** "
+                     f"{'No output available for this task.' if result is None else result}")
+            st.write("---")
+
+
+def main():
+    st.set_page_config(page_title='Run Archive', page_icon='🗂️')
+    st.title('🗂️ Run Archive')
+    st.markdown("Search the reviews, differentials and project analyses that "
+                "have already been run, instead of running the crew again.")
+
+    archive = get_archive()
+    stats = archive.stats()
+    st.sidebar.caption(f"Archive: {stats['runs']} runs "
+                       f"({stats['bytes'] / 1e6:.1f} MB)")
+    page = st.sidebar.selectbox('Page', ['All pages'] + archive.pages())
+
+    query = st.text_input("Search past runs:", "")
+    runs = archive.search(query, page=None if page == 'All pages' else page)
+    if not runs:
+        st.info("No archived runs match your search." if query else
+                "No runs have been archived yet.")
+
+    for run in runs:
+        created = datetime.fromtimestamp(run['created']).strftime(
+            '%Y-%m-%d %H:%M')
+        title = run['inputs'].splitlines()[0][:80] if run['inputs'] else ''
+        opened = st.session_state.get('archive_open') == run['id']
+        with st.expander(f"{title} · {run['page']} · {created}",
+                         expanded=opened):
+            seconds = (f", {run['seconds']:.0f} s"
+                       if run['seconds'] is not None else '')
+            st.caption(f"{run['model']}{seconds}")
+            if query:
+                st.markdown(run['snippet'])
+            if opened:
+                show_run(run['id'])
+            elif st.button("Open", key=f"open_{run['id']}"):
+                st.session_state['archive_open'] = run['id']
+                st.rerun()
+
+
+if __name__ == "__main__":
+    main()
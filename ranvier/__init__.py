@@ -0,0 +1,6 @@
+"""Shared runtime for the Ranvier-Kronika Streamlit pages.
+
+Every page in ``pages/`` is re-executed by Streamlit on each interaction, so
+anything that should outlive a rerun (LLM clients, caches, stores)
+lives in this package, whose modules are imported once per process.
+"""
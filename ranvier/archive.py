@@ -0,0 +1,188 @@
+"""Searchable archive of completed crew runs.
+
+Every run that finishes through ``ranvier.pipeline.run`` is archived here:
+its page, inputs, model routes, final answer, task outputs and timings. The
+inputs and the answer live in an SQLite FTS5 table, so past results are found
+by full-text search ranked with BM25. Task outputs and the profile are kept
+alongside as zlib-compressed JSON, and only read when a run is opened. The
+archive is bounded: once its payload exceeds ``ARCHIVE_MAX_MB``, the oldest
+runs are dropped first. Unlike the result store, nothing expires and nothing
+is keyed for reuse; the archive is for people looking things up.
+"""
+import json
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Optional
+
+from ranvier import settings
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    page TEXT NOT NULL,
+    model TEXT NOT NULL,
+    created REAL NOT NULL,
+    seconds REAL,
+    details BLOB NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_created ON runs (created);
+CREATE VIRTUAL TABLE IF NOT EXISTS runs_text USING fts5(
+    inputs, result, tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+_WORD = re.compile(r'\w+', re.UNICODE)
+
+
+def match_query(text: str) -> str:
+    """Turn free text into an FTS5 query: every word, the last as a prefix."""
+    words = _WORD.findall(text)
+    if not words:
+        return ''
+    return ' '.join(f'"{word}"' for word in words[:-1]) + f' "{words[-1]}"*'
+
+
+class RunArchive:
+    """SQLite archive of finished runs with a full-text index."""
+
+    def __init__(self, path, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(_SCHEMA)
+        self._total = self._conn.execute(
+            'SELECT COALESCE(SUM(size), 0) FROM runs').fetchone()[0]
+
+    def add(self,
+            page: str,
+            inputs: dict,
+            model: str,
+            result: str,
+            detailed_results: list,
+            seconds: Optional[float] = None,
+            profile: Optional[dict] = None) -> int:
+        """Archive one finished run and return its id."""
+        details = zlib.compress(
+            json.dumps({
+                'inputs': inputs,
+                'detailed_results': detailed_results,
+                'profile': profile,
+            }).encode('utf-8'))
+        text = '\n'.join(str(value) for value in inputs.values())
+        size = len(details) + len(text.encode('utf-8')) + len(
+            (result or '').encode('utf-8'))
+        with self._lock:
+            cursor = self._conn.execute(
+                'INSERT INTO runs (page, model, created, seconds, details, '
+                'size) VALUES (?, ?, ?, ?, ?, ?)',
+                (page, model, time.time(), seconds, details, size))
+            run_id = cursor.lastrowid
+            self._conn.execute(
+                'INSERT INTO runs_text (rowid, inputs, result) '
+                'VALUES (?, ?, ?)', (run_id, text, result or ''))
+            self._total += size
+            self._evict()
+            self._conn.commit()
+        return run_id
+
+    def search(self,
+               query: str = '',
+               page: Optional[str] = None,
+               limit: int = 20) -> list:
+        """Newest runs, or the best matches for ``query``, as summaries."""
+        match = match_query(query)
+        where, params = [], []
+        if match:
+            where.append('runs_text MATCH ?')
+            params.append(match)
+        if page:
+            where.append('runs.page = ?')
+            params.append(page)
+        sql = ('SELECT runs.id, runs.page, runs.model, runs.created, '
+               'runs.seconds, runs_text.inputs, '
+               "snippet(runs_text, 1, '**', '**', ' … ', 24) "
+               'FROM runs_text JOIN runs ON runs.id = runs_text.rowid')
+        if where:
+            sql += ' WHERE ' + ' AND '.join(where)
+        sql += ' ORDER BY ' + ('bm25(runs_text, 4.0, 1.0)'
+                               if match else 'runs.created DESC')
+        sql += ' LIMIT ?'
+        with self._lock:
+            rows = self._conn.execute(sql, params + [limit]).fetchall()
+        return [{
+            'id': row[0],
+            'page': row[1],
+            'model': row[2],
+            'created': row[3],
+            'seconds': row[4],
+            'inputs': row[5],
+            'snippet': row[6],
+        } for row in rows]
+
+    def get(self, run_id: int) -> Optional[dict]:
+        """The full archived run, or None if it was evicted."""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT runs.page, runs.model, runs.created, runs.seconds, '
+                'runs.details, runs_text.result FROM runs JOIN runs_text '
+                'ON runs.id = runs_text.rowid WHERE runs.id = ?',
+                (run_id, )).fetchone()
+        if row is None:
+            return None
+        details = json.loads(zlib.decompress(row[4]))
+        return dict(details,
+                    id=run_id,
+                    page=row[0],
+                    model=row[1],
+                    created=row[2],
+                    seconds=row[3],
+                    result=row[5])
+
+    def pages(self) -> list:
+        """Names of the pages that have archived runs."""
+        with self._lock:
+            return [
+                row[0] for row in self._conn.execute(
+                    'SELECT DISTINCT page FROM runs ORDER BY page')
+            ]
+
+    def stats(self) -> dict:
+        with self._lock:
+            runs = self._conn.execute('SELECT COUNT(*) FROM runs').fetchone()[0]
+        return {'runs': runs, 'bytes': self._total}
+
+    def _evict(self) -> None:
+        # Called with the lock held; drops the oldest runs first
+        while self._total > self.max_bytes:
+            rows = self._conn.execute(
+                'SELECT id, size FROM runs ORDER BY created LIMIT 32').fetchall()
+            if not rows:
+                break
+            for run_id, size in rows:
+                self._conn.execute('DELETE FROM runs WHERE id = ?', (run_id, ))
+                self._conn.execute('DELETE FROM runs_text WHERE rowid = ?',
+                                   (run_id, ))
+                self._total -= size
+                if self._total <= self.max_bytes:
+                    break
+
+
+_archive = None
+_archive_lock = threading.Lock()
+
+
+def get_archive() -> RunArchive:
+    """Return the process-wide run archive, opening it on first use."""
+    global _archive
+    if _archive is None:
+        with _archive_lock:
+            if _archive is None:
+                _archive = RunArchive(settings.data_path('archive.sqlite'),
+                                      max_bytes=int(settings.ARCHIVE_MAX_MB *
+                                                    1e6))
+    return _archive
@@ -0,0 +1,249 @@
+"""Headless batch runner for disease reviews.
+
+Runs the disease review crew over every disease listed in a CSV or text file
+and writes one markdown file per disease plus a ``manifest.jsonl`` with the
+timings and token counts of every run::
+
+    python -m ranvier.batch diseases.csv --out reviews --concurrency 4 \\
+        --rate-limit google=60
+
+A text file lists one disease per line; a CSV file is read from its first
+column or from ``--column``. A CSV file has a header row when ``--column``
+is given or when it looks like one (``csv.Sniffer``, or a first cell such as
+``disease`` or ``name``); otherwise every row is a disease. Reruns are resumable: diseases whose manifest
+record says ``done`` and whose markdown file still exists are skipped.
+Reviews already in the result store are reused instead of run again, and
+new ones are stored there, so the app serves them too.
+"""
+import argparse
+import csv
+import hashlib
+import json
+import logging
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import replace
+from pathlib import Path
+
+from ranvier import logs, metrics, pipeline, settings
+from ranvier.crews import disease_review
+from ranvier.profiling import RunProfile, get_profile_store
+from ranvier.rate_limit import set_rate_limit
+from ranvier.result_store import get_result_store, normalize_query
+
+logger = logging.getLogger(__name__)
+
+MANIFEST = 'manifest.jsonl'
+
+# First cells that mark a header row the sniffer cannot tell apart, e.g. in
+# a single-column file
+_HEADER_NAMES = {'disease', 'diseases', 'disease name', 'name', 'enfermedad'}
+
+
+def _read_csv(f, path: Path, column=None) -> list:
+    sample = f.read(64 * 1024)
+    f.seek(0)
+    sniffer = csv.Sniffer()
+    try:
+        dialect = sniffer.sniff(sample, delimiters=',;\t|')
+    except csv.Error:
+        dialect = csv.excel  # a single column has no delimiter to find
+    rows = [row for row in csv.reader(f, dialect) if any(row)]
+    if not rows:
+        return []
+    try:
+        has_header = sniffer.has_header(sample)
+    except csv.Error:
+        has_header = False
+    has_header = (column is not None or has_header
+                  or normalize_query(rows[0][0]) in _HEADER_NAMES)
+    header = [name.strip() for name in rows.pop(0)] if has_header else []
+    index = 0
+    if column is not None:
+        if column not in header:
+            raise ValueError(f'{path} has no column {column!r}; its columns '
+                             f'are {", ".join(map(repr, header))}')
+        index = header.index(column)
+    return [row[index] if index < len(row) else '' for row in rows]
+
+
+def read_diseases(path: Path, column=None) -> list:
+    """Disease names from ``path``, without blanks, comments or duplicates.
+
+    Raises ``ValueError`` when ``column`` is not a column of a CSV file.
+    """
+    # utf-8-sig drops the byte order mark spreadsheet exports start with
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        if path.suffix.lower() == '.csv':
+            names = _read_csv(f, path, column)
+        else:
+            names = [line for line in f if not line.lstrip().startswith('#')]
+    diseases = {}
+    for name in names:
+        name = name.strip()
+        if name:
+            diseases.setdefault(normalize_query(name), name)
+    return list(diseases.values())
+
+
+def review_filename(disease: str) -> str:
+    slug = normalize_query(disease).replace(' ', '_')
+    return (slug or hashlib.sha1(disease.encode('utf-8')).hexdigest()) + '.md'
+
+
+def completed(out_dir: Path) -> set:
+    """Normalized names of the diseases a previous run finished."""
+    done = set()
+    manifest = out_dir / MANIFEST
+    if not manifest.exists():
+        return done
+    with open(manifest, encoding='utf-8') as f:
+        for line in f:
+            record = json.loads(line)
+            if (record['status'] == 'done'
+                    and (out_dir / record['file']).exists()):
+                done.add(normalize_query(record['disease']))
+    return done
+
+
+def run_review(disease: str, llm_config, out_dir: Path, force: bool,
+               context_budget=None) -> dict:
+    """Produce one review and return its manifest record."""
+    store = get_result_store()
+    spec = disease_review.CREW
+    options = {'context_budget': context_budget}
+    key = store.key(spec.name, disease, llm_config, spec.fingerprint, options)
+    profile = RunProfile(run_id=uuid.uuid4().hex,
+                         page=spec.name,
+                         submitted=time.time())
+    record = {'disease': disease, 'file': review_filename(disease)}
+    profile.started = time.time()
+    try:
+        stored = None if force else store.get(key)
+        if stored:
+            result = stored['result']
+        else:
+            run = pipeline.run(spec,
+                               llm_config, {'disease_name': disease},
+                               profile=profile,
+                               context_budget=context_budget)
+            result = run['result']
+            store.put(key,
+                      result,
+                      run['detailed_results'],
+                      namespace=store.namespace(spec.name, llm_config,
+                                                spec.fingerprint, options),
+                      query=disease)
+        (out_dir / record['file']).write_text(result, encoding='utf-8')
+        record.update(status='done', from_store=bool(stored), error=None)
+    except Exception as e:
+        logger.exception('Review of %s failed', disease)
+        record.update(status='failed', from_store=False, error=str(e))
+    profile.finished = time.time()
+    profile.status = record['status']
+    if profile.tasks:
+        get_profile_store().put(profile)
+    record.update(
+        run_id=profile.run_id,
+        started=profile.started,
+        seconds=round(profile.seconds, 3),
+        prompt_tokens=sum(t.prompt_tokens for t in profile.tasks),
+        context_tokens_saved=sum(t.context_tokens_saved
+                                 for t in profile.tasks),
+        completion_tokens=sum(t.completion_tokens for t in profile.tasks),
+        llm_calls=sum(len(t.llm_calls) for t in profile.tasks),
+        routes={
+            route: dict(r, seconds=round(r['seconds'], 3))
+            for route, r in profile.by_route().items()
+        },
+        tasks=[{
+            'agent': t.agent,
+            'seconds': round(t.seconds, 3),
+            'queue_wait': round(t.queue_wait, 3),
+            'prompt_tokens': t.prompt_tokens,
+            'completion_tokens': t.completion_tokens,
+        } for t in sorted(profile.tasks, key=lambda t: t.index)])
+    return record
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='python -m ranvier.batch',
+        description='Write disease reviews for every disease in a file.')
+    parser.add_argument('diseases',
+                        type=Path,
+                        help='CSV or text file with one disease per row')
+    parser.add_argument('--column', help='CSV column holding the disease')
+    parser.add_argument('--out',
+                        type=Path,
+                        default=Path('reviews'),
+                        help='output directory (default: reviews)')
+    parser.add_argument('--concurrency',
+                        type=int,
+                        default=2,
+                        help='reviews running at the same time (default: 2)')
+    parser.add_argument('--rate-limit',
+                        action='append',
+                        default=[],
+                        metavar='PROVIDER[/MODEL]=RPM[:TPM]',
+                        help='requests (and tokens) per minute for a provider '
+                        'or model; repeatable')
+    parser.add_argument('--context-budget',
+                        type=int,
+                        metavar='TOKENS',
+                        help='compact the synthesis task context to TOKENS')
+    parser.add_argument('--force',
+                        action='store_true',
+                        help='run every disease again, ignoring the manifest '
+                        'and the result store')
+    parser.add_argument('--no-cache',
+                        action='store_true',
+                        help='do not use the LLM response cache')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO,
+                        format='%(asctime)s %(levelname)s %(message)s')
+    logs.configure()
+    metrics.start_exporters()
+    limits = settings.parse_rate_limits(','.join(args.rate_limit))
+    for key, (rpm, tpm) in limits.items():
+        set_rate_limit(key, rpm, tpm)
+
+    llm_config = replace(disease_review.LLM_CONFIG,
+                         use_cache=not args.no_cache)
+    args.out.mkdir(parents=True, exist_ok=True)
+    try:
+        diseases = read_diseases(args.diseases, args.column)
+    except ValueError as e:
+        parser.error(str(e))
+    done = set() if args.force else completed(args.out)
+    pending = [d for d in diseases if normalize_query(d) not in done]
+    logger.info('%d diseases, %d already done, %d to run', len(diseases),
+                len(diseases) - len(pending), len(pending))
+
+    failed = 0
+    with ThreadPoolExecutor(max_workers=max(1, args.concurrency)) as pool, \
+            open(args.out / MANIFEST, 'a', encoding='utf-8') as manifest:
+        futures = [
+            pool.submit(run_review, disease, llm_config, args.out, args.force,
+                        args.context_budget)
+            for disease in pending
+        ]
+        for future in as_completed(futures):
+            record = future.result()
+            manifest.write(json.dumps(record, ensure_ascii=False) + '\n')
+            manifest.flush()
+            failed += record['status'] != 'done'
+            logger.info('%s: %s in %.1f s', record['disease'],
+                        record['status'], record['seconds'])
+    logger.info('Finished: %d done, %d failed', len(pending) - failed, failed)
+    if settings.METRICS_FILE:
+        # The periodic writer may not have caught the last reviews
+        metrics.write_file(settings.METRICS_FILE)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
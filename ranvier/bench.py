@@ -0,0 +1,286 @@
+"""Offline benchmark of every crew against the fake chat model.
+
+Runs each crew headlessly through the scheduler, with ``FakeChatModel``
+answering at a fixed latency and token rate, and reports per crew the wall
+time, CPU time, peak RSS and per-task overhead (time a task spends outside
+its LLM calls: prompt building, parsing, callbacks)::
+
+    python -m ranvier.bench --repeat 5 --out bench.json
+    python -m ranvier.bench --baseline bench.json --tolerance 0.2
+
+Every crew runs in a fresh process so its peak RSS and its first, cold run
+are its own. The first run is reported as ``cold``; the median of the
+remaining runs as ``warm``. The JSON output records the commit and the fake
+model's pace, so files from two commits can be compared with
+``--baseline``, which exits with 1 when a crew got slower than the
+tolerance allows.
+"""
+import argparse
+import contextlib
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from ranvier import settings
+
+logger = logging.getLogger(__name__)
+
+# crew name -> (module in ranvier.crews, its CrewSpec, inputs)
+CREWS = {
+    'disease_review': ('disease_review', 'CREW', {
+        'disease_name': 'Dengue'
+    }),
+    'chief_complaint': ('chief_complaint', 'CREW', {
+        'chief_complaint': 'Chest pain on exertion'
+    }),
+    'bayesian_reasoning': ('bayesian_reasoning', 'CREW', {
+        'clinical_history': '58-year-old smoker with hypertension',
+        'chief_complaint': 'Shortness of breath',
+    }),
+    'code_project': ('code_project', 'CREW', {
+        'project_idea': 'A mobile app that tracks medication adherence'
+    }),
+    'groq_ml': ('groq_ml', 'CREW', {
+        'ml_problem': 'Predict hospital readmission within 30 days'
+    }),
+    'groq_ml_data': ('groq_ml', 'DATA_CREW', {
+        'ml_problem': 'Predict hospital readmission within 30 days',
+        'data_profile': ('3 rows, 3 columns\n'
+                         '- age (int64): missing 0.0%; 3 distinct\n'
+                         '- visits (int64): missing 0.0%; 3 distinct\n'
+                         '- readmitted (int64): missing 0.0%; 2 distinct; '
+                         'classes 0 66.7%, 1 33.3%'),
+        'file_name': 'readmissions.csv',
+    }),
+}
+
+# Measures compared by --baseline, all lower is better
+COMPARED = ('wall_seconds', 'cpu_seconds', 'overhead_seconds')
+
+
+def _peak_rss_mb():
+    try:
+        import resource
+    except ImportError:  # not available on Windows
+        return None
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    scale = 1 if sys.platform == 'darwin' else 1024
+    return resource.getrusage(
+        resource.RUSAGE_SELF).ru_maxrss * scale / 2**20
+
+
+def _run_once(name: str, max_workers) -> dict:
+    # Imported here so the parent of isolated runs stays free of crewAI
+    from importlib import import_module
+
+    from ranvier.crew_factory import LLMConfig, new_crew
+    from ranvier.profiling import RunProfile
+    from ranvier.scheduler import run_crew
+
+    module, attribute, inputs = CREWS[name]
+    spec = getattr(import_module(f'ranvier.crews.{module}'), attribute)
+    config = LLMConfig(provider='fake', model=name, use_cache=False)
+    profile = RunProfile(run_id=uuid.uuid4().hex,
+                         page=name,
+                         submitted=time.time())
+
+    started = time.perf_counter()
+    cpu_started = time.process_time()
+    crew = new_crew(spec.name, spec.build, config)
+    built = time.perf_counter()
+    profile.started = time.time()
+    # Agents may be verbose (RANVIER_VERBOSE_AGENTS); their console output is
+    # part of the cost but not of the report
+    with open(os.devnull, 'w') as devnull, \
+            contextlib.redirect_stdout(devnull):
+        run_crew(crew, inputs, max_workers=max_workers, profile=profile)
+    profile.finished = time.time()
+    finished = time.perf_counter()
+
+    tasks = [{
+        'index': t.index,
+        'agent': t.agent,
+        'seconds': t.seconds,
+        'llm_seconds': t.llm_seconds,
+        'overhead_seconds': t.seconds - t.llm_seconds,
+        'llm_calls': len(t.llm_calls),
+        'prompt_tokens': t.prompt_tokens,
+        'completion_tokens': t.completion_tokens,
+    } for t in sorted(profile.tasks, key=lambda t: t.index)]
+    return {
+        'build_seconds': built - started,
+        'wall_seconds': finished - started,
+        'cpu_seconds': time.process_time() - cpu_started,
+        'llm_seconds': sum(t['llm_seconds'] for t in tasks),
+        'overhead_seconds': sum(t['overhead_seconds'] for t in tasks),
+        'prompt_tokens': sum(t['prompt_tokens'] for t in tasks),
+        'completion_tokens': sum(t['completion_tokens'] for t in tasks),
+        'tasks': tasks,
+    }
+
+
+def bench_crew(name: str, repeat: int, max_workers,
+               fake_options: dict) -> dict:
+    """Run crew ``name`` ``repeat`` times in this process and summarize."""
+    from ranvier import fake_llm
+
+    fake_llm.configure(**fake_options)
+    imported = time.perf_counter()
+    runs = [_run_once(name, max_workers) for _ in range(repeat)]
+    warm = runs[1:] or runs
+    return {
+        'crew': name,
+        'cold': runs[0],
+        'warm': {
+            key: statistics.median(run[key] for run in warm)
+            for key in runs[0] if key != 'tasks'
+        },
+        'warm_tasks': [{
+            'index': task['index'],
+            'agent': task['agent'],
+            'overhead_seconds': statistics.median(
+                run['tasks'][i]['overhead_seconds'] for run in warm),
+        } for i, task in enumerate(runs[0]['tasks'])],
+        'runs': len(runs),
+        'total_seconds': time.perf_counter() - imported,
+        'peak_rss_mb': _peak_rss_mb(),
+    }
+
+
+def _isolated(name: str, *args) -> dict:
+    # A fresh interpreter per crew keeps peak RSS and the cold run its own
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        return pool.submit(bench_crew, name, *args).result()
+
+
+def _commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'],
+                              capture_output=True,
+                              text=True,
+                              check=True,
+                              cwd=Path(__file__).parent).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> list:
+    """(crew, measure, baseline, current) for every warm regression."""
+    before = {r['crew']: r['warm'] for r in baseline['results']}
+    regressions = []
+    for result in report['results']:
+        old = before.get(result['crew'])
+        if old is None:
+            continue
+        for measure in COMPARED:
+            if result['warm'][measure] > old[measure] * (1 + tolerance):
+                regressions.append((result['crew'], measure, old[measure],
+                                    result['warm'][measure]))
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='python -m ranvier.bench',
+        description='Benchmark every crew offline against a fake model.')
+    parser.add_argument('--crew',
+                        action='append',
+                        choices=sorted(CREWS),
+                        help='crew to run; repeatable (default: all)')
+    parser.add_argument('--repeat',
+                        type=int,
+                        default=3,
+                        help='runs per crew, the first one cold (default: 3)')
+    parser.add_argument('--max-workers',
+                        type=int,
+                        help='tasks run at once (default: '
+                        'RANVIER_MAX_PARALLEL_TASKS)')
+    parser.add_argument('--latency',
+                        type=float,
+                        default=settings.FAKE_LLM_LATENCY,
+                        help='fake model seconds to first token')
+    parser.add_argument('--tokens-per-second',
+                        type=float,
+                        default=settings.FAKE_LLM_TOKENS_PER_SECOND,
+                        help='fake model token rate, 0 for instant answers')
+    parser.add_argument('--response-tokens',
+                        type=int,
+                        default=300,
+                        help='length of every fake answer (default: 300)')
+    parser.add_argument('--in-process',
+                        action='store_true',
+                        help='run every crew in this process; peak RSS is '
+                        'then cumulative')
+    parser.add_argument('--out',
+                        type=Path,
+                        help='write the JSON report here instead of stdout')
+    parser.add_argument('--baseline',
+                        type=Path,
+                        help='JSON report to compare the warm runs with')
+    parser.add_argument('--tolerance',
+                        type=float,
+                        default=0.2,
+                        help='allowed slowdown against --baseline '
+                        '(default: 0.2)')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO,
+                        format='%(asctime)s %(levelname)s %(message)s')
+    fake_options = {
+        'latency': args.latency,
+        'tokens_per_second': args.tokens_per_second,
+        'response_tokens': args.response_tokens,
+    }
+    run = bench_crew if args.in_process else _isolated
+    results = []
+    for name in args.crew or list(CREWS):
+        result = run(name, max(1, args.repeat), args.max_workers,
+                     fake_options)
+        results.append(result)
+        logger.info(
+            '%s: cold %.2f s, warm %.2f s wall / %.2f s CPU, '
+            '%.3f s overhead, peak RSS %s MB', name,
+            result['cold']['wall_seconds'], result['warm']['wall_seconds'],
+            result['warm']['cpu_seconds'], result['warm']['overhead_seconds'],
+            result['peak_rss_mb'] and round(result['peak_rss_mb']))
+
+    report = {
+        'commit': _commit(),
+        'created': time.time(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'max_workers': args.max_workers or settings.MAX_PARALLEL_TASKS,
+        'isolated': not args.in_process,
+        'fake_llm': fake_options,
+        'results': results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.out:
+        args.out.write_text(text + '\n', encoding='utf-8')
+    else:
+        print(text)
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding='utf-8'))
+        if baseline.get('fake_llm') != fake_options:
+            logger.warning('The baseline used another fake model pace: %s',
+                           baseline.get('fake_llm'))
+        regressions = compare(report, baseline, args.tolerance)
+        for crew, measure, old, new in regressions:
+            logger.warning('%s %s: %.3f -> %.3f', crew, measure, old, new)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,82 @@
+"""Extractive compaction of upstream context before a synthesis task.
+
+A synthesis task receives the full output of every task in its ``context``.
+With six upstream outputs this inflates prompt tokens and can overflow an 8k
+window. ``compact_context`` trims the combined text to a token budget without
+calling a model. It splits each upstream output into sentences and bullet
+lines. Each segment is scored with TF-IDF by its similarity to the task's own
+description and to the upstream text as a whole. The best segments are kept
+in their original order, and each upstream output keeps at least its best
+segment. The result depends only on the inputs and is cached in-process.
+"""
+import functools
+import re
+from typing import Sequence
+
+from ranvier.profiling import estimate_tokens
+
+# Sentence ends and line breaks; markdown bullets and headings stay whole
+_SEGMENT = re.compile(r'(?<=[.!?])\s+(?=[A-Z0-9¿¡*#-])|\n+')
+
+
+def _segments(text: str) -> list:
+    return [s.strip() for s in _SEGMENT.split(text) if s and s.strip()]
+
+
+def _join(upstream: Sequence[str]) -> str:
+    # The same separator crewAI uses between context outputs
+    return '\n'.join(upstream)
+
+
+@functools.lru_cache(maxsize=256)
+def _compact(query: str, upstream: tuple, budget: int) -> str:
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.metrics.pairwise import cosine_similarity
+
+    segments = [(i, j, segment) for i, text in enumerate(upstream)
+                for j, segment in enumerate(_segments(text))]
+    if not segments:
+        return _join(upstream)
+    texts = [segment for _, _, segment in segments]
+    vectorizer = TfidfVectorizer(sublinear_tf=True, strip_accents='unicode')
+    matrix = vectorizer.fit_transform(texts + [query])
+    relevance = cosine_similarity(matrix[:-1], matrix[-1]).ravel()
+    centroid = matrix[:-1].mean(axis=0)
+    centrality = cosine_similarity(matrix[:-1], centroid.A).ravel()
+    scores = relevance + centrality
+
+    # Highest score first; ties keep document order so output is stable
+    order = sorted(range(len(segments)), key=lambda k: (-scores[k], k))
+    keep = set()
+    used = 0
+    best_per_source = {}
+    for k in order:
+        best_per_source.setdefault(segments[k][0], k)
+    for k in list(best_per_source.values()) + order:
+        if k in keep:
+            continue
+        cost = estimate_tokens(texts[k])
+        if used + cost > budget and k not in best_per_source.values():
+            continue
+        keep.add(k)
+        used += cost
+
+    compacted = []
+    for i in range(len(upstream)):
+        lines = [texts[k] for k in sorted(keep) if segments[k][0] == i]
+        compacted.append('\n'.join(lines))
+    return _join(compacted)
+
+
+def compact_context(query: str, upstream: Sequence[str],
+                    budget: int) -> tuple:
+    """Trim ``upstream`` outputs to about ``budget`` tokens for ``query``.
+
+    Returns the context text, as crewAI would join it, and the number of
+    tokens saved. Context already within budget is returned unchanged.
+    """
+    full = _join(upstream)
+    if estimate_tokens(full) <= budget:
+        return full, 0
+    compacted = _compact(query, tuple(upstream), budget)
+    return compacted, estimate_tokens(full) - estimate_tokens(compacted)
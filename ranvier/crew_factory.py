@@ -0,0 +1,218 @@
+"""Process-wide factory for LLM clients and crews.
+
+Pages used to construct their chat model, every ``Agent``, every ``Task`` and
+the ``Crew`` at module level, so all of it was rebuilt on every rerun. The
+factory builds each LLM client once per ``LLMConfig``, and ``new_crew``
+builds every kickoff its own crew around the shared clients, so concurrent
+sessions never share task outputs. Every client waits for its model's rate
+limit and reports its calls to the run profiler. Only the final task's agent
+gets a streaming client, because most integrations report no token usage for
+streamed calls. Groq and OpenAI clients send their calls through the shared
+keep-alive pools of ``ranvier.http_pool``.
+
+A page may pass ``Routes`` instead of a single ``LLMConfig`` to run some
+agents or tasks on another model, e.g. cheap extraction on a fast model and
+the final synthesis on a strong one.
+"""
+import os
+import threading
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING, Callable, Optional, Union
+
+from ranvier import (http_pool, llm_metrics, profiling, rate_limit, settings,
+                     streaming, transcripts)
+from ranvier.llm_cache import get_response_cache
+
+if TYPE_CHECKING:
+    # crewAI takes seconds to import; pages only pay for it on first kickoff
+    from crewai import Crew
+
+
+@dataclass(frozen=True)
+class LLMConfig:
+    """Everything that distinguishes one chat model client from another."""
+    provider: str  # 'google', 'groq', 'openai', 'anthropic' or 'fake'
+    model: str
+    temperature: float = 0.0
+    max_tokens: Optional[int] = None
+    use_cache: bool = True  # only honoured for deterministic configs
+    streaming: bool = False  # set by new_crew for the final task only
+
+    @property
+    def route(self) -> str:
+        return f'{self.provider}/{self.model}'
+
+
+@dataclass(frozen=True)
+class Routes:
+    """The model of every agent role and task; ``default`` for the rest."""
+    default: LLMConfig
+    agents: tuple = ()  # ((role, LLMConfig), ...)
+    tasks: tuple = ()  # ((task index, LLMConfig), ...)
+
+    @classmethod
+    def table(cls,
+              default: LLMConfig,
+              agents: Optional[dict] = None,
+              tasks: Optional[dict] = None) -> 'Routes':
+        """Build routes from ``{role: config}`` and ``{index: config}``."""
+        return cls(default, tuple(sorted((agents or {}).items())),
+                   tuple(sorted((tasks or {}).items())))
+
+    @classmethod
+    def of(cls, config: Union[LLMConfig, 'Routes']) -> 'Routes':
+        return config if isinstance(config, Routes) else cls(config)
+
+
+def _fields(cls) -> dict:
+    return getattr(cls, 'model_fields', None) or getattr(cls, '__fields__', {})
+
+
+def _streaming(cls, config: LLMConfig) -> dict:
+    # Older integrations have no 'streaming' switch and always answer at once
+    fields = _fields(cls)
+    if not config.streaming or 'streaming' not in fields:
+        return {}
+    # Newer OpenAI-style integrations can ask for usage in the last chunk
+    if 'stream_usage' in fields:
+        return {'streaming': True, 'stream_usage': True}
+    return {'streaming': True}
+
+
+def _http_client(cls, provider: str) -> dict:
+    # Integrations that take no client of ours keep their SDK's own pool
+    if not http_pool.pooled(provider) or 'http_client' not in _fields(cls):
+        return {}
+    return {'http_client': http_pool.get_http_client(provider)}
+
+
+_lock = threading.RLock()
+_llms = {}
+
+
+def _build_llm(config: LLMConfig):
+    # Only deterministic runs may be answered from the response cache
+    deterministic = config.use_cache and config.temperature == 0
+    cache = get_response_cache() if deterministic else False
+    # The rate limit comes first so its wait is not timed as provider latency
+    callbacks = [
+        rate_limit.RateLimitCallbackHandler(config.provider, config.model),
+        profiling.callback_handler, llm_metrics.callback_handler,
+        streaming.callback_handler, transcripts.callback_handler
+    ]
+
+    # Tags every call with its model so runs can be broken down per route
+    metadata = {'ranvier_route': config.route}
+
+    if settings.FAKE_LLM or config.provider == 'fake':
+        from ranvier.fake_llm import build_fake_llm
+        return build_fake_llm(config,
+                              cache=cache,
+                              callbacks=callbacks,
+                              metadata=metadata)
+
+    # Provider SDKs are imported here so a page only pays for the ones it uses
+    if config.provider == 'google':
+        from langchain_google_genai import ChatGoogleGenerativeAI
+        kwargs = _streaming(ChatGoogleGenerativeAI, config)
+        kwargs['max_retries'] = settings.LLM_MAX_RETRIES
+        if config.max_tokens:
+            kwargs['max_output_tokens'] = config.max_tokens
+        return ChatGoogleGenerativeAI(model=config.model,
+                                      temperature=config.temperature,
+                                      cache=cache,
+                                      callbacks=callbacks,
+                                      metadata=metadata,
+                                      **kwargs)
+    if config.provider == 'groq':
+        from langchain_groq import ChatGroq
+        return ChatGroq(temperature=config.temperature,
+                        groq_api_key=os.getenv("GROQ_API_KEY"),
+                        model_name=config.model,
+                        max_tokens=config.max_tokens,
+                        max_retries=settings.LLM_MAX_RETRIES,
+                        cache=cache,
+                        callbacks=callbacks,
+                        metadata=metadata,
+                        **_streaming(ChatGroq, config),
+                        **_http_client(ChatGroq, config.provider))
+    if config.provider == 'openai':
+        from langchain_openai import ChatOpenAI
+        return ChatOpenAI(model=config.model,
+                          temperature=config.temperature,
+                          max_tokens=config.max_tokens,
+                          max_retries=settings.LLM_MAX_RETRIES,
+                          cache=cache,
+                          callbacks=callbacks,
+                          metadata=metadata,
+                          **_streaming(ChatOpenAI, config),
+                          **_http_client(ChatOpenAI, config.provider))
+    if config.provider == 'anthropic':
+        from langchain_anthropic import ChatAnthropic
+        kwargs = _streaming(ChatAnthropic, config)
+        kwargs['max_retries'] = settings.LLM_MAX_RETRIES
+        if config.max_tokens:
+            kwargs['max_tokens'] = config.max_tokens
+        return ChatAnthropic(temperature=config.temperature,
+                             model_name=config.model,
+                             api_key=os.getenv("ANTHROPIC_API_KEY"),
+                             cache=cache,
+                             callbacks=callbacks,
+                             metadata=metadata,
+                             **kwargs)
+    raise ValueError(f"Unknown LLM provider: {config.provider}")
+
+
+def get_llm(config: LLMConfig):
+    """Return the shared chat model client for ``config``."""
+    llm = _llms.get(config)
+    if llm is None:
+        with _lock:
+            llm = _llms.get(config)
+            if llm is None:
+                llm = _build_llm(config)
+                # Lets the rate limit tell the calls the cache will answer
+                for handler in llm.callbacks or ():
+                    if isinstance(handler, rate_limit.RateLimitCallbackHandler):
+                        handler.llm = llm
+                _llms[config] = llm
+    return llm
+
+
+def _route(crew: 'Crew', routes: Routes) -> 'Crew':
+    # Builders hand every agent the default client; swap in the routed ones
+    for agent in crew.agents:
+        config = dict(routes.agents).get(agent.role)
+        if config is not None:
+            agent.llm = get_llm(config)
+    for index, config in routes.tasks:
+        task = crew.tasks[index]
+        if task.agent is not None:
+            # The agent's other tasks keep their model
+            task.agent = task.agent.model_copy()
+            task.agent.llm = get_llm(config)
+    return crew
+
+
+def _stream_final_task(crew: 'Crew', routes: Routes) -> 'Crew':
+    # Only the final task's tokens are shown while they are written, and a
+    # streamed call may report no usage; every other call keeps its tokens
+    task = crew.tasks[-1] if crew.tasks else None
+    if task is None or task.agent is None:
+        return crew
+    config = (dict(routes.tasks).get(len(crew.tasks) - 1)
+              or dict(routes.agents).get(task.agent.role) or routes.default)
+    task.agent = task.agent.model_copy()
+    task.agent.llm = get_llm(replace(config, streaming=True))
+    return crew
+
+
+def new_crew(name: str, builder: Callable[..., 'Crew'],
+             config: Union[LLMConfig, Routes]) -> 'Crew':
+    """Return a crew of its own for one kickoff, on the shared clients."""
+    # Crew.copy() loses the agents' clients on some crewAI releases and is
+    # missing on others, so every kickoff builds its crew again; agents and
+    # tasks are cheap, only the clients are worth sharing
+    routes = Routes.of(config)
+    return _stream_final_task(_route(builder(get_llm(routes.default)), routes),
+                              routes)
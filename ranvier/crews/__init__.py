@@ -0,0 +1 @@
+"""Crew definitions shared by the pages and the command-line tools."""
@@ -0,0 +1,172 @@
+"""The clinical diagnostic crew of the Bayesian Reasoning page.
+
+Shared by the page and the benchmark suite.
+"""
+from ranvier.crew_factory import LLMConfig
+from ranvier.pipeline import (AgentSpec, CrewSpec, InputSpec, Labels,
+                              ModelOption, PageSpec, TaskSpec)
+
+CREW = CrewSpec(
+    name='bayesian_reasoning',
+    agents={
+        'head_internal_medicine': AgentSpec(
+            role='Head of Internal Medicine',
+            goal=
+            'Collect and document detailed information on the patient\'s clinical history and chief complaint: {clinical_history}, {chief_complaint}. '
+            'Identify immediate findings and suggest areas for further investigation.',
+            backstory=
+            ("An experienced internal medicine specialist with a comprehensive understanding of various diseases and conditions. "
+             "You lead the internal medicine department, ensuring accurate and thorough initial patient assessments."
+             )),
+        'semiology_expert': AgentSpec(
+            role='Semiology Expert',
+            goal=
+            'Gather a thorough medical history and conduct a detailed review of systems for {clinical_history}, {chief_complaint}. '
+            'Identify gaps or areas needing further investigation with rationales.',
+            backstory=
+            ("A specialist in semiology with extensive experience in understanding and interpreting symptoms and signs of diseases. "
+             "You focus on comprehensive medical history taking and symptom review."
+             )),
+        'physical_exam_specialist': AgentSpec(
+            role='Physical Examination Specialist',
+            goal=
+            'Perform targeted physical examinations based on gathered information for {clinical_history}, {chief_complaint}. '
+            'Suggest additional areas to examine, providing explanations based on the clinical context.',
+            backstory=
+            ("An expert in conducting physical examinations with a keen eye for detail. "
+             "Your expertise lies in identifying physical signs and correlating them with clinical symptoms."
+             )),
+        'chief_differential_diagnosis': AgentSpec(
+            role='Chief of Differential Diagnosis Department',
+            goal=
+            'Generate and refine differential diagnoses using collected data for {clinical_history}, {chief_complaint}. '
+            'Apply Bayesian reasoning and interpret diagnostic test results to provide comprehensive diagnostic insights.',
+            backstory=
+            ("A seasoned medical analyst and head of the differential diagnosis department. "
+             "You specialize in analyzing clinical data and refining diagnoses using Bayesian reasoning."
+             )),
+        'clinical_doc_specialist': AgentSpec(
+            role='Clinical Documentation Specialist',
+            goal=
+            'Compile and structure all gathered information into a comprehensive diagnostic framework for {clinical_history}, {chief_complaint}. '
+            'Highlight key clinical points and provide rationales for diagnostic conclusions.',
+            backstory=
+            ("A proficient medical writer with expertise in synthesizing complex clinical information into clear and concise documents. "
+             "You ensure that all findings are documented in a coherent diagnostic framework."
+             )),
+    },
+    tasks={
+        'initial_assessment': TaskSpec(
+            agent='head_internal_medicine',
+            description=
+            ("Collect information on the patient's chief complaint and history of present illness (HPI): {clinical_history}, {chief_complaint}. "
+             "Document the findings based on user inputs and identify any immediate areas needing further investigation."
+             ),
+            expected_output=
+            ("A detailed account of the patient's chief complaint and HPI: {clinical_history}, {chief_complaint}. "
+             "Include a section for 'Immediate Findings' based on user inputs and 'Suggested Areas for Further Investigation' with rationales."
+             ),
+            context=()),
+        'comprehensive_medical_history': TaskSpec(
+            agent='semiology_expert',
+            description=
+            ("Gather comprehensive medical history, including past medical history, medications, allergies, family history, and social history for {clinical_history}, {chief_complaint}. "
+             "Document the findings based on user inputs and identify any gaps or areas needing further investigation with rationales."
+             ),
+            expected_output=
+            ("A comprehensive medical history of the patient: {clinical_history}, {chief_complaint}. "
+             "Include sections for 'Documented Findings' based on user inputs and 'Areas Needing Further Investigation' with explanations for each suggestion."
+             ),
+            context=('initial_assessment', )),
+        'review_of_systems': TaskSpec(
+            agent='semiology_expert',
+            description=
+            ("Conduct a review of systems (ROS) to identify any additional symptoms across different body systems: {clinical_history}, {chief_complaint}. "
+             "Document the findings based on user inputs and suggest additional symptoms to investigate, explaining the reasons based on the comprehensive medical history."
+             ),
+            expected_output=
+            ("A detailed review of systems (ROS) for the patient: {clinical_history}, {chief_complaint}. "
+             "Include sections for 'Documented Symptoms' based on user inputs and 'Suggested Symptoms for Further Investigation' with rationales for each suggestion."
+             ),
+            context=('comprehensive_medical_history', )),
+        'physical_examination': TaskSpec(
+            agent='physical_exam_specialist',
+            description=
+            ("Perform a targeted physical examination based on the information gathered so far: {clinical_history}, {chief_complaint}. "
+             "Document the findings based on user inputs and suggest additional areas to examine, providing explanations based on the current clinical context."
+             ),
+            expected_output=
+            ("A detailed report of the physical examination findings: {clinical_history}, {chief_complaint}. "
+             "Include sections for 'Documented Findings' based on user inputs and 'Suggested Areas for Further Examination' with explanations for each suggestion."
+             ),
+            context=('review_of_systems', )),
+        'differential_diagnosis': TaskSpec(
+            agent='chief_differential_diagnosis',
+            description=
+            ("Generate a list of possible diagnoses (differential diagnosis) based on the patient's symptoms, history, and physical examination findings: {clinical_history}, {chief_complaint}. "
+             "Document the initial differential diagnosis and suggest additional diagnoses to consider, providing rationales based on the gathered information."
+             ),
+            expected_output=
+            ("A prioritized list of possible diagnoses: {clinical_history}, {chief_complaint}. "
+             "Include sections for 'Initial Differential Diagnosis' based on gathered information and 'Suggested Additional Diagnoses' with explanations for each suggestion."
+             ),
+            context=('initial_assessment', 'comprehensive_medical_history',
+                     'review_of_systems', 'physical_examination')),
+        'bayesian_reasoning': TaskSpec(
+            agent='chief_differential_diagnosis',
+            description=
+            ("Apply Bayesian reasoning to refine the differential diagnosis using known and unknown baseline probabilities: {clinical_history}, {chief_complaint}. "
+             "Document the refined differential diagnosis and provide a rationale for each probability adjustment."
+             ),
+            expected_output=
+            ("A refined differential diagnosis using Bayesian reasoning: {clinical_history}, {chief_complaint}. "
+             "Include sections for 'Refined Diagnoses' and 'Probability Adjustments' with explanations for each."
+             ),
+            context=('differential_diagnosis', )),
+        'diagnostic_testing': TaskSpec(
+            agent='chief_differential_diagnosis',
+            description=
+            ("Identify appropriate diagnostic tests to gather more objective data for {clinical_history}, {chief_complaint}. "
+             "Explain the rationale for each test based on the refined differential diagnosis. "
+             "Outline a follow-up plan based on potential test outcomes."),
+            expected_output=
+            ("A detailed plan for diagnostic testing: {clinical_history}, {chief_complaint}. "
+             "Include sections for 'Proposed Tests', 'Rationale for Each Test', and 'Follow-Up Plan Based on Potential Outcomes'."
+             ),
+            context=('bayesian_reasoning', )),
+        'synthesize_diagnostic_framework': TaskSpec(
+            agent='clinical_doc_specialist',
+            description=
+            ("Synthesize all gathered information into a comprehensive diagnostic framework for the patient's clinical history and chief complaint: {clinical_history}, {chief_complaint}. "
+             "Document the integrated findings and highlight key clinical points, providing rationales for the diagnostic conclusions."
+             ),
+            expected_output=
+            ("A well-structured diagnostic framework integrating all gathered information, including the top 5-10 clinical pearls: {clinical_history}, {chief_complaint}. "
+             "Include sections for 'Integrated Findings' and 'Key Clinical Points' with rationales for each diagnostic conclusion."
+             ),
+            context=('initial_assessment', 'comprehensive_medical_history',
+                     'review_of_systems', 'physical_examination',
+                     'differential_diagnosis', 'bayesian_reasoning',
+                     'diagnostic_testing')),
+    })
+
+PAGE = PageSpec(
+    crew=CREW,
+    title='🩺 Clinical Diagnostic Assistant',
+    page_title='Clinical Diagnostic Assistant - Page 3',
+    page_icon='🩺',
+    inputs=(
+        InputSpec('clinical_history',
+                  "Enter clinical history:",
+                  multiline=True),
+        InputSpec('chief_complaint', "Enter chief complaint:"),
+    ),
+    models=(ModelOption(
+        'GPT-4o', LLMConfig(provider='openai', model="gpt-4o",
+                            temperature=0)), ),
+    context_budget=True,
+    labels=Labels(
+        start="Start Clinical Assessment",
+        starting="Assessing clinical history and chief complaint...",
+        missing_input="Please enter both clinical history and chief complaint.",
+        completed="Assessment completed!"))
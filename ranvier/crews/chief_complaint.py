@@ -0,0 +1,249 @@
+"""The chief complaint crews: history, examination and diagnostic guidelines.
+
+``CREW`` backs the Chief Complaint Orientation pages, on Gemini and on Groq;
+``V2_CREW`` is the three-task assessment of the Chief Complaint v2 page.
+"""
+from dataclasses import replace
+
+from ranvier.crew_factory import LLMConfig
+from ranvier.pipeline import (AgentSpec, CrewSpec, InputSpec, Labels,
+                              ModelOption, PageSpec, TaskSpec)
+
+CREW = CrewSpec(
+    name='chief_complaint',
+    agents={
+        'history_taker': AgentSpec(
+            role='Senior Semiology Professor',
+            goal=
+            ('Provide guidelines on how to gather a comprehensive patient history for the chief complaint: {chief_complaint}. '
+             'Offer detailed suggestions on specific areas to explore based on the clinical context. Do not infer any details about the patient’s history.'
+             ),
+            backstory=
+            ("You have spent over 20 years in clinical practice, honing your skills in eliciting detailed and accurate patient histories and semiological-diagnostical heuristics. "
+             "Your meticulous approach ensures that no detail is overlooked, providing a solid foundation for diagnosis related to patient's chief health complaints."
+             )),
+        'examiner': AgentSpec(
+            role='Senior Semiology Professor',
+            goal=
+            ('Provide guidelines on how to perform a targeted physical examination for the chief complaint: {chief_complaint}. '
+             'Offer detailed suggestions on specific areas to examine based on the clinical context. Do not infer any findings from the examination.'
+             ),
+            backstory=
+            ("With extensive experience in physical examination and diagnostics, you excel at identifying subtle physical signs that can be crucial for diagnosis. "
+             "Your thorough and systematic approach ensures that all relevant physical findings related to the patient's chief complaint are captured."
+             )),
+        'diagnostician': AgentSpec(
+            role='Head of Internal Medicine Department',
+            goal=
+            ('Provide guidelines on how to develop a differential diagnosis and recommend diagnostic tests for the chief complaint: {chief_complaint}. '
+             'Offer detailed suggestions based on patient history and physical examination findings. Do not infer or assume any specific diagnoses without supporting evidence.'
+             ),
+            backstory=
+            ("A leading figure in the field of diagnostics, you specialize in synthesizing complex clinical information to generate accurate differential diagnoses. "
+             "Your analytical skills and experience allow you to identify the most likely causes and necessary tests for the chief complaint."
+             )),
+    },
+    tasks={
+        'gather_history': TaskSpec(
+            agent='history_taker',
+            description=
+            ("Provide guidelines on how to collect a comprehensive patient history based on chief complaint: {chief_complaint}. "
+             "Identify areas needing further exploration based on the clinical context."
+             ),
+            expected_output=
+            ("Patient History Guidelines for {chief_complaint}:\n\n"
+             "- **Suggested Further Exploration:**\n"
+             "  - Questions or areas that require further investigation based on the initial findings and clinical context.\n"
+             "- **Suggested Topics for Further Anamnesis:**\n"
+             "  - Additional medical conditions, medications, allergies, family history aspects, social history elements, and review of systems symptoms that should be further explored.\n"
+             ),
+            context=()),
+        'perform_examination': TaskSpec(
+            agent='examiner',
+            description=
+            ("Provide guidelines on how to create a targeted physical examination template based on the patient history: {chief_complaint}. "
+             "Suggest additional areas to examine with clinical context justifications."
+             ),
+            expected_output=
+            ("Physical Examination Guidelines for {chief_complaint}:\n\n"
+             "- **Suggested Further Examinations:**\n"
+             "  - Areas to be further examined with justifications based on the clinical context.\n"
+             "- **Suggested Detailed Examination Areas:**\n"
+             "  - Additional areas in general appearance, vitals, and specific systems (neurological, musculoskeletal, cardiovascular, respiratory) that should be further explored.\n"
+             ),
+            context=('gather_history', )),
+        'generate_differential_diagnosis': TaskSpec(
+            agent='diagnostician',
+            description=
+            ("Provide guidelines on how to generate a differential diagnosis based on the patient history and physical examination findings related to chief complaint: {chief_complaint}. "
+             "Provide rationales and probabilities for suggested diagnoses."),
+            expected_output=
+            ("Differential Diagnosis Guidelines for {chief_complaint}:\n\n"
+             "- **Suggested Diagnoses:**\n"
+             "  - List of potential diagnoses with rationales based on the clinical context.\n"
+             "- **Rationale for Each Diagnosis:**\n"
+             "  - Explanations for why each suggested diagnosis is considered, including probabilities based on clinical findings.\n"
+             ),
+            context=('gather_history', 'perform_examination')),
+        'bayesian_reasoning': TaskSpec(
+            agent='diagnostician',
+            description=
+            ("Provide guidelines on how to refine the differential diagnosis using Bayesian reasoning for {chief_complaint}. "
+             "Adjust probabilities based on baseline knowledge and current findings. Separate known data from probabilistic reasoning."
+             ),
+            expected_output=
+            ("Bayesian Analysis Guidelines for chief complaint: {chief_complaint}:\n\n"
+             "- **Refined Diagnoses:**\n"
+             "  - Diagnoses with adjusted probabilities.\n"
+             "- **Rationale for Each Adjustment:**\n"
+             "  - Explanations for probability adjustments based on clinical findings and Bayesian reasoning.\n"
+             ),
+            context=('generate_differential_diagnosis', )),
+        'synthesize_diagnostic_framework': TaskSpec(
+            agent='diagnostician',
+            description=
+            ("Provide guidelines on how to integrate all gathered information and advanced medical reasoning into a comprehensive diagnostic framework for the patient history: {chief_complaint}. It should contain the suggestions from the Patient History Guidelines, Physical Examination Guidelines, and Bayesian Analysis Guidelines."
+             "Highlight key clinical points and provide rationales for diagnostic conclusions."
+             ),
+            expected_output=
+            ("Diagnostic Framework Guidelines for {chief_complaint}:\n\n"
+             "- **Patient History Guidelines:\n"
+             "  - Suggested Further Exploration:\n"
+             "  - Suggested Topics for Further Anamnesis:\n"
+             "- **Physical Examination Guidelines:\n"
+             "  - Suggested Further Examinations:\n"
+             "  - Suggested Detailed Examination Areas:\n"
+             "- **Bayesian Analysis Guidelines:\n"
+             "  - Refined Diagnoses:\n"
+             "  - Rationale for Each Diagnosis:\n"
+             "- **Integrated Reasoning and Guidance:**\n"
+             "  - Comprehensive synthesis of the proposed diagnostic framework.\n"
+             "- **Rationales for Diagnostic Conclusions:**\n"
+             "  - Explanations for each diagnostic conclusion based on integrated data.\n"
+             ),
+            context=('gather_history', 'perform_examination',
+                     'generate_differential_diagnosis', 'bayesian_reasoning')),
+    })
+
+V2_CREW = CrewSpec(
+    name='chief_complaint_v2',
+    agents={
+        'history_taker': AgentSpec(
+            role='History Taker',
+            goal='Gather a comprehensive patient history based on the given chief complaint',
+            backstory=(
+                "You are a seasoned clinician with a keen eye for detail, "
+                "specializing in obtaining thorough patient histories. Your goal is to "
+                "collect all relevant information to form a clear picture of the patient's condition. "
+                "When taking a history for {chief_complaint}, you will:\n"
+                "1. Inquire about onset, duration, progression, quality, severity, location, aggravating/relieving factors, and associated symptoms related to the chief complaint.\n"
+                "2. Gather past medical history, medications, allergies, family history, and social history as relevant to the chief complaint.\n"
+                "3. Conduct a review of systems to identify potential symptoms across different body systems, but only report findings directly related to the chief complaint."
+            )),
+        'examiner': AgentSpec(
+            role='Physical Examiner',
+            goal='Perform a targeted physical examination based on the given chief complaint and patient history',
+            backstory=(
+                "You are an expert clinician known for your thorough and precise physical examinations. "
+                "Your role is to perform a detailed physical examination that complements the patient history "
+                "for {chief_complaint}. In your examination, you will:\n"
+                "1. Focus on relevant body systems based on the history and chief complaint.\n"
+                "2. Look for signs that can help narrow down the differential diagnosis, strictly within the context of the chief complaint.\n"
+                "3. Document findings meticulously to provide a clear basis for further analysis."
+            )),
+        'diagnostician': AgentSpec(
+            role='Diagnostician',
+            goal='Generate a differential diagnosis and recommend diagnostic tests for the given chief complaint',
+            backstory=(
+                "As a highly skilled diagnostician, your expertise lies in analyzing complex cases and generating accurate "
+                "differential diagnoses. Your objective for {chief_complaint} is to:\n"
+                "1. Compile a list of possible diagnoses based on the patient history and physical examination findings related to the chief complaint.\n"
+                "2. Prioritize these diagnoses based on likelihood, severity, and urgency.\n"
+                "3. Apply logical reasoning to refine probabilities and guide the selection of diagnostic tests, strictly within the context of the chief complaint."
+            )),
+    },
+    tasks={
+        'gather_history': TaskSpec(
+            agent='history_taker',
+            description='Gather a comprehensive patient history based on the given chief complaint. Focus on onset, duration, quality, severity, location, and associated symptoms. Also collect past medical history, medications, allergies, family history, and social history as relevant to the chief complaint.',
+            expected_output=(
+                "A detailed patient history including:\n"
+                "- History of Present Illness (HPI): Onset, duration, quality, severity, location, and associated symptoms strictly related to the chief complaint.\n"
+                "- Past Medical History (PMH): Relevant past medical conditions that may impact the chief complaint.\n"
+                "- Medications: All current medications, including dosage and frequency, relevant to the chief complaint.\n"
+                "- Allergies: Known allergies including medications, food, and environmental allergies.\n"
+                "- Family History: Relevant family medical history impacting the chief complaint.\n"
+                "- Social History: Occupation, smoking history, alcohol consumption, drug use, exercise habits, and living situation, as relevant to the chief complaint.\n"
+                "- Review of Systems (ROS): Only symptoms directly related to the chief complaint in different body systems."
+            ),
+            context=()),
+        'perform_examination': TaskSpec(
+            agent='examiner',
+            description='Perform a targeted physical examination based on the given chief complaint and patient history. Focus on relevant body systems and document findings strictly related to the chief complaint.',
+            expected_output=(
+                "A comprehensive physical examination report including:\n"
+                "- General: Patient's general appearance and distress level.\n"
+                "- Vitals: Temperature, pulse, blood pressure, respiratory rate, and oxygen saturation.\n"
+                "- Neurological: Mental status, cranial nerves, motor function, sensory function, reflexes, and gait strictly related to the chief complaint.\n"
+                "- Musculoskeletal: Inspection, palpation, range of motion, and special tests (e.g., Straight Leg Raise Test) relevant to the chief complaint.\n"
+                "- Cardiovascular: Auscultation of heart sounds and peripheral pulses relevant to the chief complaint.\n"
+                "- Gastrointestinal: Abdominal inspection, auscultation, and palpation relevant to the chief complaint.\n"
+                "- Genitourinary: Urinary symptoms and findings relevant to the chief complaint.\n"
+                "- Skin: Inspection of the skin for rashes, erythema, or edema related to the chief complaint.\n"
+                "- Respiratory: Auscultation of lung sounds relevant to the chief complaint.\n"
+                "- Documentation: Thorough documentation of findings and patient's response to examination maneuvers strictly related to the chief complaint."
+            ),
+            context=('gather_history', )),
+        'generate_differential_diagnosis': TaskSpec(
+            agent='diagnostician',
+            description='Generate a differential diagnosis and recommend diagnostic tests for the given chief complaint based on patient history and physical examination findings.',
+            expected_output=(
+                "A prioritized list of potential diagnoses including:\n"
+                "- A brief description of each potential diagnosis strictly related to the chief complaint.\n"
+                "- Reasoning for prioritizing each diagnosis based on likelihood, severity, and urgency.\n"
+                "- Recommended diagnostic tests to confirm or rule out each potential diagnosis relevant to the chief complaint.\n"
+                "- Application of logical reasoning to refine probabilities and guide diagnostic testing based on the chief complaint."
+            ),
+            context=('gather_history', 'perform_examination')),
+    })
+
+GOOGLE_FLASH = LLMConfig(provider='google',
+                         model="gemini-1.5-flash-latest",
+                         temperature=0,
+                         max_tokens=8192)
+
+PAGE = PageSpec(
+    crew=CREW,
+    title='🩺 Chief Complaint Medical Assistant',
+    page_title='Medical Assistant - Page 2',
+    page_icon='🩺',
+    inputs=(InputSpec('chief_complaint', "Enter chief complaint:"), ),
+    models=(ModelOption('Gemini 1.5 Flash', GOOGLE_FLASH), ),
+    labels=Labels(start="Start Medical Assessment",
+                  starting="Assessing {chief_complaint}...",
+                  missing_input="Please enter a chief complaint.",
+                  completed="Assessment completed!"))
+
+GROQ_PAGE = replace(
+    PAGE,
+    name='chief_complaint_groq',
+    models=tuple(
+        ModelOption(model,
+                    LLMConfig(provider='groq', model=model, temperature=0))
+        for model in ('llama3-8b-8192', 'mixtral-8x7b-32768', 'gemma-7b-it',
+                      'llama3-70b-8192')),
+    labels=replace(PAGE.labels, start="Start Clinical Assessment"))
+
+# Repeated and near-duplicate complaints are served from the result store
+V2_PAGE = replace(PAGE,
+                  crew=V2_CREW,
+                  title='🩺 Medical Assistant',
+                  models=(ModelOption('Gemini 1.5 Flash',
+                                      replace(GOOGLE_FLASH,
+                                              max_tokens=None)), ),
+                  store_results=True,
+                  labels=replace(PAGE.labels,
+                                 stored="Assessment loaded from stored "
+                                 "results!",
+                                 refresh_help="Ignore the stored assessment "
+                                 "and run the crew again"))
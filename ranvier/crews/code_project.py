@@ -0,0 +1,185 @@
+"""The project idea crew: parse, question, answer, present and review.
+
+Backs both Code Project Idea Processor pages, on Gemini and on Claude; on
+either, parsing the idea and listing questions run on the fast model.
+"""
+from ranvier.crew_factory import LLMConfig
+from ranvier.pipeline import (AgentSpec, CrewSpec, InputSpec, Labels,
+                              ModelOption, PageSpec, Preset, TaskSpec)
+
+CREW = CrewSpec(
+    name='code_project',
+    agents={
+        'project_parser': AgentSpec(
+            role='Project Parser',
+            goal='Parse user input to extract project details',
+            memory=False,
+            backstory=
+            "You are adept at understanding and breaking down project ideas into key components."
+        ),
+        'question_generator': AgentSpec(
+            role='Question Generator',
+            goal='Generate relevant questions about the project',
+            memory=False,
+            backstory=
+            "You excel at asking the right questions to uncover deeper insights about any project."
+        ),
+        'answer_generator': AgentSpec(
+            role='Answer Generator',
+            goal='Generate possible answers for the questions',
+            memory=False,
+            backstory=
+            "You provide detailed and thoughtful answers to the questions generated."
+        ),
+        'result_presenter': AgentSpec(
+            role='Result Presenter',
+            goal='Format the results into a markdown document',
+            memory=False,
+            backstory=
+            "You have a talent for organizing information into clear and structured documents."
+        ),
+        'refinement_assistant': AgentSpec(
+            role='Senior Project Manager',
+            goal=
+            'Refine questions and answers based on your expert coding review',
+            memory=False,
+            backstory=
+            "You help refine and improve the questions and answers based on your tech lead expertise, focusing in a detailed code review"
+        ),
+    },
+    tasks={
+        'parse_user_input': TaskSpec(
+            agent='project_parser',
+            description=
+            """Identify the project description, key terms, technologies mentioned, and goals or objectives.
+The user input will be provided in the following format:
+<userRequest>
+{project_idea}
+</userRequest>
+
+Reply with the extracted information wrapped in the following XML tags: 
+<projectDescription>Project description goes here</projectDescription>
+<keyTerms>Key terms go here, separated by commas</keyTerms>
+<technologies>Technologies mentioned go here, separated by commas</technologies>
+<goals>Project goals or objectives go here, separated by semicolons</goals>
+
+If any of the above information is not found in the user input, leave that tag empty. Do not include any other text, explanation, or formatting in your reply.""",
+            expected_output="Parsed project details in XML format."),
+        'generate_questions': TaskSpec(
+            agent='question_generator',
+            description=
+            """Consider the project description, key terms, technologies, and goals mentioned in the parsed input. Generate questions that cover various aspects of the project, such as:
+- Main objectives
+- Target user or audience
+- Suitable technologies or programming languages
+- Potential challenges or roadblocks
+- Monetization or value proposition
+- Code dependencies and critical functions in pseudocode
+- Code examples and explanations for the project
+- Useful libraries and frameworks that already exist and can be imported to the project to aid with development.
+
+Aim to generate around 8-12 questions. Each question should be on a new line.""",
+            expected_output="A set of relevant questions.",
+            context=('parse_user_input', )),
+        'generate_answers': TaskSpec(
+            agent='answer_generator',
+            description=
+            "Generate detailed possible answers for each question about the project.",
+            expected_output=
+            "Generated detailed answers for the questions. Making sure to a section of Suggested Code Snippets at the end that may be useful for the defined project",
+            context=('parse_user_input', 'generate_questions')),
+        'present_results': TaskSpec(
+            agent='result_presenter',
+            description=
+            "Format the generated questions and answers into a markdown document.",
+            expected_output="Formatted thorough markdown document.",
+            context=('parse_user_input', 'generate_questions',
+                     'generate_answers')),
+        'refine_results': TaskSpec(
+            agent='refinement_assistant',
+            description=
+            "Refine questions and answers that form the project based on your expertise.",
+            expected_output=
+            "Refined questions and answer presented in a thorough professional document result of the Project and Code Review",
+            context=('parse_user_input', 'generate_questions',
+                     'generate_answers', 'present_results')),
+    })
+
+ABOUT = '''
+**What can this app do?**
+This app allows users to process a project idea using CrewAI agents. The agents will parse the idea, generate questions, provide answers, and compile the results into a coherent document.
+
+**How to use the app?**
+1. Enter your project idea in the input field.
+2. Click the "Start Processing" button to begin the process.
+3. The results will be displayed once the processing is completed.
+'''
+
+LABELS = Labels(start="Start Processing",
+                starting="Processing project idea: {project_idea}...",
+                missing_input="Please enter a project idea.",
+                completed="Processing completed!")
+
+GEMINI_FLASH = LLMConfig(provider='google', model="gemini-1.5-flash-latest")
+
+PAGE = PageSpec(
+    crew=CREW,
+    title="AI Enhanced Code Project Idea Processor ✨",
+    page_title='Project Idea Processor',
+    intro="Welcome to the Project Idea Processor. Use the sidebar to navigate to different pages.",
+    about=ABOUT,
+    inputs=(InputSpec('project_idea', "Enter your project idea:"), ),
+    models=(
+        ModelOption('Gemini 1.5 Flash', GEMINI_FLASH),
+        ModelOption('Gemini 1.5 Pro',
+                    LLMConfig(provider='google', model="gemini-1.5-pro-001")),
+    ),
+    # Parsing the idea and listing questions are extraction work for Flash;
+    # answering and reviewing run on the selected model
+    agent_models={
+        'Project Parser': GEMINI_FLASH,
+        'Question Generator': GEMINI_FLASH,
+    },
+    presets=(
+        Preset('Quick Response', 'Gemini 1.5 Flash', 0, 5000),
+        Preset('Detailed Analysis', 'Gemini 1.5 Pro', 0, 8192),
+        Preset('Custom'),
+    ),
+    tunable=True,
+    model_help='''
+**Model Selection:**
+- **Gemini 1.5 Flash:** A more recent model from Google. Focused on balancing response quality, speed, and cost-effectiveness.
+- **Gemini 1.5 Pro:** A premium model that is slightly slower but more powerful and capable of generating detailed and complex outputs.
+
+**Temperature:**
+- Controls the creativity of the model. Lower values make the output more deterministic, while higher values make it more creative and varied.
+
+**Max Output Tokens:**
+- Determines the maximum number of tokens (2-3 tokens make up one word) that the model can generate. Higher values allow for longer responses.
+''',
+    labels=LABELS)
+
+# Parsing the idea and listing questions are extraction work for Haiku;
+# answering and writing stay on Sonnet
+CLAUDE_HAIKU = LLMConfig(provider='anthropic',
+                         model="claude-3-haiku-20240307",
+                         temperature=0)
+
+SONNET_PAGE = PageSpec(
+    crew=CREW,
+    name='code_project_sonnet',
+    title="AI Enhanced Code Project Idea Processor ✨ ",
+    page_title='Project Idea Processor',
+    intro="Welcome to the Project Idea Processor. Use the sidebar to navigate to different pages.",
+    about=ABOUT,
+    inputs=(InputSpec('project_idea', "Enter your project idea:"), ),
+    models=(ModelOption(
+        'Claude 3.5 Sonnet',
+        LLMConfig(provider='anthropic',
+                  model="claude-3-5-sonnet-20240620",
+                  temperature=0)), ),
+    agent_models={
+        'Project Parser': CLAUDE_HAIKU,
+        'Question Generator': CLAUDE_HAIKU,
+    },
+    labels=LABELS)
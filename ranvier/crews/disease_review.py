@@ -0,0 +1,116 @@
+"""The disease review crew: researcher, analyst and writer.
+
+Shared by the Disease Review page and the headless batch runner, so both
+produce, fingerprint and store reviews from exactly the same prompts.
+"""
+from ranvier.crew_factory import LLMConfig
+from ranvier.pipeline import (AgentSpec, CrewSpec, InputSpec, Labels,
+                              ModelOption, PageSpec, TaskSpec)
+
+LLM_CONFIG = LLMConfig(provider='google',
+                       model="gemini-1.5-flash-latest",
+                       temperature=0,
+                       max_tokens=8192)
+
+CREW = CrewSpec(
+    name='disease_review',
+    agents={
+        'researcher': AgentSpec(
+            role='Researcher',
+            goal='Collect comprehensive information on {disease_name}',
+            backstory=(
+                "An experienced medical researcher with a focus on epidemiology and pathophysiology.\n"
+                "To research {disease_name}, gather information on:\n"
+                "1. Key clinical features - signs, symptoms, affected body systems, disease course and prognosis\n"
+                "2. Epidemiology - incidence, prevalence, high risk populations, risk factors and causes\n"
+                "3. Pathophysiology - underlying biological mechanisms, impaired organ function, genetic and environmental factors\n"
+                "4. Diagnostic strategies - typical diagnostic workup, key history and exam findings, lab tests and imaging studies, specialized testing"
+            )),
+        'analyst': AgentSpec(
+            role='Analyst',
+            goal='Analyze and synthesize collected data on {disease_name}',
+            backstory=(
+                "A skilled data analyst with expertise in medical data analysis and outcome prediction.\n"
+                "When analyzing information on {disease_name}:\n"
+                "1. Assess management approaches - treatment goals, medical and surgical therapies, multidisciplinary care\n"
+                "2. Analyze complications and follow-up - major complications, monitoring and follow-up plans, factors influencing outcomes\n"
+                "3. Utilize high-quality information resources - medical textbooks, journal articles, guidelines, expert opinions"
+            )),
+        'writer': AgentSpec(
+            role='Writer',
+            goal='Compile findings on {disease_name} into a coherent review',
+            backstory=(
+                "A proficient medical writer with a knack for synthesizing complex information into clear, concise documents.\n"
+                "To write a comprehensive review on {disease_name}:\n"
+                "1. Synthesize information to provide a complete picture of the disease\n"
+                "2. Explain how {disease_name} fits into differential diagnoses for common presenting symptoms\n"
+                "3. Discuss how the knowledge can be applied clinically to improve diagnostic reasoning and decision-making\n"
+                "4. Use clear organization with sections on clinical features, epidemiology, pathophysiology, diagnosis, management, and complications"
+            )),
+    },
+    tasks={
+        'collect_clinical_features': TaskSpec(
+            agent='researcher',
+            description='Collect information on the typical signs, symptoms, and clinical manifestations of {disease_name}',
+            expected_output='A detailed list of clinical features and disease course of {disease_name}',
+            context=()),
+        'determine_epidemiology': TaskSpec(
+            agent='researcher',
+            description='Determine the incidence, prevalence, and risk factors of {disease_name}',
+            expected_output='A summary of epidemiological data of {disease_name}',
+            context=()),
+        'review_pathophysiology': TaskSpec(
+            agent='researcher',
+            description='Review the biological mechanisms and factors leading to {disease_name}',
+            expected_output='A detailed explanation of the pathophysiology of {disease_name}',
+            context=()),
+        'familiarize_diagnostic_workup': TaskSpec(
+            agent='researcher',
+            description='Familiarize with diagnostic workup, key findings, and specialized tests for {disease_name}',
+            expected_output='A comprehensive list of diagnostic strategies for {disease_name}',
+            context=('collect_clinical_features', 'review_pathophysiology')),
+        'review_management_approaches': TaskSpec(
+            agent='analyst',
+            description='Review medical and surgical treatments, and multidisciplinary care for {disease_name}',
+            expected_output='A summary of management approaches for {disease_name}',
+            context=('familiarize_diagnostic_workup', )),
+        'recognize_complications': TaskSpec(
+            agent='analyst',
+            description='Recognize complications, monitoring, and follow-up plans for {disease_name}',
+            expected_output='A detailed list of complications and follow-up strategies for {disease_name}',
+            context=('review_management_approaches', )),
+        'synthesize_information': TaskSpec(
+            agent='writer',
+            description='Synthesize all gathered information on {disease_name} into a comprehensive review',
+            expected_output='A well-structured review document integrating knowledge into clinical reasoning for {disease_name}, including the top 5-10 clinical pearls',
+            context=('collect_clinical_features', 'determine_epidemiology',
+                     'review_pathophysiology', 'familiarize_diagnostic_workup',
+                     'review_management_approaches',
+                     'recognize_complications')),
+    })
+
+PAGE = PageSpec(
+    crew=CREW,
+    title="AI Enhanced Review ✨ ",
+    intro="Welcome to the Ranvier-Kronika AI Skill sites. Use the sidebar to navigate to different pages.",
+    about='''
+    **What can this app do?**
+    This app allows users to initiate a comprehensive research process on specific diseases using CrewAI agents. The agents will collect, analyze, and compile information into a coherent review.
+
+    **How to use the app?**
+    1. Enter a disease name in the input field.
+    2. Click the "Start Research" button to begin the process.
+    3. The results will be displayed once the research is completed.
+    ''',
+    inputs=(InputSpec('disease_name', "Enter disease name:"), ),
+    models=(ModelOption('Gemini 1.5 Flash', LLM_CONFIG), ),
+    store_results=True,
+    free_text=False,
+    context_budget=True,
+    labels=Labels(start="Start Research",
+                  starting="Researching {disease_name}...",
+                  missing_input="Please enter a disease name.",
+                  completed="Research completed!",
+                  stored="Research loaded from stored results!",
+                  refresh_help="Ignore the stored review and run the crew "
+                  "again"))
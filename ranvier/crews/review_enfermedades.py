@@ -0,0 +1,342 @@
+"""The Spanish-language disease review crews and pages.
+
+``CREW`` asks in English for a review written in Spanish and backs the
+Gemini page; ``UPGRADED_CREW`` only words its final task differently.
+``GROQ_CREW`` is the same review prompted in Spanish throughout. Both Groq
+pages run the writer on Gemini Flash and every other agent on the Groq
+model the user picks.
+"""
+from ranvier.crew_factory import LLMConfig
+from ranvier.pipeline import (AgentSpec, CrewSpec, InputSpec, Labels,
+                              ModelOption, PageSpec, TaskSpec)
+
+GEMINI_MODELS = (
+    ModelOption(
+        'Gemini 1.5 Flash',
+        LLMConfig(provider='google', model="gemini-1.5-flash-latest")),
+    ModelOption('Gemini 1.5 Pro',
+                LLMConfig(provider='google', model="gemini-1.5-pro-001")),
+)
+
+GROQ_MODELS = tuple(
+    ModelOption(model, LLMConfig(provider='groq', model=model, temperature=0))
+    for model in ('llama3-8b-8192', 'mixtral-8x7b-32768', 'gemma-7b-it',
+                  'llama3-70b-8192'))
+
+ABOUT = '''
+**¿Qué puede hacer esta aplicación?**
+Esta aplicación permite a los usuarios iniciar un proceso de investigación integral sobre enfermedades específicas utilizando agentes de CrewAI. Los agentes recopilarán, analizarán y compilarán la información en una revisión coherente.
+
+**¿Cómo usar la aplicación?**
+1. Ingresa el nombre de una enfermedad en el campo de entrada.
+2. Haz clic en el botón "{start}" para comenzar el proceso.
+3. Los resultados se mostrarán una vez que la investigación esté completa.
+'''
+
+SPANISH = Labels(
+    start="Iniciar Revisión",
+    starting="Investigando {disease_name}...",
+    missing_input="Por favor, ingresa el nombre de una enfermedad.",
+    running='Ejecutando tareas de CrewAI...',
+    completed="Investigación completada!",
+    stored="Revisión recuperada de resultados guardados!",
+    joined=("La misma revisión ya se está ejecutando; su resultado también "
+            "se mostrará aquí."),
+    similar=('Mostrando la revisión guardada de la consulta similar '
+             '"{query}" ({similarity:.0%} de coincidencia). Pulsa '
+             '"{refresh}" para ejecutar tu consulta exacta.'),
+    error="Ocurrió un error: {error}",
+    refresh="Forzar actualización",
+    refresh_help="Ignora la revisión guardada y vuelve a ejecutar el crew",
+    details="Mostrar resultados detallados",
+    task="Tarea",
+    result="Resultado",
+    no_output="No hay resultado para esta tarea.",
+    about='Acerca de esta aplicación',
+    customization='Personalización',
+    model_help='Explicaciones del Modelo y Parámetros',
+    model='Elige un modelo',
+    model_selected='Modelo seleccionado: {model}',
+    max_tokens='Max Tokens de Salida',
+    copy='Copiar al portapapeles',
+    copy_hint='Usa Ctrl+C (o Cmd+C en Mac) para copiar el texto de arriba.',
+    download='Descargar',
+    download_format='Formato de descarga',
+    save='Guardar {file_name}',
+    missing_key=('La variable de entorno {key} no está configurada. Por '
+                 'favor, configura la variable de entorno {key}.'))
+
+CREW = CrewSpec(
+    name='review_enfermedades_gemini',
+    agents={
+        'researcher': AgentSpec(
+            role='Epidemiologist and Clinical Investigator',
+            goal=
+            'Conduct an in-depth investigation into the clinical and epidemiological aspects of {disease_name}',
+            backstory=
+            ("A seasoned epidemiologist with extensive experience in investigating infectious diseases and chronic conditions. "
+             "Your goal is to compile comprehensive clinical data, epidemiological statistics, and insights into {disease_name}. "
+             "You will focus on: \n"
+             "1. Clinical features: symptoms, progression, prognosis.\n"
+             "2. Epidemiology: incidence, prevalence, high-risk populations, risk factors, and causes.\n"
+             "3. Diagnosis: diagnostic methods, key findings, lab tests, and imaging studies."
+             )),
+        'analyst': AgentSpec(
+            role='Treatment Analyst and Data Synthesizer',
+            goal=
+            'Analyze the collected data and synthesize it into actionable insights regarding the management and outcomes of {disease_name}',
+            backstory=
+            ("An expert in medical data analysis and outcome prediction. Your task is to analyze treatment options, potential complications, "
+             "and follow-up strategies for {disease_name}. Focus on: \n"
+             "1. Treatment approaches: medical, surgical, multidisciplinary care.\n"
+             "2. Complications and follow-up: key complications, monitoring plans, factors influencing outcomes.\n"
+             "3. Evidence-based resources: medical textbooks, journal articles, international society guidelines, and expert opinions."
+             )),
+        'writer': AgentSpec(
+            role='Medical Writer and Reviewer',
+            goal=
+            'Compile and structure the findings into a coherent and comprehensive medical review',
+            backstory=
+            ("A proficient medical writer skilled in synthesizing complex medical information into clear and concise documents. "
+             "Your task is to write a detailed review on {disease_name}, incorporating: \n"
+             "1. Clinical features and epidemiology.\n"
+             "2. Pathophysiology and diagnosis.\n"
+             "3. Management strategies and complications.\n"
+             "4. Clinical applications and decision-making aids.")),
+    },
+    tasks={
+        'collect_clinical_features': TaskSpec(
+            agent='researcher',
+            description=
+            'Gather detailed information about the signs, symptoms, and clinical manifestations of {disease_name}',
+            expected_output=
+            'A comprehensive list of clinical features and the progression of {disease_name}',
+            context=()),
+        'determine_epidemiology': TaskSpec(
+            agent='researcher',
+            description=
+            'Determine the incidence, prevalence, and risk factors associated with {disease_name}',
+            expected_output=
+            'A detailed summary of epidemiological data for {disease_name}',
+            context=()),
+        'review_pathophysiology': TaskSpec(
+            agent='researcher',
+            description=
+            'Review the biological mechanisms and factors leading to {disease_name}',
+            expected_output=
+            'An in-depth explanation of the pathophysiology of {disease_name}',
+            context=()),
+        'familiarize_diagnostic_workup': TaskSpec(
+            agent='researcher',
+            description=
+            'Familiarize yourself with diagnostic methods, key findings, and specialized tests for {disease_name}',
+            expected_output=
+            'A comprehensive list of diagnostic strategies for {disease_name}',
+            context=('collect_clinical_features', 'review_pathophysiology')),
+        'review_management_approaches': TaskSpec(
+            agent='analyst',
+            description=
+            'Review evidence-based medical and surgical treatments and multidisciplinary care for {disease_name}',
+            expected_output=
+            'A summary of evidence-based treatment approaches for {disease_name}',
+            context=('familiarize_diagnostic_workup', )),
+        'recognize_complications': TaskSpec(
+            agent='analyst',
+            description=
+            'Recognize potential complications, monitoring plans, and follow-up strategies for {disease_name}',
+            expected_output=
+            'A detailed list of complications and follow-up strategies for {disease_name}',
+            context=('review_management_approaches', )),
+        'synthesize_information': TaskSpec(
+            agent='writer',
+            description=
+            'Synthesize all collected information into a comprehensive review of {disease_name}',
+            expected_output=
+            'A well-structured document in Spanish. It must integrate key clinical points and knowledge into clinical reasoning for {disease_name}, presented in Markdown, in professional technical language and suggesting further evidence-based resources.',
+            context=('collect_clinical_features', 'determine_epidemiology',
+                     'review_pathophysiology', 'familiarize_diagnostic_workup',
+                     'review_management_approaches',
+                     'recognize_complications')),
+    })
+
+UPGRADED_CREW = CREW.variant(
+    'review_enfermedades_groq_upgraded',
+    synthesize_information={
+        'expected_output':
+        'A well-structured document integrating key clinical points and knowledge into clinical reasoning for {disease_name}, presented in Markdown translated to Spanish'
+    })
+
+GROQ_CREW = CrewSpec(
+    name='review_enfermedades_groq',
+    agents={
+        'investigador': AgentSpec(
+            role='Epidemiólogo e Investigador Clínico',
+            goal=
+            'Realizar una investigación profunda sobre los aspectos clínicos y epidemiológicos de {disease_name}',
+            backstory=
+            ("Un epidemiólogo experimentado con amplia experiencia en la investigación de enfermedades infecciosas y condiciones crónicas. "
+             "Tu objetivo es recopilar datos clínicos completos, estadísticas epidemiológicas y conocimientos sobre {disease_name}. "
+             "Te centrarás en: \n"
+             "1. Características clínicas: síntomas, progresión, pronóstico.\n"
+             "2. Epidemiología: incidencia, prevalencia, poblaciones de alto riesgo, factores de riesgo y causas.\n"
+             "3. Diagnóstico: métodos diagnósticos, hallazgos clave, pruebas de laboratorio y estudios de imagen."
+             )),
+        'analista': AgentSpec(
+            role='Analista de Tratamiento y Sintetizador de Datos',
+            goal=
+            'Analizar los datos recopilados y sintetizarlos en conocimientos prácticos sobre el manejo y los resultados de {disease_name}',
+            backstory=
+            ("Un experto en análisis de datos médicos y predicción de resultados. Tu tarea es analizar las opciones de tratamiento, las complicaciones potenciales y "
+             "las estrategias de seguimiento para {disease_name}. Te centrarás en: \n"
+             "1. Enfoques de tratamiento: médicos, quirúrgicos, cuidado multidisciplinario.\n"
+             "2. Complicaciones y seguimiento: complicaciones clave, planes de monitoreo, factores que influyen en los resultados.\n"
+             "3. Recursos basados en evidencia: libros de texto médicos, artículos de revistas, guías y opiniones de expertos."
+             )),
+        'escritor': AgentSpec(
+            role='Escritor Médico y Revisor Jefe',
+            goal=
+            'Compilar y estructurar los hallazgos en una revisión médica coherente y completa',
+            backstory=
+            ("Un escritor médico competente con habilidad para sintetizar información médica compleja en documentos claros y concisos. "
+             "Tu tarea es escribir una revisión detallada sobre {disease_name}, incorporando: \n"
+             "1. Características clínicas y epidemiología.\n"
+             "2. Fisiopatología y diagnóstico.\n"
+             "3. Estrategias de manejo y complicaciones.\n"
+             "4. Aplicaciones clínicas y ayudas para la toma de decisiones.")),
+    },
+    tasks={
+        'recopilar_caracteristicas_clinicas': TaskSpec(
+            agent='investigador',
+            description=
+            'Recopilar información detallada sobre los signos, síntomas y manifestaciones clínicas de {disease_name}',
+            expected_output=
+            'Una lista completa de características clínicas y la progresión de {disease_name}',
+            context=()),
+        'determinar_epidemiologia': TaskSpec(
+            agent='investigador',
+            description=
+            'Determinar la incidencia, prevalencia y factores de riesgo asociados con {disease_name}',
+            expected_output=
+            'Un resumen detallado de datos epidemiológicos de {disease_name}',
+            context=()),
+        'revisar_fisiopatologia': TaskSpec(
+            agent='investigador',
+            description=
+            'Revisar los mecanismos biológicos y factores que conducen a {disease_name}',
+            expected_output=
+            'Una explicación detallada de la fisiopatología de {disease_name}',
+            context=()),
+        'familiarizarse_evaluacion_diagnostica': TaskSpec(
+            agent='investigador',
+            description=
+            'Familiarizarse con los métodos diagnósticos, hallazgos clave y pruebas especializadas para {disease_name}',
+            expected_output=
+            'Una lista completa de estrategias diagnósticas para {disease_name}',
+            context=('recopilar_caracteristicas_clinicas',
+                     'revisar_fisiopatologia')),
+        'revisar_enfoques_manejo': TaskSpec(
+            agent='analista',
+            description=
+            'Revisar los tratamientos médicos y quirúrgicos, y el cuidado multidisciplinario para {disease_name}',
+            expected_output=
+            'Un resumen de enfoques de manejo para {disease_name}',
+            context=('familiarizarse_evaluacion_diagnostica', )),
+        'reconocer_complicaciones': TaskSpec(
+            agent='analista',
+            description=
+            'Reconocer las complicaciones potenciales, planes de monitoreo y estrategias de seguimiento para {disease_name}',
+            expected_output=
+            'Una lista detallada de complicaciones y estrategias de seguimiento para {disease_name}',
+            context=('revisar_enfoques_manejo', )),
+        'sintetizar_informacion': TaskSpec(
+            agent='escritor',
+            description=
+            'Sintetizar toda la información recopilada en una revisión completa de {disease_name}',
+            expected_output=
+            'Un documento bien estructurado, en markdown, en español, que integre el conocimiento en el razonamiento clínico para {disease_name} y finalmente entregue 10 take-home messages o Perlas Clinicas para recordar.',
+            context=('recopilar_caracteristicas_clinicas',
+                     'determinar_epidemiologia', 'revisar_fisiopatologia',
+                     'familiarizarse_evaluacion_diagnostica',
+                     'revisar_enfoques_manejo', 'reconocer_complicaciones')),
+    })
+
+GEMINI_PAGE = PageSpec(
+    crew=CREW,
+    title="Review Enfermedades por IA ✨",
+    intro="Welcome to the Ranvier-Kronika AI Skill sites. Use the sidebar to navigate to different pages.",
+    about=ABOUT.format(start="Iniciar Review"),
+    inputs=(InputSpec('disease_name', "Ingresa una enfermedad o sindrome:"), ),
+    models=GEMINI_MODELS,
+    tunable=True,
+    model_help='''
+**Selección de Modelo:**
+- **Gemini 1.5 Flash:** Modelo más reciente de Google. Enfocado en balancear calidad de respuesta, mayor rapidez y menor precio.
+- **Gemini 1.5 Pro:** Un modelo premium ligeramente más lento, pero más potente y capaz de generar salidas detalladas y complejas.
+
+**Temperatura:**
+- Controla la creatividad del modelo. Valores más bajos hacen que la salida sea más determinista, mientras que valores más altos la hacen más creativa y variada.
+
+**Máximo de Tokens de Salida:**
+- Determina el número máximo de tokens (2-3 tokens son una palabra) que el modelo puede generar. Valores más altos permiten respuestas más largas.
+''',
+    store_results=True,
+    free_text=False,
+    context_budget=True,
+    task_progress=True,
+    export=True,
+    labels=Labels(start="Iniciar Review",
+                  missing_input="Please enter a disease name.",
+                  running="Please wait while the task is running...",
+                  completed="Research completed!",
+                  stored="Research completed!",
+                  similar=SPANISH.similar,
+                  refresh=SPANISH.refresh,
+                  refresh_help=SPANISH.refresh_help,
+                  about=SPANISH.about,
+                  model_help=SPANISH.model_help,
+                  model=SPANISH.model,
+                  max_tokens=SPANISH.max_tokens))
+
+GROQ_PAGE = PageSpec(
+    crew=GROQ_CREW,
+    title="Revisión de Enfermedades por IA ✨ ",
+    intro="Bienvenido a los sitios de habilidades de IA de Ranvier-Kronika. Usa la barra lateral para navegar a diferentes páginas.",
+    about=ABOUT.format(start="Iniciar Revisión"),
+    inputs=(InputSpec('disease_name', "Ingresa una enfermedad o síndrome:"), ),
+    models=GROQ_MODELS,
+    # The writer runs on Gemini Flash, every other agent on the Groq model
+    agent_models={
+        'Escritor Médico y Revisor Jefe':
+        LLMConfig(provider='google',
+                  model="gemini-1.5-flash-latest",
+                  temperature=0),
+    },
+    store_results=True,
+    free_text=False,
+    context_budget=True,
+    labels=SPANISH)
+
+UPGRADED_PAGE = PageSpec(
+    crew=UPGRADED_CREW,
+    title="Review Enfermedades por IA ✨ ",
+    intro="Welcome to the Ranvier-Kronika AI Skill sites. Use the sidebar to navigate to different pages.",
+    about=ABOUT.format(start="Iniciar Review"),
+    inputs=(InputSpec('disease_name', "Ingresa una enfermedad o sindrome:"), ),
+    models=GROQ_MODELS,
+    agent_models={
+        'Medical Writer and Reviewer':
+        LLMConfig(provider='google',
+                  model="gemini-1.5-flash-latest",
+                  temperature=0,
+                  max_tokens=8192),
+    },
+    store_results=True,
+    free_text=False,
+    context_budget=True,
+    labels=Labels(start="Iniciar Review",
+                  starting="Researching {disease_name}...",
+                  missing_input="Please enter a disease name.",
+                  completed="Research completed!",
+                  stored="Research loaded from stored results!",
+                  refresh_help="Ignore the stored review and run the crew "
+                  "again"))
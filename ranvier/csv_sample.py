@@ -0,0 +1,93 @@
+"""Bounded-memory sampling of uploaded CSV files.
+
+``sample_csv`` reads an upload in fixed-size chunks and keeps a uniform
+reservoir of rows (Algorithm R), so memory holds one chunk plus the sample
+however large the file is. Chunks are read as text, which skips pandas'
+per-chunk type inference; dtypes are inferred once, from the first chunk, and
+applied to the sample at the end. Scanning stops after ``max_rows`` rows. The
+draw is seeded, so the same file always yields the same sample. Callers that
+need more than the sample, such as ``ranvier.data_profile``, see every chunk
+through ``on_chunk`` in the same pass.
+"""
+import io
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from ranvier import settings
+
+
+@dataclass
+class CsvSample:
+    frame: Any  # pandas.DataFrame indexed by row number in the file
+    rows_seen: int
+    truncated: bool  # True when scanning stopped at max_rows
+
+
+def _reparse(frame, dtype=None):
+    # Parse the text rows the way pandas would have parsed them from the file
+    import pandas as pd
+
+    text = frame.to_csv(index=False)
+    try:
+        parsed = pd.read_csv(io.StringIO(text), dtype=dtype)
+    except (ValueError, TypeError):
+        # A later row does not fit a type guessed from the first chunk
+        parsed = pd.read_csv(io.StringIO(text))
+    parsed.index = frame.index
+    return parsed
+
+
+def sample_csv(file,
+               rows: int = None,
+               chunk_rows: int = None,
+               max_rows: int = None,
+               seed: int = 0,
+               on_chunk: Optional[Callable] = None) -> CsvSample:
+    """Return a uniform sample of ``rows`` rows from a CSV file or buffer.
+
+    ``on_chunk`` is called with every text chunk and the first-chunk dtypes.
+    """
+    import numpy as np
+    import pandas as pd
+
+    rows = rows or settings.CSV_SAMPLE_ROWS
+    chunk_rows = chunk_rows or settings.CSV_CHUNK_ROWS
+    max_rows = max_rows or settings.CSV_SCAN_MAX_ROWS
+    rng = np.random.default_rng(seed)
+
+    sample = header = None
+    slots = []  # file row number held by each reservoir slot
+    dtypes = None
+    seen = 0
+    with pd.read_csv(file, dtype=str, chunksize=chunk_rows) as reader:
+        for chunk in reader:
+            chunk = chunk.iloc[:max_rows - seen]
+            chunk.index = pd.RangeIndex(seen, seen + len(chunk))
+            if dtypes is None:
+                header = chunk.iloc[:0]
+                dtypes = _reparse(chunk).dtypes.to_dict()
+            if on_chunk is not None:
+                on_chunk(chunk, dtypes)
+            # Fill the reservoir, then row i replaces slot j ~ U[0, i] if j < rows
+            fill = min(len(chunk), rows - len(slots))
+            slots.extend(chunk.index[:fill])
+            later = np.asarray(chunk.index[fill:])
+            draws = (rng.random(len(later)) * (later + 1)).astype(int)
+            hits = draws < rows
+            for row, slot in zip(later[hits], draws[hits]):
+                slots[slot] = row
+            kept = chunk.index.isin(slots)
+            if kept.any():
+                parts = [chunk[kept]]
+                if sample is not None:
+                    parts.insert(0, sample[sample.index.isin(slots)])
+                sample = pd.concat(parts)
+            seen += len(chunk)
+            if seen >= max_rows:
+                break
+    if sample is None:
+        # A header line without rows
+        sample = header if header is not None else pd.DataFrame()
+    else:
+        sample = _reparse(sample.sort_index(), dtypes)
+    return CsvSample(sample, seen, seen >= max_rows)
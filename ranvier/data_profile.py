@@ -0,0 +1,211 @@
+"""Compact statistical profile of an uploaded dataset.
+
+The data assessment task used to see the first five rows of the upload. A
+profile describes the whole file in fewer tokens: per-column dtype,
+missingness, cardinality, summary statistics, quantiles and class balance,
+plus the most correlated numeric pairs. It is built in the same chunked pass
+as ``ranvier.csv_sample``, so memory stays bounded. Counts, missingness,
+means and ranges are exact over every scanned row; quantiles and
+correlations are estimated from a uniform sample of ``CSV_PROFILE_ROWS``
+rows. All statistics are computed column-wise with pandas and NumPy.
+"""
+from dataclasses import dataclass
+from typing import Any
+
+from ranvier import settings
+from ranvier.csv_sample import CsvSample, sample_csv
+
+# Distinct values counted per column before reporting only "more than"
+_DISTINCT_CAP = 1000
+# Columns with at most this many values are reported as classes
+_MAX_CLASSES = 10
+_QUANTILES = (0.25, 0.5, 0.75)
+_MIN_CORRELATION = 0.5
+_MAX_CORRELATIONS = 5
+
+
+def _numeric(dtype) -> bool:
+    return dtype.kind in 'iuf'
+
+
+def _numbers(frame):
+    # Text columns as floats; values that do not parse become NaN
+    import pandas as pd
+
+    try:
+        return frame.astype('float64')
+    except (ValueError, TypeError):
+        return frame.apply(pd.to_numeric, errors='coerce')
+
+
+class _Accumulator:
+    """Column statistics merged chunk by chunk."""
+
+    def __init__(self):
+        self.columns = None
+        self.numeric = []
+        self.rows = 0
+        self.missing = self.invalid = 0
+        # Per-column count, mean and sum of squared deviations, merged with
+        # Chan et al.'s pairwise update to stay stable for large values
+        self.count = self.mean = self.m2 = 0
+        self.low = self.high = 0
+        self.counts = {}  # column -> value counts, None past _DISTINCT_CAP
+
+    def update(self, chunk, dtypes: dict) -> None:
+        import numpy as np
+        import pandas as pd
+
+        if self.columns is None:
+            self.columns = dtypes
+            self.numeric = [c for c, dtype in dtypes.items() if _numeric(dtype)]
+            self.counts = {column: pd.Series(dtype=float) for column in dtypes}
+            self.low = pd.Series(np.inf, index=self.numeric)
+            self.high = pd.Series(-np.inf, index=self.numeric)
+        self.rows += len(chunk)
+        self.missing = self.missing + chunk.isna().sum()
+
+        values = _numbers(chunk[self.numeric])
+        self.invalid = self.invalid + (values.isna().sum() -
+                                       chunk[self.numeric].isna().sum())
+        count, mean = values.count(), values.mean()
+        m2 = ((values - mean)**2).sum()
+        total = self.count + count
+        delta = (mean - self.mean).fillna(0)
+        weight = (count / total.replace(0, np.nan)).fillna(0)
+        self.mean = self.mean + delta * weight
+        self.m2 = self.m2 + m2 + delta**2 * self.count * weight
+        self.count = total
+        self.low = np.fmin(self.low, values.min())
+        self.high = np.fmax(self.high, values.max())
+
+        for column, counts in self.counts.items():
+            if counts is not None:
+                counts = counts.add(chunk[column].value_counts(),
+                                    fill_value=0)
+                self.counts[column] = (counts if len(counts) <= _DISTINCT_CAP
+                                       else None)
+
+
+@dataclass
+class DatasetProfile:
+    rows: int
+    truncated: bool  # True when scanning stopped at CSV_SCAN_MAX_ROWS
+    columns: Any  # pandas.DataFrame with one row per column of the file
+    correlations: list  # (column, column, r), strongest first
+    sample: CsvSample  # CSV_SAMPLE_ROWS rows for display
+
+    def text(self) -> str:
+        """Render the profile as compact text for a prompt."""
+        scanned = f'{self.rows:,} rows'
+        if self.truncated:
+            scanned = f'first {scanned} (file truncated)'
+        lines = [f'{scanned}, {len(self.columns)} columns']
+        for column in self.columns.itertuples():
+            lines.append(f'- {column.Index} ({column.dtype}): {column.summary}')
+        if self.correlations:
+            lines.append('Strongest correlations: ' + '; '.join(
+                f'{a} ~ {b} r={r:+.2f}' for a, b, r in self.correlations))
+        return '\n'.join(lines)
+
+
+def _number(value) -> str:
+    return f'{value:.4g}'
+
+
+def _classes(counts, limit: int) -> str:
+    shares = (counts / counts.sum()).sort_values(ascending=False)
+    return ', '.join(f'{value} {share:.1%}'
+                     for value, share in shares.head(limit).items())
+
+
+def _summaries(stats, quantiles) -> list:
+    summaries = []
+    for column in stats.itertuples():
+        parts = [f'missing {column.missing_share:.1%}']
+        if column.distinct < 0:
+            parts.append(f'>{_DISTINCT_CAP} distinct')
+        else:
+            parts.append(f'{column.distinct} distinct')
+        if column.invalid:
+            parts.append(f'{column.invalid:,} non-numeric')
+        if column.classes:
+            parts.append(f'classes {column.classes}')
+        elif column.mean == column.mean:  # not NaN
+            parts.append(f'mean {_number(column.mean)} '
+                         f'sd {_number(column.std)}')
+            parts.append(f'range {_number(column.low)}'
+                         f'..{_number(column.high)}')
+            quartiles = quantiles.get(column.Index)
+            if quartiles:
+                parts.append('quartiles ' +
+                             '/'.join(map(_number, quartiles.values())))
+        elif column.top:
+            parts.append(f'top {column.top}')
+        summaries.append('; '.join(parts))
+    return summaries
+
+
+def profile_csv(file, seed: int = 0) -> DatasetProfile:
+    """Profile a CSV file or buffer in one bounded-memory pass."""
+    import numpy as np
+    import pandas as pd
+
+    accumulator = _Accumulator()
+    reservoir = sample_csv(file,
+                           rows=max(settings.CSV_PROFILE_ROWS,
+                                    settings.CSV_SAMPLE_ROWS),
+                           seed=seed,
+                           on_chunk=accumulator.update)
+    frame = reservoir.frame
+    shown = frame.sample(min(settings.CSV_SAMPLE_ROWS, len(frame)),
+                         random_state=seed).sort_index()
+    sample = CsvSample(shown, reservoir.rows_seen, reservoir.truncated)
+    dtypes = accumulator.columns or {}
+    if not dtypes:
+        return DatasetProfile(0, False, pd.DataFrame(), [], sample)
+
+    names = list(dtypes)
+    rows = max(accumulator.rows, 1)
+    stats = pd.DataFrame(index=pd.Index(names, name='column'))
+    stats['dtype'] = [str(dtypes[name]) for name in names]
+    stats['missing_share'] = accumulator.missing / rows
+    stats['distinct'] = [
+        -1 if counts is None else len(counts)
+        for counts in accumulator.counts.values()
+    ]
+    stats['classes'] = [
+        _classes(counts, _MAX_CLASSES)
+        if counts is not None and 0 < len(counts) <= _MAX_CLASSES else ''
+        for counts in accumulator.counts.values()
+    ]
+    stats['top'] = [
+        _classes(counts, 3) if counts is not None and len(counts) else ''
+        for counts in accumulator.counts.values()
+    ]
+    stats['invalid'] = 0
+    stats['mean'] = stats['std'] = stats['low'] = stats['high'] = np.nan
+    numeric = accumulator.numeric
+    if numeric:
+        count = accumulator.count.replace(0, np.nan)
+        stats.loc[numeric, 'invalid'] = accumulator.invalid
+        stats.loc[numeric, 'mean'] = accumulator.mean.where(count.notna())
+        stats.loc[numeric, 'std'] = np.sqrt(accumulator.m2 / count)
+        stats.loc[numeric, 'low'] = accumulator.low
+        stats.loc[numeric, 'high'] = accumulator.high
+
+    values = _numbers(frame[[c for c in numeric if c in frame]])
+    quantiles = values.quantile(list(_QUANTILES)).to_dict() \
+        if len(values) else {}
+    stats['summary'] = _summaries(stats, quantiles)
+
+    correlations = []
+    if values.shape[1] > 1 and len(values) > 2:
+        matrix = values.corr().to_numpy()
+        upper = np.triu(np.abs(np.nan_to_num(matrix)) >= _MIN_CORRELATION, 1)
+        for i, j in zip(*np.nonzero(upper)):
+            correlations.append((values.columns[i], values.columns[j],
+                                 float(matrix[i, j])))
+        correlations.sort(key=lambda pair: -abs(pair[2]))
+    return DatasetProfile(accumulator.rows, reservoir.truncated, stats,
+                          correlations[:_MAX_CORRELATIONS], sample)
@@ -0,0 +1,72 @@
+"""Downloadable renderings of a finished run.
+
+Downloads used to go through a shared ``result.md`` in the working directory,
+read back and base64-embedded in a link. Runs are now rendered straight from
+memory, and only in the format the user asked for, when they ask for it. A
+run is the plain record kept by ``ranvier.ui.keep_run``: the final answer
+plus, for crew pages, the per-task records.
+"""
+import functools
+import json
+import re
+from typing import Callable, NamedTuple
+
+
+class Format(NamedTuple):
+    extension: str
+    mime: str
+    render: Callable[[dict], str]
+
+
+def _markdown(run: dict) -> str:
+    return run['result'] or ''
+
+
+# Markdown markup that plain text leaves out
+_LINK = re.compile(r'!?\[([^\]]*)\]\(([^)]*)\)')
+_MARKUP = re.compile(r'^\s{0,3}(#{1,6}\s+|>\s?)|(\*\*|__|`+)', re.MULTILINE)
+
+
+def _text(run: dict) -> str:
+    return _MARKUP.sub('', _LINK.sub(r'\1 (\2)', _markdown(run)))
+
+
+def _json(run: dict) -> str:
+    return json.dumps(
+        {
+            'result': run['result'],
+            'tasks': run.get('detailed_results') or [],
+        },
+        ensure_ascii=False,
+        indent=2)
+
+
+def _html(run: dict) -> str:
+    import markdown
+
+    body = markdown.markdown(_markdown(run),
+                             extensions=['tables', 'fenced_code'])
+    return ('<!DOCTYPE html>\n<html><head><meta charset="utf-8"></head>'
+            f'<body>\n{body}\n</body></html>\n')
+
+
+@functools.lru_cache(maxsize=1)
+def formats() -> dict:
+    """Download formats by label; HTML only when ``markdown`` is installed."""
+    available = {
+        'Markdown': Format('md', 'text/markdown', _markdown),
+        'Plain text': Format('txt', 'text/plain', _text),
+        'JSON': Format('json', 'application/json', _json),
+    }
+    try:
+        import markdown  # noqa: F401
+    except ImportError:
+        pass
+    else:
+        available['HTML'] = Format('html', 'text/html', _html)
+    return available
+
+
+def export(run: dict, label: str) -> bytes:
+    """Render ``run`` in the format called ``label``, as UTF-8 bytes."""
+    return formats()[label].render(run).encode('utf-8')
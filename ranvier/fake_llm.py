@@ -0,0 +1,114 @@
+"""Offline stand-in for the chat model providers.
+
+``FakeChatModel`` answers every prompt with a canned final answer. It waits
+a first-token latency, emits its tokens at a fixed rate through the usual
+streaming callbacks and reports token usage the way providers do, so rate
+limiting, profiling and streaming behave as they would against a real model.
+Pages get it with ``LLMConfig(provider='fake', ...)``, or all at once with
+``RANVIER_FAKE_LLM=1``; the benchmark suite uses it to measure the app
+without API keys or cost.
+"""
+import itertools
+import re
+import threading
+import time
+import zlib
+from typing import List
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from ranvier import settings
+from ranvier.profiling import estimate_tokens
+
+_WORDS = ('the findings suggest a structured approach to evaluation, '
+          'management and follow-up, weighing the evidence for each option '
+          'against its risks and the resources available').split()
+
+_TOKEN = re.compile(r'\S+\s*')
+
+
+def canned_answer(tokens: int) -> str:
+    """A ReAct final answer, as crewAI agents expect, of ``tokens`` words."""
+    body = ' '.join(itertools.islice(itertools.cycle(_WORDS), tokens))
+    return f'Thought: I now know the final answer\nFinal Answer: {body}'
+
+
+class FakeChatModel(BaseChatModel):
+    """Answers locally with canned text at a configurable pace."""
+    model_name: str = 'fake'
+    latency: float = 0.0  # seconds before the first token
+    tokens_per_second: float = 0.0  # 0 returns the whole answer at once
+    response_tokens: int = 300
+    responses: List[str] = []  # picked by prompt; canned_answer() when empty
+    streaming: bool = False
+
+    @property
+    def _llm_type(self) -> str:
+        return 'ranvier-fake'
+
+    @property
+    def _identifying_params(self) -> dict:
+        return {
+            'model_name': self.model_name,
+            'response_tokens': self.response_tokens,
+            'responses': self.responses,
+        }
+
+    def _answer(self, prompt: str) -> str:
+        if not self.responses:
+            return canned_answer(self.response_tokens)
+        # The same prompt always gets the same answer, in every process
+        index = zlib.crc32(prompt.encode('utf-8')) % len(self.responses)
+        return self.responses[index]
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        started = time.monotonic()
+        prompt = '\n'.join(str(message.content) for message in messages)
+        text = self._answer(prompt)
+        tokens = _TOKEN.findall(text)
+        for i, token in enumerate(tokens):
+            due = started + self.latency + (i / self.tokens_per_second
+                                            if self.tokens_per_second else 0)
+            delay = due - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            if self.streaming and run_manager is not None:
+                run_manager.on_llm_new_token(token)
+        message = AIMessage(content=text)
+        return ChatResult(generations=[ChatGeneration(message=message)],
+                          llm_output={
+                              'model_name': self.model_name,
+                              'token_usage': {
+                                  'prompt_tokens': estimate_tokens(prompt),
+                                  'completion_tokens': len(tokens),
+                              },
+                          })
+
+
+_options = {
+    'latency': settings.FAKE_LLM_LATENCY,
+    'tokens_per_second': settings.FAKE_LLM_TOKENS_PER_SECOND,
+    'response_tokens': 300,
+}
+_options_lock = threading.Lock()
+
+
+def configure(**options) -> None:
+    """Set ``FakeChatModel`` fields for the fake clients built from now on."""
+    with _options_lock:
+        _options.update(options)
+
+
+def build_fake_llm(config, **kwargs) -> FakeChatModel:
+    """The fake client standing in for ``config``; ``kwargs`` as for any."""
+    with _options_lock:
+        options = dict(_options)
+    if config.max_tokens:
+        options['response_tokens'] = min(options['response_tokens'],
+                                         config.max_tokens)
+    return FakeChatModel(model_name=config.model,
+                         streaming=config.streaming,
+                         **options,
+                         **kwargs)
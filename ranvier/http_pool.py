@@ -0,0 +1,196 @@
+"""Shared keep-alive HTTP connection pools for the LLM providers.
+
+The crew factory already shares one chat model client per ``LLMConfig``, but
+each of those clients opened its own connections. Every model of a provider,
+and the first call after a connection went idle, paid for a new TCP and TLS
+handshake. Groq and OpenAI now get one ``httpx.Client`` each per process.
+All of a provider's models, sessions and the batch runner share it, and it
+keeps connections alive for ``HTTP_KEEPALIVE_SECONDS``. ``prewarm`` opens a
+connection to each of them that has an API key in the background when the
+first page loads, once that page's script has had a moment to run. That way
+the first crew call of a fresh container skips the handshake too.
+
+The pools also watch what the provider SDKs do on their own: they retry
+failed requests internally and tell LangChain nothing. Every request a
+thread sends is counted, so the run profiler can tell retries from first
+attempts. Every 429 pauses the model's rate limiter for its
+``Retry-After`` as soon as it arrives, while the SDK is still retrying.
+
+Gemini is not pooled here: its SDK talks gRPC over a channel of its own,
+which is already long-lived because the client is shared. Neither is
+Anthropic, whose chat model takes no ``http_client``; each shared client
+keeps the keep-alive pool of its own SDK instance.
+"""
+import json
+import logging
+import os
+import threading
+import time
+
+from ranvier import settings
+
+logger = logging.getLogger(__name__)
+
+# Provider -> (API key variable, base URL variable, default base URL)
+_ENDPOINTS = {
+    'groq': ('GROQ_API_KEY', 'GROQ_BASE_URL', 'https://api.groq.com'),
+    'openai': ('OPENAI_API_KEY', 'OPENAI_BASE_URL', 'https://api.openai.com'),
+}
+
+
+# Requests each thread has sent through the pools, pre-warming excluded
+_sent = threading.local()
+
+
+def requests_sent() -> int:
+    """Requests the calling thread has sent through any pool so far."""
+    return getattr(_sent, 'count', 0)
+
+
+class ConnectionPool:
+    """One provider's ``httpx.Client``, counting how often it reconnects."""
+
+    def __init__(self, provider: str):
+        import httpx
+
+        self.provider = provider
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._connections = 0
+        self._prewarmed = 0
+        self._connect_seconds = 0.0
+        self.client = httpx.Client(
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_POOL_CONNECTIONS,
+                max_keepalive_connections=settings.HTTP_POOL_CONNECTIONS,
+                keepalive_expiry=settings.HTTP_KEEPALIVE_SECONDS),
+            timeout=httpx.Timeout(600.0, connect=10.0),
+            event_hooks={
+                'request': [self._on_request],
+                'response': [self._on_response]
+            })
+
+    def _on_request(self, request) -> None:
+        # httpcore reports connection setup through the trace extension; a
+        # request on a pooled connection reports none. Pre-warming requests
+        # open connections but are not counted as requests
+        warming = bool(request.extensions.get('ranvier_prewarm'))
+        started = {}
+
+        def trace(event, info):
+            now = time.perf_counter()
+            if event.endswith('.started'):
+                started[event[:-len('.started')]] = now
+                return
+            if event not in ('connection.connect_tcp.complete',
+                             'connection.start_tls.complete'):
+                return
+            seconds = now - started.get(event[:-len('.complete')], now)
+            with self._lock:
+                if warming:
+                    self._prewarmed += event.endswith('tcp.complete')
+                    return
+                self._connections += event.endswith('tcp.complete')
+                self._connect_seconds += seconds
+
+        request.extensions['trace'] = trace
+        if not warming:
+            _sent.count = requests_sent() + 1
+            with self._lock:
+                self._requests += 1
+
+    def _on_response(self, response) -> None:
+        if (response.status_code != 429
+                or response.request.extensions.get('ranvier_prewarm')):
+            return
+        try:
+            model = json.loads(response.request.content).get('model')
+        except Exception:
+            model = None  # not a JSON body naming its model
+        if model:
+            from ranvier import rate_limit
+
+            rate_limit.throttled(self.provider, model, response.headers)
+
+    def warm(self, url: str) -> None:
+        """Open a connection to ``url``'s host and leave it in the pool."""
+        request = self.client.build_request(
+            'HEAD', url, extensions={'ranvier_prewarm': True})
+        self.client.send(request).close()
+
+    def stats(self) -> dict:
+        """Requests sent, connections opened for them and the time spent."""
+        with self._lock:
+            return {
+                'requests': self._requests,
+                'connections': self._connections,
+                'prewarmed': self._prewarmed,
+                'reused': max(0, self._requests - self._connections),
+                'connect_seconds': self._connect_seconds,
+            }
+
+
+# Importing httpx in the background would compete with the first script run
+_PREWARM_DELAY_SECONDS = 1.0
+
+_pools = {}
+_pools_lock = threading.Lock()
+_prewarm_started = False
+
+
+def pooled(provider: str) -> bool:
+    """Whether ``provider``'s calls go through a shared connection pool."""
+    return provider in _ENDPOINTS and not settings.FAKE_LLM
+
+
+def get_connection_pool(provider: str) -> ConnectionPool:
+    """Return the process-wide connection pool of ``provider``."""
+    pool = _pools.get(provider)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(provider)
+            if pool is None:
+                pool = _pools[provider] = ConnectionPool(provider)
+    return pool
+
+
+def get_http_client(provider: str):
+    """Return the shared ``httpx.Client`` of ``provider``."""
+    return get_connection_pool(provider).client
+
+
+def _prewarm() -> None:
+    for provider, (key, base_url, default) in _ENDPOINTS.items():
+        if not os.getenv(key):
+            continue
+        try:
+            get_connection_pool(provider).warm(
+                os.getenv(base_url) or default)
+        except Exception as e:
+            logger.info('Could not pre-warm %s connections: %s', provider, e)
+
+
+def prewarm() -> None:
+    """Connect to every provider with an API key, once per process.
+
+    Runs in a background thread, shortly after the call, so the page that
+    calls it does not wait.
+    """
+    global _prewarm_started
+    if _prewarm_started or settings.FAKE_LLM or not settings.HTTP_PREWARM:
+        return
+    with _pools_lock:
+        if _prewarm_started:
+            return
+        _prewarm_started = True
+    timer = threading.Timer(_PREWARM_DELAY_SECONDS, _prewarm)
+    timer.name = 'http-prewarm'
+    timer.daemon = True
+    timer.start()
+
+
+def connection_pool_stats() -> dict:
+    """``ConnectionPool.stats`` of every pool opened so far, by provider."""
+    with _pools_lock:
+        pools = dict(_pools)
+    return {provider: pool.stats() for provider, pool in pools.items()}
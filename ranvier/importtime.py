@@ -0,0 +1,120 @@
+"""Import-time profile of ``Home.py`` and every page.
+
+Cold start on a fresh container is dominated by what the first script run
+imports. This runs ``Home.py`` and each page in a fresh interpreter under
+``python -X importtime`` and reports how long the run took, how much of it
+went to imports and which top-level packages cost the most::
+
+    python -m ranvier.importtime
+    python -m ranvier.importtime --json > importtime.json
+
+Scripts run in Streamlit's bare mode: there is no server, buttons are not
+pressed and no crew is kicked off, which is exactly what a first visit
+does. Missing API keys are replaced by placeholders in the child process
+only, so pages render past their key checks; nothing is sent anywhere.
+Run it before and after a change to see what it does to cold start.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from collections import Counter
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+_KEYS = ('GOOGLE_API_KEY', 'GROQ_API_KEY', 'OPENAI_API_KEY',
+         'ANTHROPIC_API_KEY')
+
+_MARKER = 'ranvier-importtime:'
+
+_CHILD = f"""
+import json, runpy, sys, time
+started = time.perf_counter()
+error = None
+try:
+    runpy.run_path(sys.argv[1], run_name='__main__')
+except BaseException as e:
+    error = repr(e)
+print({_MARKER!r} + json.dumps(
+    {{'seconds': time.perf_counter() - started, 'error': error}}))
+"""
+
+
+def scripts() -> list:
+    return [ROOT / 'Home.py'] + sorted((ROOT / 'pages').glob('*.py'))
+
+
+def parse_importtime(stderr: str) -> Counter:
+    """Cumulative seconds per top-level package from ``-X importtime``."""
+    packages = Counter()
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if not cumulative.strip().isdigit() or name.startswith('  '):
+            continue  # the header, or a nested import already counted above
+        packages[name.strip().split('.')[0]] += int(cumulative) / 1e6
+    return packages
+
+
+def profile(script: Path, top: int = 8) -> dict:
+    """Run ``script`` once in a fresh interpreter and profile its imports."""
+    env = dict(os.environ)
+    for key in _KEYS:
+        env.setdefault(key, 'importtime-placeholder')
+    done = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', _CHILD,
+         str(script)],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True)
+    result = {'seconds': None, 'error': done.stderr[-500:]}
+    for line in done.stdout.splitlines():
+        if line.startswith(_MARKER):
+            result = json.loads(line[len(_MARKER):])
+    packages = parse_importtime(done.stderr)
+    return {
+        'script': str(script.relative_to(ROOT)),
+        'seconds': result['seconds'],
+        'import_seconds': sum(packages.values()),
+        'packages': dict(packages.most_common(top)),
+        'error': result['error'],
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='python -m ranvier.importtime',
+        description='Profile the imports of Home.py and every page.')
+    parser.add_argument('--json',
+                        action='store_true',
+                        help='print JSON instead of a markdown table')
+    parser.add_argument('--top',
+                        type=int,
+                        default=5,
+                        help='packages listed per script (default: 5)')
+    args = parser.parse_args(argv)
+
+    profiles = [profile(script, args.top) for script in scripts()]
+    if args.json:
+        print(json.dumps(profiles, indent=2))
+        return 0
+    print('| script | run (s) | imports (s) | heaviest imports (s) |')
+    print('| --- | ---: | ---: | --- |')
+    for p in profiles:
+        heaviest = ', '.join(f'{name} {seconds:.2f}'
+                             for name, seconds in p['packages'].items())
+        run = 'failed' if p['error'] else f"{p['seconds']:.2f}"
+        print(f"| {p['script']} | {run} | {p['import_seconds']:.2f} "
+              f"| {heaviest} |")
+    failed = [p for p in profiles if p['error']]
+    for p in failed:
+        print(f"\n{p['script']}: {p['error']}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,157 @@
+"""Process-wide background job runner for crew kickoffs.
+
+A kickoff takes minutes, so pages no longer run it inside the Streamlit
+script thread. They submit it here and keep only the job id, in
+``st.session_state`` and in the URL query string. The job keeps running
+across reruns, and a reconnecting browser (which gets a fresh session)
+finds it again through the URL. Finished jobs are kept for
+``JOB_RETENTION_MINUTES`` so their results can still be collected. Every
+job carries a ``RunProfile`` that is written to the profile store when the
+job ends, whether it succeeded or not, and a ``TokenStream`` that shows
+the final task's answer while it is being written.
+
+A job may be submitted under a key naming what it computes (page, inputs,
+models). While a job with that key is queued or running, submitting the
+same key again joins it instead of starting an identical run, so every
+requester follows the one job and collects the same result.
+"""
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from ranvier import settings
+from ranvier.profiling import RunProfile, get_profile_store
+from ranvier.streaming import TokenStream
+
+logger = logging.getLogger(__name__)
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+
+@dataclass
+class Job:
+    id: str
+    page: str
+    status: str = QUEUED
+    result: Any = None
+    error: Optional[str] = None
+    submitted: float = field(default_factory=time.time)
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    # Task index -> 'started' / 'finished', filled in by the scheduler
+    task_states: dict = field(default_factory=dict)
+    profile: Optional[RunProfile] = None
+    stream: TokenStream = field(default_factory=TokenStream)
+    key: Optional[str] = None
+    requesters: int = 1  # submissions that joined this job, plus its own
+
+    @property
+    def active(self) -> bool:
+        return self.status in (QUEUED, RUNNING)
+
+
+class JobManager:
+    """Bounded worker pool plus an in-memory table of recent jobs."""
+
+    def __init__(self, max_workers: int, retention_seconds: float):
+        self.retention_seconds = retention_seconds
+        self._pool = ThreadPoolExecutor(max_workers=max_workers,
+                                        thread_name_prefix='crew-job')
+        self._jobs = {}
+        self._in_flight = {}  # job key -> id of the active job
+        self._joined = 0
+        self._lock = threading.Lock()
+
+    def submit(self,
+               page: str,
+               fn: Callable[[Job], Any],
+               key: Optional[str] = None) -> Job:
+        """Queue ``fn(job)``; its return value becomes ``job.result``.
+
+        If a job submitted under the same ``key`` is still active, that job
+        is returned instead and ``fn`` is dropped.
+        """
+        with self._lock:
+            running = self._jobs.get(self._in_flight.get(key))
+            if running is not None and running.active:
+                running.requesters += 1
+                self._joined += 1
+                return running
+            job = Job(id=uuid.uuid4().hex, page=page, key=key)
+            job.profile = RunProfile(run_id=job.id,
+                                     page=page,
+                                     submitted=job.submitted)
+            self._prune()
+            self._jobs[job.id] = job
+            if key is not None:
+                self._in_flight[key] = job.id
+        self._pool.submit(self._run, job, fn)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def stats(self) -> dict:
+        """Queued and running jobs, and the identical runs saved by joining
+        one."""
+        with self._lock:
+            statuses = [job.status for job in self._jobs.values()]
+            return {
+                'queued': statuses.count(QUEUED),
+                'running': statuses.count(RUNNING),
+                'joined': self._joined,
+            }
+
+    def _run(self, job: Job, fn: Callable[[Job], Any]) -> None:
+        job.started = job.profile.started = time.time()
+        job.status = RUNNING
+        try:
+            job.result = fn(job)
+            job.status = DONE
+        except Exception as e:
+            job.error = str(e)
+            job.status = FAILED
+            logger.exception('Job %s on %s failed', job.id, job.page)
+        finally:
+            with self._lock:
+                if self._in_flight.get(job.key) == job.id:
+                    del self._in_flight[job.key]
+            job.finished = job.profile.finished = time.time()
+            job.profile.status = job.status
+            try:
+                get_profile_store().put(job.profile)
+            except Exception:
+                logger.exception('Could not store the profile of job %s',
+                                 job.id)
+
+    def _prune(self) -> None:
+        cutoff = time.time() - self.retention_seconds
+        for job_id in [
+                job_id for job_id, job in self._jobs.items()
+                if job.finished is not None and job.finished < cutoff
+        ]:
+            del self._jobs[job_id]
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_job_manager() -> JobManager:
+    """Return the process-wide job manager, starting it on first use."""
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = JobManager(
+                    max_workers=settings.MAX_CONCURRENT_RUNS,
+                    retention_seconds=settings.JOB_RETENTION_MINUTES * 60)
+    return _manager
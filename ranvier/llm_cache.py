@@ -0,0 +1,138 @@
+"""Persistent, content-addressed cache of LLM responses.
+
+Entries are keyed by a hash of LangChain's ``llm_string`` (provider, model and
+every generation parameter) and the fully rendered prompt, so a hit is only
+ever returned for an identical request. The factory only attaches the cache
+to deterministic (temperature 0) clients. The store is a single SQLite file
+whose total payload size is bounded; the least recently used entries are
+evicted first.
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Optional, Sequence
+
+from langchain_core.caches import BaseCache
+from langchain_core.load import dumps, loads
+from langchain_core.outputs import Generation
+
+from ranvier import settings
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access);
+"""
+
+
+class SQLiteLRUCache(BaseCache):
+    """LangChain cache backed by SQLite with size-bounded LRU eviction."""
+
+    def __init__(self, path, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(_SCHEMA)
+        self._total = self._conn.execute(
+            'SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+
+    @staticmethod
+    def _key(prompt: str, llm_string: str) -> str:
+        return hashlib.sha256(
+            f'{llm_string}\x00{prompt}'.encode('utf-8')).hexdigest()
+
+    def lookup(self, prompt: str,
+               llm_string: str) -> Optional[Sequence[Generation]]:
+        key = self._key(prompt, llm_string)
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT value FROM responses WHERE key = ?',
+                (key, )).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._conn.execute(
+                'UPDATE responses SET last_access = ? WHERE key = ?',
+                (time.time(), key))
+            self._conn.commit()
+        payload = json.loads(zlib.decompress(row[0]))
+        return [loads(item) for item in payload]
+
+    def contains(self, prompt: str, llm_string: str) -> bool:
+        """Whether ``lookup`` would hit, without counting or touching it."""
+        key = self._key(prompt, llm_string)
+        with self._lock:
+            return self._conn.execute('SELECT 1 FROM responses WHERE key = ?',
+                                      (key, )).fetchone() is not None
+
+    def update(self, prompt: str, llm_string: str,
+               return_val: Sequence[Generation]) -> None:
+        key = self._key(prompt, llm_string)
+        value = zlib.compress(
+            json.dumps([dumps(gen) for gen in return_val]).encode('utf-8'))
+        with self._lock:
+            old = self._conn.execute('SELECT size FROM responses WHERE key = ?',
+                                     (key, )).fetchone()
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses (key, value, size, last_access) '
+                'VALUES (?, ?, ?, ?)', (key, value, len(value), time.time()))
+            self._total += len(value) - (old[0] if old else 0)
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        # Drop least recently used entries until the payload fits again
+        while self._total > self.max_bytes:
+            row = self._conn.execute(
+                'SELECT key, size FROM responses ORDER BY last_access LIMIT 1'
+            ).fetchone()
+            if row is None:
+                self._total = 0
+                break
+            self._conn.execute('DELETE FROM responses WHERE key = ?',
+                               (row[0], ))
+            self._total -= row[1]
+
+    def clear(self, **kwargs) -> None:
+        with self._lock:
+            self._conn.execute('DELETE FROM responses')
+            self._conn.commit()
+            self._total = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._conn.execute(
+                'SELECT COUNT(*) FROM responses').fetchone()[0]
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'entries': entries,
+                'bytes': self._total,
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> SQLiteLRUCache:
+    """Return the process-wide response cache, opening it on first use."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = SQLiteLRUCache(
+                    settings.data_path('llm_cache.sqlite'),
+                    max_bytes=int(settings.LLM_CACHE_MAX_MB * 1024 * 1024))
+    return _cache
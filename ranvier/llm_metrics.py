@@ -0,0 +1,69 @@
+"""The callback handler that feeds LLM calls to ``ranvier.metrics``.
+
+It lives apart from the metrics themselves so ``Home.py`` can start the
+exporters without loading LangChain; only the crew factory imports it.
+"""
+import threading
+import time
+from typing import Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from ranvier import metrics
+from ranvier.profiling import token_usage
+
+
+class MetricsCallbackHandler(BaseCallbackHandler):
+    """Counts the latency, errors and tokens of every LLM call by route."""
+
+    def __init__(self):
+        self._calls = {}  # run id -> (route, started)
+        self._lock = threading.Lock()
+
+    def _start(self, run_id, metadata) -> None:
+        route = (metadata or {}).get('ranvier_route', 'unknown')
+        with self._lock:
+            self._calls[run_id] = (route, time.perf_counter())
+
+    def on_llm_start(self,
+                     serialized,
+                     prompts,
+                     *,
+                     run_id,
+                     metadata=None,
+                     **kwargs):
+        self._start(run_id, metadata)
+
+    def on_chat_model_start(self,
+                            serialized,
+                            messages,
+                            *,
+                            run_id,
+                            metadata=None,
+                            **kwargs):
+        self._start(run_id, metadata)
+
+    def _end(self, run_id) -> Optional[str]:
+        with self._lock:
+            call = self._calls.pop(run_id, None)
+        if call is None:
+            return None
+        route, started = call
+        metrics.llm_call_seconds.observe(time.perf_counter() - started, route=route)
+        return route
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        route = self._end(run_id)
+        if route is None:
+            return
+        prompt, completion = token_usage(response)
+        metrics.llm_tokens.inc(prompt, route=route, direction='in')
+        metrics.llm_tokens.inc(completion, route=route, direction='out')
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        route = self._end(run_id)
+        if route is not None:
+            metrics.llm_call_errors.inc(route=route)
+
+
+callback_handler = MetricsCallbackHandler()
@@ -0,0 +1,87 @@
+"""Process-wide logging setup for the Streamlit app and the batch runner.
+
+Pages used to call ``logging.basicConfig(level=logging.DEBUG)`` and write
+every record to stdout from the thread that logged it. ``configure`` now
+routes records through a ``QueueHandler``. A ``QueueListener`` thread writes
+them to stderr at ``RANVIER_LOG_LEVEL``, so a slow stdout never stalls a
+page or a crew. httpx's line per request is left out unless the level is
+DEBUG. When ``RANVIER_TRANSCRIPT_FILE`` is set, the sampled agent transcripts
+of ``ranvier.transcripts`` go to that file instead. It rotates at
+``RANVIER_TRANSCRIPT_MAX_MB``. Transcript messages are formatted by the
+listener thread too.
+"""
+import atexit
+import logging
+import logging.handlers
+import queue
+import threading
+
+from ranvier import settings
+
+_FORMAT = '%(asctime)s %(levelname)s %(name)s: %(message)s'
+
+# Libraries that log every request at INFO
+_CHATTY = ('httpx', 'httpcore')
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    # QueueHandler formats records in the logging thread; transcript records
+    # only carry objects that render themselves, so the listener formats them
+
+    def prepare(self, record):
+        return record
+
+
+def _listen(handler: logging.Handler, deferred: bool = False):
+    records = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(records,
+                                              handler,
+                                              respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    if deferred:
+        return _DeferredQueueHandler(records)
+    return logging.handlers.QueueHandler(records)
+
+
+_configured = False
+_configured_lock = threading.Lock()
+
+
+def configure() -> None:
+    """Install the queued handlers, once per process.
+
+    A root logger that already has handlers (e.g. the batch runner's
+    ``basicConfig``) is left as it is; only the transcript file is added.
+    """
+    global _configured
+    if _configured:
+        return
+    with _configured_lock:
+        if _configured:
+            return
+        _configured = True
+
+    level = logging.getLevelName(settings.LOG_LEVEL.upper())
+    root = logging.getLogger()
+    if not root.handlers:
+        console = logging.StreamHandler()
+        console.setFormatter(logging.Formatter(_FORMAT))
+        root.addHandler(_listen(console))
+        root.setLevel(level)
+    if level != logging.DEBUG:
+        for name in _CHATTY:
+            logging.getLogger(name).setLevel(logging.WARNING)
+
+    if settings.TRANSCRIPT_FILE:
+        transcript = logging.handlers.RotatingFileHandler(
+            settings.TRANSCRIPT_FILE,
+            maxBytes=int(settings.TRANSCRIPT_MAX_MB * 1e6),
+            backupCount=settings.TRANSCRIPT_BACKUPS,
+            encoding='utf-8',
+            delay=True)
+        transcript.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+        logger = logging.getLogger('ranvier.transcript')
+        logger.addHandler(_listen(transcript, deferred=True))
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
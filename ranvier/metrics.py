@@ -0,0 +1,362 @@
+"""Process metrics in the Prometheus text exposition format.
+
+Runs started, completed and failed per page, run and task durations, LLM
+call latency, errors and tokens per provider/model are counted as they
+happen. The LLM call series are fed by the callback handler in
+``ranvier.llm_metrics``. Queue depth, active sessions, joined runs and the response cache and
+connection pool counters are read from their owners when the metrics are
+collected. Histograms carry ``_bucket``, ``_sum`` and ``_count`` series, so
+p95 latencies come from ``histogram_quantile``.
+
+The metrics are exported in either or both of two ways, chosen with
+settings:
+
+* ``RANVIER_METRICS_PORT`` serves them at ``/metrics`` on
+  ``RANVIER_METRICS_HOST`` from a thread of the Streamlit process.
+* ``RANVIER_METRICS_FILE`` rewrites a sidecar file every
+  ``RANVIER_METRICS_INTERVAL`` seconds, e.g. for node_exporter's textfile
+  collector.
+"""
+import bisect
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable
+
+from ranvier import settings
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', r'\\').replace('"', r'\"').replace(
+        '\n', r'\n')
+
+
+def _labels(names: tuple, values: tuple, extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _number(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = ''
+
+    def __init__(self, name: str, help: str, labels: tuple = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels.get(name, '')) for name in self.labels)
+
+    def render(self) -> list:
+        lines = [
+            f'# HELP {self.name} {self.help}', f'# TYPE {self.name} {self.kind}'
+        ]
+        for key, value in self._snapshot():
+            lines += self._lines(key, value)
+        return lines
+
+    def _snapshot(self) -> list:
+        with self._lock:
+            return sorted((key, list(value) if isinstance(value, list) else
+                           value) for key, value in self._values.items())
+
+    def _lines(self, key: tuple, value) -> list:
+        return [f'{self.name}{_labels(self.labels, key)} {_number(value)}']
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name: str, help: str, labels: tuple, buckets: tuple):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            counts = self._values.get(key)
+            if counts is None:
+                # One count per bucket plus +Inf, then the sum
+                counts = self._values[key] = [0] * (len(self.buckets) + 1) + [
+                    0.0
+                ]
+            counts[bisect.bisect_left(self.buckets, value)] += 1
+            counts[-1] += value
+
+    def _lines(self, key: tuple, counts: list) -> list:
+        lines, total = [], 0
+        for bound, count in zip(self.buckets + (float('inf'), ), counts):
+            total += count
+            le = _labels(self.labels, key, f'le="{_number(bound)}"')
+            lines.append(f'{self.name}_bucket{le} {total}')
+        labels = _labels(self.labels, key)
+        lines.append(f'{self.name}_sum{labels} {_number(counts[-1])}')
+        lines.append(f'{self.name}_count{labels} {total}')
+        return lines
+
+
+class Gauge(_Metric):
+    """A value read from its owner when the metrics are collected; counters
+    kept elsewhere are exported through it with ``kind='counter'``."""
+    kind = 'gauge'
+
+    def __init__(self,
+                 name: str,
+                 help: str,
+                 read: Callable[[], dict],
+                 labels: tuple = (),
+                 kind: str = 'gauge'):
+        super().__init__(name, help, labels)
+        self.kind = kind
+        self._read = read  # returns {label values tuple: value}
+
+    def _snapshot(self) -> list:
+        try:
+            return sorted((self._read() or {}).items())
+        except Exception:
+            logger.exception('Could not read metric %s', self.name)
+            return []
+
+
+_RUN_BUCKETS = (5, 10, 30, 60, 120, 300, 600, 1200, 1800, 3600)
+_TASK_BUCKETS = (1, 2, 5, 10, 30, 60, 120, 300, 600)
+_LLM_BUCKETS = (0.25, 0.5, 1, 2, 5, 10, 20, 30, 60, 120, 300)
+
+runs_started = Counter('ranvier_runs_started_total', 'Crew runs started.',
+                       ('page', ))
+runs_completed = Counter('ranvier_runs_completed_total',
+                         'Crew runs that finished with a result.', ('page', ))
+runs_failed = Counter('ranvier_runs_failed_total',
+                      'Crew runs that raised an error.', ('page', ))
+run_seconds = Histogram('ranvier_run_seconds',
+                        'Wall time of finished crew runs.', ('page', ),
+                        _RUN_BUCKETS)
+task_seconds = Histogram('ranvier_task_seconds',
+                         'Execution time of finished crew tasks.',
+                         ('page', 'task', 'agent'), _TASK_BUCKETS)
+llm_call_seconds = Histogram('ranvier_llm_call_seconds',
+                             'Latency of LLM calls, cached answers included.',
+                             ('route', ), _LLM_BUCKETS)
+llm_call_errors = Counter('ranvier_llm_call_errors_total',
+                          'LLM calls that ended in an error.', ('route', ))
+llm_tokens = Counter('ranvier_llm_tokens_total',
+                     'Prompt (in) and completion (out) tokens of LLM calls.',
+                     ('route', 'direction'))
+
+
+def _jobs() -> dict:
+    from ranvier.jobs import get_job_manager
+
+    stats = get_job_manager().stats()
+    return {('queued', ): stats['queued'], ('running', ): stats['running']}
+
+
+def _joined() -> dict:
+    from ranvier.jobs import get_job_manager
+
+    return {(): get_job_manager().stats()['joined']}
+
+
+def _llm_queued() -> dict:
+    from ranvier.rate_limit import rate_limit_stats
+
+    return {(key, ): s['queued'] for key, s in rate_limit_stats().items()}
+
+
+def _active_sessions() -> dict:
+    # Only known inside a running Streamlit server, not in the batch runner;
+    # the session manager has no public accessor on the runtime
+    try:
+        from streamlit import runtime
+    except ImportError:
+        return {}
+    if not runtime.exists():
+        return {}
+    return {(): runtime.get_instance()._session_mgr.num_active_sessions()}
+
+
+def _response_cache(field: str) -> Callable[[], dict]:
+
+    def read() -> dict:
+        from ranvier.llm_cache import get_response_cache
+
+        return {(): get_response_cache().stats()[field]}
+
+    return read
+
+
+def _connection_pools(field: str) -> Callable[[], dict]:
+
+    def read() -> dict:
+        from ranvier.http_pool import connection_pool_stats
+
+        return {(provider, ): s[field]
+                for provider, s in connection_pool_stats().items()}
+
+    return read
+
+
+_METRICS = (
+    runs_started,
+    runs_completed,
+    runs_failed,
+    run_seconds,
+    task_seconds,
+    llm_call_seconds,
+    llm_call_errors,
+    llm_tokens,
+    Gauge('ranvier_jobs', 'Crew jobs waiting for a worker or running.',
+          _jobs, ('state', )),
+    Gauge('ranvier_runs_joined_total',
+          'Identical runs saved by joining one in flight.',
+          _joined,
+          kind='counter'),
+    Gauge('ranvier_llm_queued_calls',
+          'LLM calls waiting for their rate limit.', _llm_queued,
+          ('route', )),
+    Gauge('ranvier_active_sessions', 'Connected browser sessions.',
+          _active_sessions),
+    Gauge('ranvier_response_cache_hits_total',
+          'LLM calls answered from the response cache.',
+          _response_cache('hits'),
+          kind='counter'),
+    Gauge('ranvier_response_cache_misses_total',
+          'Cacheable LLM calls the response cache could not answer.',
+          _response_cache('misses'),
+          kind='counter'),
+    Gauge('ranvier_response_cache_entries',
+          'Responses held by the response cache.', _response_cache('entries')),
+    Gauge('ranvier_http_requests_total',
+          'HTTP requests sent through the provider connection pools.',
+          _connection_pools('requests'), ('provider', ),
+          kind='counter'),
+    Gauge('ranvier_http_connections_total',
+          'Connections the provider connection pools opened for requests.',
+          _connection_pools('connections'), ('provider', ),
+          kind='counter'),
+)
+
+
+def render() -> str:
+    """Every metric in the Prometheus text exposition format."""
+    lines = []
+    for metric in _METRICS:
+        lines += metric.render()
+    return '\n'.join(lines) + '\n'
+
+
+def observe_run(page: str, seconds: float, profile=None) -> None:
+    """Count a finished run and the tasks its profile timed."""
+    runs_completed.inc(page=page)
+    run_seconds.observe(seconds, page=page)
+    for timing in profile.tasks if profile is not None else ():
+        if timing.finished is not None:
+            task_seconds.observe(timing.seconds,
+                                 page=page,
+                                 task=timing.index,
+                                 agent=timing.agent)
+
+
+def write_file(path) -> None:
+    """Write the metrics to ``path`` atomically."""
+    path = Path(path)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(render())
+        # mkstemp creates the file readable by its owner only
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def _write_loop(path: str, interval: float) -> None:
+    while True:
+        try:
+            write_file(path)
+        except Exception:
+            logger.exception('Could not write metrics to %s', path)
+        time.sleep(interval)
+
+
+def _serve(host: str, port: int) -> None:
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+
+        def do_GET(self):
+            if self.path.split('?')[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = render().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', CONTENT_TYPE)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # scrapes every few seconds would flood the log
+
+    try:
+        server = ThreadingHTTPServer((host, port), Handler)
+    except OSError as e:
+        # Another process (a second Streamlit worker) already serves it
+        logger.warning('Metrics endpoint %s:%s unavailable: %s', host, port, e)
+        return
+    server.daemon_threads = True
+    server.serve_forever()
+
+
+_exporting = False
+_exporting_lock = threading.Lock()
+
+
+def start_exporters() -> None:
+    """Start the configured metrics endpoint and sidecar file, once."""
+    global _exporting
+    if _exporting:
+        return
+    with _exporting_lock:
+        if _exporting:
+            return
+        _exporting = True
+    if settings.METRICS_PORT:
+        threading.Thread(target=_serve,
+                         args=(settings.METRICS_HOST, settings.METRICS_PORT),
+                         name='metrics-http',
+                         daemon=True).start()
+    if settings.METRICS_FILE:
+        threading.Thread(target=_write_loop,
+                         args=(settings.METRICS_FILE,
+                               settings.METRICS_INTERVAL),
+                         name='metrics-file',
+                         daemon=True).start()
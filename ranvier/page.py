@@ -0,0 +1,271 @@
+"""Render a crew page from its ``PageSpec``.
+
+Every crew page used to be its own copy of the same script: page setup, API
+key checks, sidebar, input, background job, results. ``render`` is that
+script once, driven by the spec, so a page file only names its spec. Each
+page keeps the handle of its last run (result, task records, profile) under
+its own key in the session state, so pages no longer overwrite each other's
+results; the run itself lives in ``ranvier.run_records``.
+"""
+import asyncio
+import logging
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+import nest_asyncio
+import streamlit as st
+
+from ranvier import http_pool, logs, metrics, pipeline
+from ranvier.jobs import DONE, Job
+from ranvier.pipeline import PageSpec
+from ranvier.result_store import ResultStore, get_result_store
+from ranvier.similar import get_similar_queries
+from ranvier.ui import (connection_pool_status, context_budget_input,
+                        follow_job, joined_runs_status, keep_run, kept_run,
+                        model_routing, rate_limit_status, require_api_keys,
+                        response_cache_toggle, run_downloads,
+                        run_profile_expander, session_footprint,
+                        similar_query_threshold, start_job)
+
+logger = logging.getLogger(__name__)
+
+CSS_PATH = Path(__file__).resolve().parent.parent / 'styles.css'
+
+@lru_cache(maxsize=1)
+def _css() -> Optional[str]:
+    try:
+        return CSS_PATH.read_text(encoding='utf-8')
+    except FileNotFoundError:
+        return None
+
+
+def _setup(spec: PageSpec) -> None:
+    # Apply nest_asyncio to manage nested event loops
+    nest_asyncio.apply()
+    try:
+        asyncio.get_event_loop()
+    except RuntimeError:
+        asyncio.set_event_loop(asyncio.new_event_loop())
+
+    st.set_page_config(page_title=spec.page_title, page_icon=spec.page_icon)
+    # Logging is set up, provider connections are opened and metrics
+    # exported from the first load
+    logs.configure()
+    http_pool.prewarm()
+    metrics.start_exporters()
+    st.title(spec.title)
+    if spec.intro:
+        st.write(spec.intro)
+    css = _css()
+    if css is None:
+        st.error(f"CSS file {CSS_PATH.name} not found.")
+    else:
+        st.markdown(f'<style>{css}</style>', unsafe_allow_html=True)
+    if spec.about:
+        with st.expander(spec.labels.about):
+            st.markdown(spec.about)
+
+
+def _check_api_keys(spec: PageSpec) -> None:
+    """Stop the page when a provider it may call has no API key."""
+    configs = [option.config for option in spec.models]
+    configs += list(spec.agent_models.values())
+    configs += list(spec.task_models.values())
+    require_api_keys([config.provider for config in configs],
+                     spec.labels.missing_key)
+
+
+def _sidebar(spec: PageSpec):
+    """Render the model settings and return (routes, context budget)."""
+    labels = spec.labels
+    options = {option.label: option.config for option in spec.models}
+    temperature = max_tokens = None
+    if len(options) > 1 or spec.presets or spec.tunable:
+        st.sidebar.title(labels.customization)
+    if spec.model_help:
+        with st.sidebar.expander(labels.model_help):
+            st.markdown(spec.model_help)
+
+    preset = None
+    if spec.presets:
+        presets = {preset.label: preset for preset in spec.presets}
+        preset = presets[st.sidebar.selectbox(labels.preset, list(presets))]
+    if preset is not None and preset.model is not None:
+        model = preset.model
+        temperature, max_tokens = preset.temperature, preset.max_tokens
+    else:
+        model = next(iter(options))
+        if len(options) > 1:
+            model = st.sidebar.selectbox(labels.model, list(options))
+        if spec.tunable:
+            temperature = st.sidebar.slider(labels.temperature, 0.0, 1.0,
+                                            0.0)
+            max_tokens = st.sidebar.slider(labels.max_tokens,
+                                           min_value=2000,
+                                           max_value=8192,
+                                           value=8192)
+
+    use_cache = response_cache_toggle()
+    rate_limit_status()
+    connection_pool_status()
+    joined_runs_status()
+    session_footprint()
+    context_budget = context_budget_input() if spec.context_budget else None
+    similarity = similar_query_threshold() if spec.store_results else 1.0
+    # Only the selected model's client is ever built, on the first kickoff
+    routes = spec.routes(options[model], use_cache, temperature, max_tokens)
+    if len(options) > 1:
+        st.sidebar.success(labels.model_selected.format(model=model))
+    if routes.agents or routes.tasks:
+        model_routing(routes)
+    return routes, context_budget, similarity
+
+
+def _start(spec: PageSpec, run_key: str, inputs: dict, routes,
+           context_budget: Optional[int], similarity: float,
+           force_refresh: bool) -> None:
+    """Serve the run from the result store or start it in the background.
+
+    Without a stored run for the exact query, one for a query at least
+    ``similarity`` alike is served instead (see ``ranvier.similar``).
+    """
+    store = namespace = None
+    query = '\n'.join(inputs.values())
+    # Runs are keyed by query, models and prompt definitions, both in the
+    # result store and among the jobs in flight
+    options = {'context_budget': context_budget}
+    result_key = ResultStore.key(spec.page,
+                                 query,
+                                 routes,
+                                 spec.crew.fingerprint,
+                                 options,
+                                 free_text=spec.free_text)
+    if spec.store_results:
+        store = get_result_store()
+        namespace = store.namespace(spec.page, routes, spec.crew.fingerprint,
+                                    options)
+        stored = None if force_refresh else store.get(result_key)
+        if stored:
+            st.success(spec.labels.stored)
+        elif not force_refresh and similarity < 1.0:
+            found = get_similar_queries().find(namespace, query, similarity)
+            if found:
+                match, stored = found
+                st.info(
+                    spec.labels.similar.format(query=match.query,
+                                               similarity=match.similarity,
+                                               refresh=spec.labels.refresh))
+        if stored:
+            keep_run(
+                run_key, {
+                    'result': stored['result'],
+                    'detailed_results': stored['detailed_results'],
+                })
+            return
+
+    # The crew runs in the background job runner, not in this script
+    def run_page(job):
+        run = pipeline.run(spec.crew,
+                           routes,
+                           inputs,
+                           job=job,
+                           context_budget=context_budget)
+        if store is not None:
+            store.put(result_key,
+                      run['result'],
+                      run['detailed_results'],
+                      namespace=namespace,
+                      query=query)
+        return run
+
+    logger.info('Starting %s', spec.page)
+    job = start_job(f'{spec.page}_job',
+                    spec.page,
+                    run_page,
+                    dedup_key=result_key)
+    if job.requesters > 1:
+        st.info(spec.labels.joined)
+
+
+def _task_progress(spec: PageSpec):
+    # Task list with the state the background job reported for every task
+    def show(job: Job) -> None:
+        for i, task in enumerate(spec.crew.tasks.values()):
+            state = job.task_states.get(i)
+            if state == 'finished':
+                st.success(f"✅ {task.description}")
+            elif state == 'started':
+                st.info(f"🔄 {task.description}")
+            else:
+                st.write(f"⏳ {task.description}")
+
+    return show if spec.task_progress else None
+
+
+def _results(spec: PageSpec, run: dict) -> None:
+    labels = spec.labels
+    st.write(run['result'])
+    if spec.export and st.button(labels.copy):
+        st.code(run['result'], language='markdown')
+        st.info(labels.copy_hint)
+    run_downloads(f'{spec.page}_run',
+                  run,
+                  spec.page,
+                  label=labels.download,
+                  format_label=labels.download_format,
+                  save_label=labels.save)
+
+    with st.expander(labels.details):
+        for detail in run['detailed_results']:
+            st.write(f"**{labels.task}:** {detail['task']}")
+            result = detail['result']
+            st.write(f"**{labels.result}:** "
+                     f"{labels.no_output if result is None else result}")
+            st.write("---")
+
+    # Show the timing waterfall of the last run
+    if run.get('profile') is not None:
+        run_profile_expander(run['profile'])
+
+
+def render(spec: PageSpec) -> None:
+    """Draw the page of ``spec`` and follow its background run."""
+    labels = spec.labels
+    _setup(spec)
+    _check_api_keys(spec)
+    routes, context_budget, similarity = _sidebar(spec)
+
+    values = {}
+    for field in spec.inputs:
+        widget = st.text_area if field.multiline else st.text_input
+        values[field.name] = widget(field.label, "")
+
+    start = st.button(labels.start)
+    force_refresh = spec.store_results and st.button(
+        labels.refresh, help=labels.refresh_help)
+    run_key = f'{spec.page}_run'
+    if start or force_refresh:
+        if all(values.values()):
+            if labels.starting:
+                st.write(labels.starting.format(**values))
+            st.session_state.pop(run_key, None)
+            _start(spec, run_key, values, routes, context_budget, similarity,
+                   force_refresh)
+        else:
+            st.warning(labels.missing_input)
+
+    # Follow the background run; results survive reruns and reconnects
+    job = follow_job(f'{spec.page}_job', labels.running,
+                     show_progress=_task_progress(spec))
+    if job is not None:
+        if job.status == DONE:
+            st.success(labels.completed)
+            keep_run(run_key, dict(job.result, profile=job.profile))
+        else:
+            st.error(labels.error.format(error=job.error))
+            logger.error('%s failed: %s', spec.page, job.error)
+
+    run = kept_run(run_key)
+    if run is not None:
+        _results(spec, run)
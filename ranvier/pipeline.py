@@ -0,0 +1,318 @@
+"""Declarative crew and page specs, and the engine that runs them.
+
+A ``CrewSpec`` describes a crew once: its agents, its tasks and the context
+edges between them, by key. A ``PageSpec`` adds what a page needs around it:
+title and texts, inputs, the models a user may pick and the agents or tasks
+routed to another model, and which optional features the page shows. The
+crew modules in ``ranvier.crews`` define their specs at import time, so every
+process holds one copy of each, however many sessions render the page.
+
+Specs are validated and compiled to index form the first time they are used
+and cached on the spec. ``CrewSpec.build`` turns one into a crewAI ``Crew``
+for the crew factory, and ``run`` kicks it off through the scheduler, so
+caching, parallelism and instrumentation apply to every page the same way.
+``ranvier.page.render`` draws any page from its spec. Every run that
+finishes is added to the searchable ``ranvier.archive``.
+"""
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field, replace
+from functools import cached_property, lru_cache
+from typing import TYPE_CHECKING, Optional, Union
+
+from ranvier import metrics, settings, transcripts
+from ranvier.crew_factory import LLMConfig, Routes, new_crew
+from ranvier.result_store import fingerprint, task_records
+from ranvier.scheduler import run_crew
+
+if TYPE_CHECKING:
+    from crewai import Crew
+
+    from ranvier.jobs import Job
+    from ranvier.profiling import RunProfile
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=1)
+def _agent_class():
+    from crewai import Agent
+
+    class _Agent(Agent):
+        # crewAI's RunnableAgent streams every call by default, which skips
+        # the response cache and, on most integrations, the token usage. The
+        # client's own 'streaming' switch decides instead
+
+        def create_agent_executor(self, tools=None) -> None:
+            super().create_agent_executor(tools)
+            self.agent_executor.agent.stream_runnable = False
+
+    return _Agent
+
+
+@dataclass(frozen=True)
+class AgentSpec:
+    role: str
+    goal: str
+    backstory: str
+    memory: Optional[bool] = None  # only passed to crewAI when set
+
+
+@dataclass(frozen=True)
+class TaskSpec:
+    agent: str  # key of the agent in CrewSpec.agents
+    description: str
+    expected_output: str
+    # Keys of the tasks whose output this one reads; () for none, None for
+    # the output of the task listed just before (see ranvier.scheduler)
+    context: Optional[tuple] = None
+
+
+@dataclass(frozen=True)
+class CrewSpec:
+    """Agents and tasks by key, in the order the crew lists them."""
+    name: str
+    agents: dict  # {key: AgentSpec}
+    tasks: dict  # {key: TaskSpec}
+    verbose: Union[bool, int] = False
+
+    @cached_property
+    def plan(self) -> tuple:
+        """(agent key, context indexes or None) of every task, validated."""
+        index = {}
+        plan = []
+        for i, (key, task) in enumerate(self.tasks.items()):
+            if task.agent not in self.agents:
+                raise ValueError(f'{self.name}: task {key!r} names unknown '
+                                 f'agent {task.agent!r}')
+            context = None
+            if task.context is not None:
+                missing = [dep for dep in task.context if dep not in index]
+                if missing:
+                    raise ValueError(f'{self.name}: task {key!r} reads '
+                                     f'{missing}, which are not listed '
+                                     'before it')
+                context = tuple(index[dep] for dep in task.context)
+            plan.append((task.agent, context))
+            index[key] = i
+        return tuple(plan)
+
+    @cached_property
+    def fingerprint(self) -> str:
+        """``result_store.fingerprint`` of the spec's prompts."""
+        agents = [(a.role, a.goal, a.backstory) for a in self.agents.values()]
+        tasks = [(task.description, task.expected_output,
+                  self.agents[agent].role, context or ())
+                 for task, (agent, context) in zip(self.tasks.values(),
+                                                   self.plan)]
+        return fingerprint(agents, tasks)
+
+    def index(self, key: str) -> int:
+        return list(self.tasks).index(key)
+
+    def variant(self, name: str, **changes) -> 'CrewSpec':
+        """A copy named ``name`` with ``changes[key]`` applied to task key."""
+        tasks = dict(self.tasks)
+        for key, fields in changes.items():
+            tasks[key] = replace(tasks[key], **fields)
+        return replace(self, name=name, tasks=tasks)
+
+    def build(self, llm) -> 'Crew':
+        """A new crew of this spec with every agent on ``llm``."""
+        from crewai import Crew, Task
+
+        Agent = _agent_class()
+        agents = {}
+        for key, spec in self.agents.items():
+            extra = {} if spec.memory is None else {'memory': spec.memory}
+            agents[key] = Agent(role=spec.role,
+                                goal=spec.goal,
+                                backstory=spec.backstory,
+                                tools=[],
+                                verbose=settings.VERBOSE_AGENTS,
+                                llm=llm,
+                                allow_delegation=False,
+                                **extra)
+        tasks = []
+        for spec, (agent, context) in zip(self.tasks.values(), self.plan):
+            tasks.append(
+                Task(description=spec.description,
+                     expected_output=spec.expected_output,
+                     agent=agents[agent],
+                     context=None if context is None else
+                     [tasks[i] for i in context]))
+        # Crew-level logging follows the agents' switch
+        extra = ({
+            'verbose': self.verbose
+        } if self.verbose and settings.VERBOSE_AGENTS else {})
+        return Crew(agents=list(agents.values()), tasks=tasks, **extra)
+
+
+def run(spec: CrewSpec,
+        config: Union[LLMConfig, Routes],
+        inputs: dict,
+        job: Optional['Job'] = None,
+        profile: Optional['RunProfile'] = None,
+        context_budget: Optional[int] = None,
+        max_workers: Optional[int] = None) -> dict:
+    """Kick off a crew of ``spec`` and return its result and task records.
+
+    Given a background ``job``, task progress, timings and the final
+    answer's tokens are reported to it; otherwise timings go to ``profile``
+    if one is given. ``context_budget`` compacts the last task's context.
+    """
+    started = time.time()
+    page = job.page if job else spec.name
+    profile = job.profile if job else profile
+    metrics.runs_started.inc(page=page)
+    transcript = transcripts.sample(
+        page, profile.run_id if profile else uuid.uuid4().hex)
+    try:
+        crew = new_crew(spec.name, spec.build, config)
+        result = run_crew(
+            crew,
+            inputs,
+            max_workers=max_workers,
+            on_progress=job.task_states.__setitem__ if job else None,
+            profile=profile,
+            stream=job.stream if job else None,
+            context_budgets={-1: context_budget},
+            transcript=transcript)
+    except Exception:
+        metrics.runs_failed.inc(page=page)
+        raise
+    metrics.observe_run(page, time.time() - started, profile)
+    run = {'result': result, 'detailed_results': task_records(crew)}
+    try:
+        from ranvier.archive import get_archive
+
+        get_archive().add(page,
+                          inputs,
+                          Routes.of(config).default.route,
+                          result,
+                          run['detailed_results'],
+                          seconds=time.time() - started,
+                          profile=profile.to_dict() if profile else None)
+    except Exception:
+        # The archive is a convenience; the run itself succeeded
+        logger.exception('Could not archive a run of %s', spec.name)
+    return run
+
+
+@dataclass(frozen=True)
+class InputSpec:
+    name: str  # the placeholder the prompts use
+    label: str
+    multiline: bool = False
+
+
+@dataclass(frozen=True)
+class ModelOption:
+    label: str
+    config: LLMConfig
+
+
+@dataclass(frozen=True)
+class Preset:
+    """A named model and sampling setting; no model means pick your own."""
+    label: str
+    model: Optional[str] = None  # ModelOption label
+    temperature: float = 0.0
+    max_tokens: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class Labels:
+    """Interface texts of a page; ``{placeholders}`` are filled in."""
+    start: str = 'Start'
+    starting: str = ''  # formatted with the inputs
+    missing_input: str = 'Please fill in every field.'
+    running: str = 'Running CrewAI tasks...'
+    completed: str = 'Completed!'
+    stored: str = 'Loaded from stored results!'
+    joined: str = ('The same request is already running; its result will '
+                   'be shown here too.')
+    similar: str = ('Showing the stored result for the similar query '
+                    '"{query}" ({similarity:.0%} match). Press "{refresh}" '
+                    'to run your exact query.')
+    error: str = 'An error occurred: {error}'
+    refresh: str = 'Force refresh'
+    refresh_help: str = 'Ignore the stored result and run the crew again'
+    details: str = 'Show detailed results'
+    task: str = 'Task'
+    result: str = 'Result'
+    no_output: str = 'No output available for this task.'
+    about: str = 'About this app'
+    customization: str = 'Customization'
+    model_help: str = 'Model and Parameter Explanations'
+    preset: str = 'Choose a preset configuration'
+    model: str = 'Choose a model'
+    model_selected: str = 'Model selected: {model}'
+    temperature: str = 'Temperature'
+    max_tokens: str = 'Max Output Tokens'
+    copy: str = 'Copy to Clipboard'
+    copy_hint: str = 'Please use Ctrl+C (or Cmd+C on Mac) to copy the text above.'
+    download: str = 'Download'
+    download_format: str = 'Download format'
+    save: str = 'Save {file_name}'
+    missing_key: str = ('{key} environment variable not set. Please set the '
+                        '{key} environment variable.')
+
+
+@dataclass(frozen=True)
+class PageSpec:
+    """A crew page: what it asks for, which models it offers, what it shows.
+
+    ``agent_models`` and ``task_models`` route agent roles and task keys to
+    another model than the selected one; when the page lets the user tune
+    temperature and output length, the routed models follow that too.
+    """
+    crew: CrewSpec
+    title: str
+    inputs: tuple  # (InputSpec, ...)
+    models: tuple  # (ModelOption, ...); a select box when more than one
+    name: Optional[str] = None  # result store and job name; crew.name if None
+    page_title: str = 'Ranvier - Kronika'
+    page_icon: str = '🧠'
+    intro: Optional[str] = None
+    about: Optional[str] = None
+    agent_models: dict = field(default_factory=dict)  # {role: LLMConfig}
+    task_models: dict = field(default_factory=dict)  # {task key: LLMConfig}
+    presets: tuple = ()  # (Preset, ...)
+    tunable: bool = False  # temperature and max output token sliders
+    model_help: Optional[str] = None
+    store_results: bool = False  # serve repeated queries from the store
+    free_text: bool = True  # the query is prose; False for names (diseases)
+    context_budget: bool = False
+    task_progress: bool = False
+    export: bool = False  # copy button
+    labels: Labels = Labels()
+
+    @property
+    def page(self) -> str:
+        return self.name or self.crew.name
+
+    def routes(self,
+               default: LLMConfig,
+               use_cache: bool = True,
+               temperature: Optional[float] = None,
+               max_tokens: Optional[int] = None) -> Routes:
+        """The routes of one run on ``default``, tuned as the user chose."""
+
+        def tuned(config):
+            if temperature is not None:
+                config = replace(config,
+                                 temperature=temperature,
+                                 max_tokens=max_tokens)
+            return replace(config, use_cache=use_cache)
+
+        return Routes.table(tuned(default),
+                            agents={
+                                role: tuned(config)
+                                for role, config in self.agent_models.items()
+                            },
+                            tasks={
+                                self.crew.index(key): tuned(config)
+                                for key, config in self.task_models.items()
+                            })
@@ -0,0 +1,309 @@
+"""Per-run timing profiles: queue wait, task spans and every LLM call.
+
+The job runner gives each run a ``RunProfile``. The scheduler adds a
+``TaskTiming`` for every task, recording when its dependencies were done
+(``ready``) and when it actually started and finished. While a task executes,
+its timing is the current one for that thread, so the callback handler that
+the crew factory attaches to every chat model can file each LLM call, with
+its model, latency, token usage and retries, under the task that made it.
+Provider SDKs retry inside the call without telling LangChain, so retries
+are also counted from the requests the call's thread sent through the
+``ranvier.http_pool`` connection pools. Finished profiles are written to
+SQLite so runs can be aggregated later.
+"""
+import contextlib
+import contextvars
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from ranvier import http_pool, settings
+
+
+@dataclass
+class LLMCall:
+    started: float
+    route: str = ''  # provider/model of the client that made the call
+    finished: Optional[float] = None
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    retries: int = 0
+    error: Optional[str] = None
+
+    @property
+    def seconds(self) -> float:
+        return (self.finished or self.started) - self.started
+
+
+@dataclass
+class TaskTiming:
+    index: int
+    task: str
+    agent: str
+    ready: float  # when every upstream task had finished
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    llm_calls: list = field(default_factory=list)
+    context_tokens_saved: int = 0  # by context compaction
+
+    @property
+    def queue_wait(self) -> float:
+        return (self.started or self.ready) - self.ready
+
+    @property
+    def seconds(self) -> float:
+        if self.started is None:
+            return 0.0
+        return (self.finished or self.started) - self.started
+
+    @property
+    def llm_seconds(self) -> float:
+        return sum(call.seconds for call in self.llm_calls)
+
+    @property
+    def prompt_tokens(self) -> int:
+        return sum(call.prompt_tokens for call in self.llm_calls)
+
+    @property
+    def completion_tokens(self) -> int:
+        return sum(call.completion_tokens for call in self.llm_calls)
+
+    @property
+    def retries(self) -> int:
+        return sum(call.retries for call in self.llm_calls)
+
+
+@dataclass
+class RunProfile:
+    run_id: str
+    page: str
+    submitted: float
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    status: Optional[str] = None
+    tasks: list = field(default_factory=list)
+
+    @property
+    def queue_wait(self) -> float:
+        return (self.started or self.submitted) - self.submitted
+
+    @property
+    def seconds(self) -> float:
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.time()) - self.started
+
+    def by_route(self) -> dict:
+        """Calls, latency and tokens of this run per provider/model."""
+        routes = {}
+        for timing in self.tasks:
+            for call in timing.llm_calls:
+                row = routes.setdefault(
+                    call.route or 'unknown', {
+                        'calls': 0,
+                        'seconds': 0.0,
+                        'prompt_tokens': 0,
+                        'completion_tokens': 0,
+                    })
+                row['calls'] += 1
+                row['seconds'] += call.seconds
+                row['prompt_tokens'] += call.prompt_tokens
+                row['completion_tokens'] += call.completion_tokens
+        return routes
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'RunProfile':
+        """Rebuild a profile from the output of ``to_dict``."""
+        tasks = [
+            TaskTiming(**dict(task,
+                              llm_calls=[LLMCall(**c)
+                                         for c in task['llm_calls']]))
+            for task in data['tasks']
+        ]
+        return cls(**dict(data, tasks=tasks))
+
+
+_current_task = contextvars.ContextVar('ranvier_current_task', default=None)
+
+
+@contextlib.contextmanager
+def timed(timing: Optional[TaskTiming]):
+    """Time the enclosed task execution and make ``timing`` current."""
+    if timing is None:
+        yield
+        return
+    token = _current_task.set(timing)
+    timing.started = time.time()
+    try:
+        yield
+    finally:
+        timing.finished = time.time()
+        _current_task.reset(token)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count of ``text``: about four characters per token."""
+    return len(text) // 4
+
+
+def token_usage(response) -> tuple:
+    """(prompt, completion) tokens of an ``LLMResult``, 0 when unreported."""
+    # Providers report usage in different places and under different names
+    usage = (response.llm_output or {}).get('token_usage') or (
+        response.llm_output or {}).get('usage') or {}
+    if not usage:
+        for generations in response.generations:
+            for generation in generations:
+                message = getattr(generation, 'message', None)
+                usage = getattr(message, 'usage_metadata', None) or usage
+    if not isinstance(usage, dict):
+        usage = dict(usage)
+    prompt = usage.get('prompt_tokens', usage.get('input_tokens', 0))
+    completion = usage.get('completion_tokens', usage.get('output_tokens', 0))
+    return int(prompt or 0), int(completion or 0)
+
+
+class ProfilingCallbackHandler(BaseCallbackHandler):
+    """Records every LLM call under the task that is current in its thread."""
+
+    def __init__(self):
+        self._calls = {}
+        self._sent = {}  # run id -> requests its thread had sent before it
+        self._lock = threading.Lock()
+
+    def _start(self, run_id, metadata) -> None:
+        timing = _current_task.get()
+        if timing is None:
+            return  # not part of a profiled run
+        call = LLMCall(started=time.time(),
+                       route=(metadata or {}).get('ranvier_route', ''))
+        timing.llm_calls.append(call)
+        with self._lock:
+            self._calls[run_id] = call
+            self._sent[run_id] = http_pool.requests_sent()
+
+    def _finish(self, run_id) -> Optional[LLMCall]:
+        # Callbacks run in the thread making the call; every request it sent
+        # after the first is the SDK retrying
+        with self._lock:
+            call = self._calls.pop(run_id, None)
+            sent = self._sent.pop(run_id, None)
+        if call is None:
+            return None
+        call.finished = time.time()
+        attempts = http_pool.requests_sent() - sent
+        call.retries = max(call.retries, attempts - 1)
+        return call
+
+    def on_llm_start(self,
+                     serialized,
+                     prompts,
+                     *,
+                     run_id,
+                     metadata=None,
+                     **kwargs):
+        self._start(run_id, metadata)
+
+    def on_chat_model_start(self,
+                            serialized,
+                            messages,
+                            *,
+                            run_id,
+                            metadata=None,
+                            **kwargs):
+        self._start(run_id, metadata)
+
+    def on_retry(self, retry_state, *, run_id, **kwargs):
+        with self._lock:
+            call = self._calls.get(run_id)
+        if call is not None:
+            call.retries += 1
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        call = self._finish(run_id)
+        if call is not None:
+            call.prompt_tokens, call.completion_tokens = token_usage(response)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        call = self._finish(run_id)
+        if call is not None:
+            call.error = str(error)
+
+
+callback_handler = ProfilingCallbackHandler()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    page TEXT NOT NULL,
+    status TEXT,
+    submitted REAL NOT NULL,
+    queue_wait REAL NOT NULL,
+    seconds REAL NOT NULL,
+    profile TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS task_timings (
+    run_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    page TEXT NOT NULL,
+    agent TEXT NOT NULL,
+    task TEXT NOT NULL,
+    queue_wait REAL NOT NULL,
+    seconds REAL NOT NULL,
+    llm_calls INTEGER NOT NULL,
+    llm_seconds REAL NOT NULL,
+    prompt_tokens INTEGER NOT NULL,
+    completion_tokens INTEGER NOT NULL,
+    retries INTEGER NOT NULL,
+    PRIMARY KEY (run_id, idx)
+);
+"""
+
+
+class ProfileStore:
+    """SQLite tables of finished run profiles, one row per run and task."""
+
+    def __init__(self, path):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(_SCHEMA)
+
+    def put(self, profile: RunProfile) -> None:
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO runs (run_id, page, status, submitted, '
+                'queue_wait, seconds, profile) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (profile.run_id, profile.page, profile.status,
+                 profile.submitted, profile.queue_wait, profile.seconds,
+                 json.dumps(profile.to_dict())))
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO task_timings VALUES '
+                '(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                [(profile.run_id, t.index, profile.page, t.agent, t.task,
+                  t.queue_wait, t.seconds, len(t.llm_calls), t.llm_seconds,
+                  t.prompt_tokens, t.completion_tokens, t.retries)
+                 for t in profile.tasks])
+            self._conn.commit()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_profile_store() -> ProfileStore:
+    """Return the process-wide profile store, opening it on first use."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ProfileStore(settings.data_path('profiles.sqlite'))
+    return _store
@@ -0,0 +1,256 @@
+"""Process-wide rate limits for LLM calls, per provider and model.
+
+Every (provider, model) pair gets one ``RateLimiter`` shared by all sessions
+and by the batch runner. It holds two token buckets, one for requests and
+one for tokens per minute, sized from ``RANVIER_RATE_LIMITS`` (for example
+``groq=30,groq/llama3-70b-8192=30:6000``) or ``set_rate_limit``. A model
+without its own entry uses its provider's. A call that does not fit waits in
+line instead of failing. Prompt tokens are estimated up front and corrected
+with the reported usage afterwards. A call the response cache will answer
+never reaches the provider, so it neither waits nor spends quota.
+
+When a call still comes back with a 429, the limiter pauses every queued
+call to that model for the ``Retry-After`` the provider sent, or for an
+exponential backoff if it sent none. Calls through the connection pools of
+``ranvier.http_pool`` report each 429 as it arrives, while the provider SDK
+is still retrying; the others only when the call finally fails. ``stats`` reports how many calls are
+waiting so quotas can be sized from real traffic.
+"""
+import threading
+import time
+from typing import Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.load import dumps
+
+from ranvier import http_pool, settings
+from ranvier.profiling import estimate_tokens, token_usage
+
+
+class TokenBucket:
+    """Refills ``per_minute`` units a minute, up to ``per_minute``."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = per_minute
+        self.level = per_minute
+        self.rate = per_minute / 60.0
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity,
+                         self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, amount: float, now: float) -> float:
+        """Seconds until ``amount`` units (at most a full bucket) are there."""
+        self._refill(now)
+        missing = min(amount, self.capacity) - self.level
+        return max(0.0, missing / self.rate)
+
+    def take(self, amount: float) -> None:
+        # The level may go negative; the debt delays the next callers
+        self.level -= amount
+
+
+class RateLimiter:
+    """Request and token buckets plus a 429 pause for one model."""
+
+    def __init__(self,
+                 requests_per_minute: Optional[float] = None,
+                 tokens_per_minute: Optional[float] = None):
+        self.requests = (TokenBucket(requests_per_minute)
+                         if requests_per_minute else None)
+        self.tokens = (TokenBucket(tokens_per_minute)
+                       if tokens_per_minute else None)
+        self._paused_until = 0.0
+        self._backoff = 0.0
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.calls = 0
+        self.rate_limited = 0
+        self.waited_seconds = 0.0
+
+    def _delay(self, tokens: int, now: float) -> float:
+        delay = self._paused_until - now
+        if self.requests is not None:
+            delay = max(delay, self.requests.delay(1, now))
+        if self.tokens is not None:
+            delay = max(delay, self.tokens.delay(tokens, now))
+        return delay
+
+    def acquire(self, tokens: int = 0) -> None:
+        """Wait until one more request of ``tokens`` tokens fits."""
+        started = time.monotonic()
+        waiting = False
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                delay = self._delay(tokens, now)
+                if delay <= 0:
+                    if self.requests is not None:
+                        self.requests.take(1)
+                    if self.tokens is not None:
+                        self.tokens.take(tokens)
+                    self.calls += 1
+                    if waiting:
+                        self.queued -= 1
+                        self.waited_seconds += now - started
+                    return
+                if not waiting:
+                    waiting = True
+                    self.queued += 1
+            # Sleep in short steps so a 429 pause or a refill is noticed
+            time.sleep(min(delay, 1.0))
+
+    def correct(self, estimated: int, actual: int) -> None:
+        """Charge the difference between estimated and reported tokens."""
+        if self.tokens is not None and actual:
+            with self._lock:
+                self.tokens.take(actual - estimated)
+
+    def succeeded(self) -> None:
+        with self._lock:
+            self._backoff = 0.0
+
+    def throttled(self, retry_after: Optional[float]) -> None:
+        """Pause every call to this model after the provider sent a 429."""
+        with self._lock:
+            self.rate_limited += 1
+            if retry_after is None:
+                self._backoff = min(60.0, max(1.0, self._backoff * 2))
+                retry_after = self._backoff
+            self._paused_until = max(self._paused_until,
+                                     time.monotonic() + retry_after)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'queued': self.queued,
+                'calls': self.calls,
+                'rate_limited': self.rate_limited,
+                'waited_seconds': self.waited_seconds,
+            }
+
+
+_limits = dict(settings.RATE_LIMITS)
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def set_rate_limit(key: str,
+                   requests_per_minute: Optional[float],
+                   tokens_per_minute: Optional[float] = None) -> None:
+    """Set the budget of a provider or a provider/model for this process.
+
+    Only limiters created afterwards use it, so call this before the first
+    LLM call.
+    """
+    with _limiters_lock:
+        _limits[key] = (requests_per_minute, tokens_per_minute)
+
+
+def get_rate_limiter(provider: str, model: str) -> RateLimiter:
+    """Return the shared limiter of ``model``, creating it on first use."""
+    key = f'{provider}/{model}'
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            rpm, tpm = (_limits.get(key) or _limits.get(provider)
+                        or (None, None))
+            limiter = _limiters[key] = RateLimiter(rpm, tpm)
+        return limiter
+
+
+def rate_limit_stats() -> dict:
+    """``RateLimiter.stats`` of every limiter used so far, by provider/model."""
+    with _limiters_lock:
+        limiters = dict(_limiters)
+    return {key: limiter.stats() for key, limiter in limiters.items()}
+
+
+def _retry_after_header(headers) -> Optional[float]:
+    try:
+        return float(headers.get('retry-after'))
+    except (TypeError, ValueError):
+        return None
+
+
+def _retry_after(error) -> Optional[float]:
+    response = getattr(error, 'response', None)
+    return _retry_after_header(getattr(response, 'headers', None) or {})
+
+
+def throttled(provider: str, model: str, headers) -> None:
+    """Pause ``model``'s queued calls after a 429 with these headers."""
+    get_rate_limiter(provider, model).throttled(_retry_after_header(headers))
+
+
+def _is_rate_limit(error) -> bool:
+    status = getattr(error, 'status_code', None) or getattr(
+        error, 'code', None)
+    return status == 429 or 'RateLimit' in type(error).__name__ or (
+        'ResourceExhausted' in type(error).__name__)
+
+
+class RateLimitCallbackHandler(BaseCallbackHandler):
+    """Queues each LLM call of one client behind its model's limiter."""
+
+    def __init__(self, provider: str, model: str):
+        self.provider = provider
+        self.limiter = get_rate_limiter(provider, model)
+        # The client this handler is attached to; set by the crew factory
+        self.llm = None
+        self._estimates = {}
+        self._lock = threading.Lock()
+
+    def _cached(self, messages, options) -> bool:
+        # LangChain only looks the prompt up after this callback, so check
+        # the client's cache the same way it will
+        cache = getattr(self.llm, 'cache', None)
+        if not hasattr(cache, 'contains') or len(messages) != 1:
+            return False
+        try:
+            return cache.contains(dumps(messages[0]),
+                                  self.llm._get_llm_string(**(options or {})))
+        except Exception:
+            return False
+
+    def _start(self, run_id, texts) -> None:
+        # Corrected with the reported usage once the call ends
+        estimate = sum(estimate_tokens(text) for text in texts)
+        self.limiter.acquire(estimate)
+        with self._lock:
+            self._estimates[run_id] = estimate
+
+    def on_llm_start(self, serialized, prompts, *, run_id, **kwargs):
+        self._start(run_id, prompts)
+
+    def on_chat_model_start(self,
+                            serialized,
+                            messages,
+                            *,
+                            run_id,
+                            options=None,
+                            **kwargs):
+        if self._cached(messages, options):
+            with self._lock:
+                self._estimates[run_id] = None
+            return
+        self._start(run_id, [
+            str(message.content) for batch in messages for message in batch
+        ])
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        with self._lock:
+            estimate = self._estimates.pop(run_id, 0)
+        if estimate is None:
+            return  # answered from the cache; the stored usage was paid for
+        self.limiter.correct(estimate, sum(token_usage(response)))
+        self.limiter.succeeded()
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        with self._lock:
+            self._estimates.pop(run_id, None)
+        # The connection pool has already reported every 429 of its calls
+        if _is_rate_limit(error) and not http_pool.pooled(self.provider):
+            self.limiter.throttled(_retry_after(error))
@@ -0,0 +1,195 @@
+"""Whole-run result store for crews whose output depends on a single query.
+
+A disease review is fully determined by the disease, the model settings and
+the agent/task definitions, so finished runs are stored under a key built
+from exactly those three things. Names such as diseases are keyed without
+case, accents or punctuation; free text keeps its punctuation, since
+"y > 5" and "y < 5" ask different things. Editing any prompt changes the crew
+fingerprint and therefore the key, which invalidates old entries without any
+bookkeeping. Entries also expire after ``RESULT_TTL_HOURS``. Each entry also
+records its query and a namespace (the key without the query), so
+``ranvier.similar`` can find entries for near-duplicate queries.
+"""
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Optional, Union
+
+from ranvier import settings
+from ranvier.crew_factory import LLMConfig, Routes
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    result TEXT NOT NULL,
+    detailed_results TEXT NOT NULL,
+    created REAL NOT NULL,
+    namespace TEXT,
+    query TEXT
+);
+"""
+
+
+def normalize_query(text: str) -> str:
+    """Fold case, accents, punctuation and spacing out of a user query."""
+    text = unicodedata.normalize('NFKD', text)
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    return ' '.join(re.sub(r'[^\w]+', ' ', text.lower()).split())
+
+
+def normalize_text(text: str) -> str:
+    """Fold case, Unicode form and spacing out of free text."""
+    return ' '.join(unicodedata.normalize('NFKC', text).casefold().split())
+
+
+def fingerprint(agents, tasks) -> str:
+    """Hash (role, goal, backstory) of every agent and (description,
+    expected output, agent role, context indexes) of every task."""
+    parts = []
+    for role, goal, backstory in agents:
+        parts += [role, goal, backstory]
+    for description, expected_output, role, context in tasks:
+        parts += [description, expected_output or '', role]
+        parts.append(','.join(str(i) for i in context))
+    return hashlib.sha256('\x1f'.join(parts).encode('utf-8')).hexdigest()
+
+
+def task_records(crew) -> list:
+    """Plain ``{'task', 'result'}`` records for every task of a finished run."""
+    return [{
+        "task": task.description,
+        "result": task.output.raw_output if task.output is not None else None
+    } for task in crew.tasks]
+
+
+def _model_key(config: LLMConfig) -> str:
+    return (f'{config.provider}:{config.model}:{config.temperature}:'
+            f'{config.max_tokens}')
+
+
+def _key_parts(page: str, config: Union[LLMConfig, Routes], fingerprint: str,
+               options: Optional[dict]) -> list:
+    routes = Routes.of(config)
+    parts = [page, _model_key(routes.default), fingerprint]
+    # None options are left out so unset options keep existing keys valid
+    options = {k: v for k, v in (options or {}).items() if v is not None}
+    # Only routed crews get the extra option, for the same reason
+    if routes.agents:
+        options['agent_routes'] = [[role, _model_key(config)]
+                                   for role, config in routes.agents]
+    if routes.tasks:
+        options['task_routes'] = [[index, _model_key(config)]
+                                  for index, config in routes.tasks]
+    if options:
+        parts.append(json.dumps(options, sort_keys=True))
+    return parts
+
+
+class ResultStore:
+    """SQLite table of finished runs with a time-to-live."""
+
+    def __init__(self, path, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(_SCHEMA)
+        columns = [
+            row[1]
+            for row in self._conn.execute('PRAGMA table_info(results)')
+        ]
+        # Stores written before queries were recorded
+        for column in ('namespace', 'query'):
+            if column not in columns:
+                self._conn.execute(
+                    f'ALTER TABLE results ADD COLUMN {column} TEXT')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS results_namespace '
+                           'ON results (namespace, created)')
+        self._conn.commit()
+
+    @staticmethod
+    def key(page: str,
+            query: str,
+            config: Union[LLMConfig, Routes],
+            fingerprint: str,
+            options: Optional[dict] = None,
+            free_text: bool = False) -> str:
+        """``options`` holds run settings that change the output; None
+        values are left out so unset options keep existing keys valid.
+        A ``free_text`` query keeps its punctuation (``normalize_text``)."""
+        parts = _key_parts(page, config, fingerprint, options)
+        normalize = normalize_text if free_text else normalize_query
+        parts.insert(1, normalize(query))
+        raw = '\x1f'.join(parts)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def namespace(page: str,
+                  config: Union[LLMConfig, Routes],
+                  fingerprint: str,
+                  options: Optional[dict] = None) -> str:
+        """Hash of everything in ``key`` but the query."""
+        raw = '\x1f'.join(_key_parts(page, config, fingerprint, options))
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[dict]:
+        """Return the stored run for ``key`` unless it is missing or stale."""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT result, detailed_results, created FROM results '
+                'WHERE key = ?', (key, )).fetchone()
+        if row is None or time.time() - row[2] > self.ttl_seconds:
+            return None
+        return {
+            'result': row[0],
+            'detailed_results': json.loads(row[1]),
+            'created': row[2],
+        }
+
+    def put(self,
+            key: str,
+            result: str,
+            detailed_results: list,
+            namespace: Optional[str] = None,
+            query: Optional[str] = None) -> None:
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO results (key, result, '
+                'detailed_results, created, namespace, query) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (key, result, json.dumps(detailed_results), time.time(),
+                 namespace, query))
+            # Expired rows can never be served again
+            self._conn.execute('DELETE FROM results WHERE created < ?',
+                               (time.time() - self.ttl_seconds, ))
+            self._conn.commit()
+
+    def queries(self, namespace: str, since: float = 0.0) -> list:
+        """(created, query, key) of live entries in ``namespace`` that were
+        stored after ``since``, oldest first."""
+        with self._lock:
+            return self._conn.execute(
+                'SELECT created, query, key FROM results WHERE namespace = ? '
+                'AND created > ? AND created >= ? AND query IS NOT NULL '
+                'ORDER BY created',
+                (namespace, since, time.time() - self.ttl_seconds)).fetchall()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_result_store() -> ResultStore:
+    """Return the process-wide result store, opening it on first use."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ResultStore(settings.data_path('results.sqlite'),
+                                     ttl_seconds=settings.RESULT_TTL_HOURS *
+                                     3600)
+    return _store
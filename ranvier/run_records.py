@@ -0,0 +1,178 @@
+"""Compact storage of the finished runs shown in browser sessions.
+
+Pages used to keep each finished run (answer, task records and profile) in
+``st.session_state`` for the whole life of the session. With many open tabs
+that memory only grew. A finished run is now written here as zlib-compressed
+JSON, and the session keeps just the returned handle. Recently read records
+stay decoded in a small in-memory LRU bounded by ``RUN_RECORD_CACHE_MB``.
+Each session keeps at most ``RUN_RECORDS_PER_SESSION`` records, and all
+records of a session idle for ``RUN_SESSION_IDLE_MINUTES`` are evicted.
+"""
+import json
+import sqlite3
+import threading
+import time
+import uuid
+import zlib
+from collections import OrderedDict
+from typing import Optional
+
+from ranvier import settings
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS run_records (
+    handle TEXT PRIMARY KEY,
+    session TEXT NOT NULL,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS run_records_session ON run_records (session);
+"""
+
+# Idle sessions are looked for at most this often
+_EVICT_INTERVAL = 60
+
+
+class RunRecordStore:
+    """SQLite table of compressed run records with per-session eviction."""
+
+    def __init__(self, path, cache_bytes: int, per_session: int,
+                 idle_seconds: float):
+        self.cache_bytes = cache_bytes
+        self.per_session = per_session
+        self.idle_seconds = idle_seconds
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(_SCHEMA)
+        self._cache = OrderedDict()  # handle -> (record, size)
+        self._cached_bytes = 0
+        # Session -> time of its last put or get, flushed to last_access
+        # when idle sessions are evicted
+        self._last_seen = {}
+        self._last_evict = time.time()
+
+    def put(self, session: str, record: dict) -> str:
+        """Store ``record`` for ``session`` and return its handle."""
+        value = zlib.compress(json.dumps(record).encode('utf-8'))
+        handle = f'{session}:{uuid.uuid4().hex}'
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'INSERT INTO run_records (handle, session, value, size, '
+                'created, last_access) VALUES (?, ?, ?, ?, ?, ?)',
+                (handle, session, value, len(value), now, now))
+            # Only the newest records of a session are kept
+            stale = [
+                row[0] for row in self._conn.execute(
+                    'SELECT handle FROM run_records WHERE session = ? '
+                    'ORDER BY created DESC LIMIT -1 OFFSET ?',
+                    (session, self.per_session))
+            ]
+            self._delete(stale)
+            self._conn.commit()
+            self._touch(session)
+        return handle
+
+    def get(self, handle: str) -> Optional[dict]:
+        """Return the record behind ``handle``, or None once evicted."""
+        session = handle.partition(':')[0]
+        with self._lock:
+            self._touch(session)
+            cached = self._cache.get(handle)
+            if cached is not None:
+                self._cache.move_to_end(handle)
+                return cached[0]
+            row = self._conn.execute(
+                'SELECT value FROM run_records WHERE handle = ?',
+                (handle, )).fetchone()
+        if row is None:
+            return None
+        raw = zlib.decompress(row[0])
+        record = json.loads(raw)
+        with self._lock:
+            self._remember(handle, record, len(raw))
+        return record
+
+    def footprint(self, session: str) -> dict:
+        """Records, compressed bytes and decoded bytes held for ``session``."""
+        with self._lock:
+            records, stored = self._conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM run_records '
+                'WHERE session = ?', (session, )).fetchone()
+            cached = sum(size for handle, (_, size) in self._cache.items()
+                         if handle.startswith(f'{session}:'))
+        return {'records': records, 'stored_bytes': stored,
+                'cached_bytes': cached}
+
+    def evict_idle(self) -> int:
+        """Drop every record of sessions idle for longer than the limit.
+
+        Returns the number of records dropped. Sessions left behind by a
+        restarted or another process age out the same way.
+        """
+        cutoff = time.time() - self.idle_seconds
+        with self._lock:
+            self._conn.executemany(
+                'UPDATE run_records SET last_access = ? WHERE session = ?',
+                [(seen, session) for session, seen in self._last_seen.items()])
+            self._last_seen = {
+                session: seen
+                for session, seen in self._last_seen.items() if seen >= cutoff
+            }
+            idle = [
+                row[0] for row in self._conn.execute(
+                    'SELECT handle FROM run_records WHERE session IN '
+                    '(SELECT session FROM run_records GROUP BY session '
+                    'HAVING MAX(last_access) < ?)', (cutoff, ))
+            ]
+            self._delete(idle)
+            self._conn.commit()
+            self._last_evict = time.time()
+        return len(idle)
+
+    def _delete(self, handles: list) -> None:
+        # Called with the lock held
+        self._conn.executemany('DELETE FROM run_records WHERE handle = ?',
+                               [(handle, ) for handle in handles])
+        for handle in handles:
+            cached = self._cache.pop(handle, None)
+            if cached is not None:
+                self._cached_bytes -= cached[1]
+
+    def _touch(self, session: str) -> None:
+        # Called with the lock held
+        now = time.time()
+        self._last_seen[session] = now
+        if now - self._last_evict > _EVICT_INTERVAL:
+            self._last_evict = now
+            threading.Thread(target=self.evict_idle, daemon=True).start()
+
+    def _remember(self, handle: str, record: dict, size: int) -> None:
+        # Called with the lock held
+        if handle in self._cache or size > self.cache_bytes:
+            return
+        self._cache[handle] = (record, size)
+        self._cached_bytes += size
+        while self._cached_bytes > self.cache_bytes:
+            self._cached_bytes -= self._cache.popitem(last=False)[1][1]
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_run_records() -> RunRecordStore:
+    """Return the process-wide run record store, opening it on first use."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = RunRecordStore(
+                    settings.data_path('run_records.sqlite'),
+                    cache_bytes=int(settings.RUN_RECORD_CACHE_MB * 1e6),
+                    per_session=settings.RUN_RECORDS_PER_SESSION,
+                    idle_seconds=settings.RUN_SESSION_IDLE_MINUTES * 60)
+    return _store
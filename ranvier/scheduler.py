@@ -0,0 +1,165 @@
+"""Run a crew's tasks as a dependency graph instead of a fixed sequence.
+
+``Process.sequential`` runs every task one after the other even when the
+declared ``context`` shows that several of them only depend on earlier,
+already finished work. ``run_crew`` builds the graph from those declarations
+and runs every task whose dependencies are done, up to ``max_workers`` at a
+time, so a run takes roughly as long as its critical path. Given a
+``RunProfile``, it also records when every task became ready, started and
+finished, and given a ``TokenStream`` it streams the final task's tokens.
+Tasks given a context budget read an extractive summary of their upstream
+outputs instead of the full text (see ``ranvier.compaction``).
+
+Dependencies follow crewAI's own sequential semantics:
+
+* ``context=[a, b]`` waits for ``a`` and ``b`` and reads their outputs;
+* ``context=[]`` declares a task that needs no upstream output;
+* no ``context`` at all reads the output of the task listed just before it.
+"""
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Optional
+
+from ranvier import settings
+from ranvier.compaction import compact_context
+from ranvier.profiling import RunProfile, TaskTiming, timed
+from ranvier.streaming import TokenStream, streaming_to
+from ranvier.transcripts import transcribing
+
+
+def task_dependencies(tasks) -> list:
+    """Return, for every task, the set of task indexes it waits for."""
+    index = {id(task): i for i, task in enumerate(tasks)}
+    deps = []
+    for i, task in enumerate(tasks):
+        if task.context is None:
+            deps.append({i - 1} if i else set())
+        else:
+            deps.append({index[id(dep)] for dep in task.context})
+    return deps
+
+
+def _prepare(crew, inputs: dict, concurrent: bool) -> None:
+    # The parts of Crew.kickoff() that a task needs before it can execute
+    # Routed tasks may run an agent that is not listed in crew.agents
+    agents = {id(a): a for a in crew.agents}
+    agents.update((id(t.agent), t.agent) for t in crew.tasks if t.agent)
+    for agent in agents.values():
+        agent.interpolate_inputs(inputs)
+    for task in crew.tasks:
+        task.interpolate_inputs(inputs)
+    if concurrent:
+        # An agent keeps per-execution state, so tasks that may run at the
+        # same time must not share one
+        seen = set()
+        for task in crew.tasks:
+            if task.agent is not None and id(task.agent) in seen:
+                # Agent.copy() drops the client on some crewAI releases
+                task.agent = task.agent.model_copy()
+            elif task.agent is not None:
+                seen.add(id(task.agent))
+    for task in crew.tasks:
+        if task.agent is not None:
+            task.agent.crew = crew
+
+
+def _execute(task, previous_output: Optional[str],
+             timing: Optional[TaskTiming], stream: Optional[TokenStream],
+             budget: Optional[int], transcript: Optional[str]) -> str:
+    with timed(timing), streaming_to(stream), transcribing(transcript):
+        if task.context is None:
+            return str(task.execute(context=previous_output))
+        if budget is None:
+            return str(task.execute())
+        upstream = [
+            dep.output.raw_output for dep in task.context if dep.output
+        ]
+        context, saved = compact_context(
+            f'{task.description}\n{task.expected_output or ""}', upstream,
+            budget)
+        if timing is not None:
+            timing.context_tokens_saved = saved
+        # Task.execute() rebuilds the context from task.context, so detach
+        # it for this call to pass the compacted text instead
+        dependencies, task.context = task.context, None
+        try:
+            return str(task.execute(context=context))
+        finally:
+            task.context = dependencies
+
+
+def run_crew(crew,
+             inputs: dict,
+             max_workers: Optional[int] = None,
+             on_progress: Optional[Callable[[int, str], None]] = None,
+             profile: Optional[RunProfile] = None,
+             stream: Optional[TokenStream] = None,
+             context_budgets: Optional[dict] = None,
+             transcript: Optional[str] = None) -> str:
+    """Kick off ``crew`` with ``inputs`` and return the last task's output.
+
+    ``max_workers`` bounds how many tasks run at once and defaults to
+    ``RANVIER_MAX_PARALLEL_TASKS``; 1 reproduces ``Process.sequential``.
+    ``on_progress(index, state)`` is told when a task is 'started' and
+    'finished'. Task timings are appended to ``profile`` when one is given,
+    and the last task's tokens are streamed into ``stream``.
+    ``context_budgets`` maps task indexes (negative ones count from the end)
+    to the token budget their upstream context is compacted to; None
+    budgets are ignored. Given a ``transcript`` label, every task's LLM
+    calls are logged under it (see ``ranvier.transcripts``).
+    """
+    on_progress = on_progress or (lambda index, state: None)
+    max_workers = max(1, max_workers or settings.MAX_PARALLEL_TASKS)
+    tasks = crew.tasks
+    deps = task_dependencies(tasks)
+    budgets = {
+        index % len(tasks): budget
+        for index, budget in (context_budgets or {}).items()
+        if budget is not None
+    }
+    _prepare(crew, inputs, concurrent=max_workers > 1)
+
+    outputs = {}
+    running = {}
+    ready_at = {}
+    with ThreadPoolExecutor(max_workers=max_workers,
+                            thread_name_prefix='crew-task') as pool:
+        while len(outputs) < len(tasks):
+            # A task's queue wait starts once its last dependency is done
+            now = time.time()
+            for i in range(len(tasks)):
+                if i not in ready_at and deps[i] <= outputs.keys():
+                    ready_at[i] = now
+            for i, task in enumerate(tasks):
+                if len(running) >= max_workers:
+                    break
+                if (i in outputs or i in running.values()
+                        or not deps[i] <= outputs.keys()):
+                    continue
+                timing = None
+                if profile is not None:
+                    timing = TaskTiming(
+                        index=i,
+                        task=task.description,
+                        agent=task.agent.role if task.agent else '',
+                        ready=ready_at[i])
+                    profile.tasks.append(timing)
+                final = i == len(tasks) - 1
+                label = None
+                if transcript is not None:
+                    agent = task.agent.role if task.agent else ''
+                    label = f'{transcript} task {i} ({agent})'
+                future = pool.submit(_execute, task, outputs.get(i - 1),
+                                     timing, stream if final else None,
+                                     budgets.get(i), label)
+                running[future] = i
+                on_progress(i, 'started')
+            if not running:
+                raise ValueError('Task context must only refer to tasks '
+                                 'listed earlier in the same crew')
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                i = running.pop(future)
+                outputs[i] = future.result()
+                on_progress(i, 'finished')
+    return outputs[len(tasks) - 1]
@@ -0,0 +1,117 @@
+"""Deployment settings read from environment variables."""
+import os
+from pathlib import Path
+
+# Where caches and stores are written; one directory per deployment
+DATA_DIR = Path(os.getenv('RANVIER_DATA_DIR', '.ranvier'))
+
+# Upper bound for the on-disk LLM response cache
+LLM_CACHE_MAX_MB = float(os.getenv('RANVIER_LLM_CACHE_MAX_MB', '256'))
+
+# How long a finished disease review is served from the result store
+RESULT_TTL_HOURS = float(os.getenv('RANVIER_RESULT_TTL_HOURS', '168'))
+
+# Similarity from which a stored result answers a near-duplicate query; 1.0
+# only reuses exact repeats
+SIMILAR_QUERY_THRESHOLD = float(
+    os.getenv('RANVIER_SIMILAR_QUERY_THRESHOLD', '0.9'))
+
+# How many independent crew tasks may run at the same time; 1 is sequential
+MAX_PARALLEL_TASKS = int(os.getenv('RANVIER_MAX_PARALLEL_TASKS', '3'))
+
+# Crew runs executing at once across all sessions; later ones wait in line
+MAX_CONCURRENT_RUNS = int(os.getenv('RANVIER_MAX_CONCURRENT_RUNS', '4'))
+
+# How long a finished run stays collectable by a reconnecting browser
+JOB_RETENTION_MINUTES = float(os.getenv('RANVIER_JOB_RETENTION_MINUTES', '60'))
+
+# Upper bound for the searchable archive of completed runs
+ARCHIVE_MAX_MB = float(os.getenv('RANVIER_ARCHIVE_MAX_MB', '512'))
+
+# Finished runs shown in browser sessions: newest kept per session, decoded
+# ones held in memory, and how long a session may idle before they go
+RUN_RECORDS_PER_SESSION = int(os.getenv('RANVIER_RUN_RECORDS_PER_SESSION',
+                                        '12'))
+RUN_RECORD_CACHE_MB = float(os.getenv('RANVIER_RUN_RECORD_CACHE_MB', '32'))
+RUN_SESSION_IDLE_MINUTES = float(
+    os.getenv('RANVIER_RUN_SESSION_IDLE_MINUTES', '120'))
+
+# Rows of an uploaded CSV shown to the ML assistant, read in chunks of
+# CSV_CHUNK_ROWS; scanning stops after CSV_SCAN_MAX_ROWS rows
+CSV_SAMPLE_ROWS = int(os.getenv('RANVIER_CSV_SAMPLE_ROWS', '10'))
+CSV_CHUNK_ROWS = int(os.getenv('RANVIER_CSV_CHUNK_ROWS', '10000'))
+CSV_SCAN_MAX_ROWS = int(os.getenv('RANVIER_CSV_SCAN_MAX_ROWS', '1000000'))
+
+# Sample size behind the quantiles and correlations of a dataset profile
+CSV_PROFILE_ROWS = int(os.getenv('RANVIER_CSV_PROFILE_ROWS', '5000'))
+
+
+def parse_rate_limits(value: str) -> dict:
+    """Parse 'groq=30,groq/llama3-70b-8192=30:6000' into limit tuples.
+
+    Keys are a provider or a provider/model; values are (requests per
+    minute, tokens per minute), either of which may be left empty.
+    """
+    limits = {}
+    for item in value.split(','):
+        if item.strip():
+            key, _, value = item.partition('=')
+            rpm, _, tpm = value.partition(':')
+            limits[key.strip()] = (float(rpm) if rpm.strip() else None,
+                                   float(tpm) if tpm.strip() else None)
+    return limits
+
+
+# Request and token budgets per LLM provider or model; unset means unlimited
+RATE_LIMITS = parse_rate_limits(os.getenv('RANVIER_RATE_LIMITS', ''))
+
+# Default token budget for compacted synthesis context
+CONTEXT_BUDGET_TOKENS = int(os.getenv('RANVIER_CONTEXT_BUDGET_TOKENS', '3000'))
+
+# Keep-alive connections shared per LLM provider, how long an idle one stays
+# open, and whether they are opened when the first page loads
+HTTP_POOL_CONNECTIONS = int(os.getenv('RANVIER_HTTP_POOL_CONNECTIONS', '20'))
+HTTP_KEEPALIVE_SECONDS = float(
+    os.getenv('RANVIER_HTTP_KEEPALIVE_SECONDS', '300'))
+HTTP_PREWARM = os.getenv('RANVIER_HTTP_PREWARM', '1') not in ('', '0',
+                                                             'false')
+
+# Prometheus metrics: served at http://METRICS_HOST:METRICS_PORT/metrics
+# and/or rewritten to METRICS_FILE every METRICS_INTERVAL seconds; both off
+# when unset
+METRICS_HOST = os.getenv('RANVIER_METRICS_HOST', '127.0.0.1')
+METRICS_PORT = int(os.getenv('RANVIER_METRICS_PORT', '0'))
+METRICS_FILE = os.getenv('RANVIER_METRICS_FILE', '')
+METRICS_INTERVAL = float(os.getenv('RANVIER_METRICS_INTERVAL', '15'))
+
+# Level of the app's log on stderr; DEBUG also logs every HTTP request
+LOG_LEVEL = os.getenv('RANVIER_LOG_LEVEL', 'INFO')
+
+# Print every agent's reasoning to stdout, as crewAI's verbose mode does
+VERBOSE_AGENTS = os.getenv('RANVIER_VERBOSE_AGENTS', '') not in ('', '0',
+                                                                'false')
+
+# Rotating file for the prompts and responses of a sampled share of runs;
+# no transcripts when unset
+TRANSCRIPT_FILE = os.getenv('RANVIER_TRANSCRIPT_FILE', '')
+TRANSCRIPT_SAMPLE_RATE = float(
+    os.getenv('RANVIER_TRANSCRIPT_SAMPLE_RATE', '0.1'))
+TRANSCRIPT_MAX_MB = float(os.getenv('RANVIER_TRANSCRIPT_MAX_MB', '50'))
+TRANSCRIPT_BACKUPS = int(os.getenv('RANVIER_TRANSCRIPT_BACKUPS', '5'))
+
+# Retries the provider SDKs make, honouring Retry-After, before a call fails
+LLM_MAX_RETRIES = int(os.getenv('RANVIER_LLM_MAX_RETRIES', '6'))
+
+# Answer every LLM call with the offline fake model (see ranvier.fake_llm)
+FAKE_LLM = os.getenv('RANVIER_FAKE_LLM', '') not in ('', '0', 'false')
+
+# Pace of the fake model: seconds to first token, then tokens per second
+FAKE_LLM_LATENCY = float(os.getenv('RANVIER_FAKE_LLM_LATENCY', '0.5'))
+FAKE_LLM_TOKENS_PER_SECOND = float(
+    os.getenv('RANVIER_FAKE_LLM_TOKENS_PER_SECOND', '100'))
+
+
+def data_path(name: str) -> Path:
+    """Return ``DATA_DIR / name``, creating the directory on first use."""
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    return DATA_DIR / name
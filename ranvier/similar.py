@@ -0,0 +1,175 @@
+"""Near-duplicate lookup of queries the result store has already answered.
+
+"Meniere", "Ménière's disease" and "Síndrome de Meniere" are different keys
+in the result store, so each used to cost a full crew run. Every namespace of
+the store (same page, models, prompts and options; see
+``ResultStore.namespace``) gets an index of the queries answered in it. A
+query is folded like a store key, stripped of generic words such as
+"disease" or "síndrome", and embedded as character 2-4-gram TF-IDF. The
+nearest answered query by cosine similarity is served when it reaches the
+threshold. Character n-grams are hashed, so the index only ever appends: a
+new answer adds one row and updates the document frequencies, and IDF
+weights are reapplied the next time the index is searched. New answers are
+picked up from the store on every lookup, whichever process or batch run
+stored them.
+"""
+import re
+import threading
+from typing import NamedTuple, Optional
+
+from ranvier.result_store import (ResultStore, get_result_store,
+                                  normalize_query)
+
+# Words that name the kind of condition rather than the condition itself
+_GENERIC = frozenset('''
+    an and of the in with disease diseases syndrome syndromes disorder
+    illness condition s y de del la las el los en con enfermedad
+    enfermedades sindrome sindromes trastorno
+'''.split())
+
+_FEATURES = 2**18
+
+
+def canonical_query(text: str) -> str:
+    """Fold a query as store keys do, without generic condition words."""
+    words = normalize_query(text).split()
+    return ' '.join(w for w in words if w not in _GENERIC) or ' '.join(words)
+
+
+# Numbers as written and comparison or arithmetic signs, which folding drops
+_LITERALS = re.compile(r'\d+(?:[.,]\d+)*|[<>=≤≥±+%]')
+
+
+def _markers(query: str, canonical: str) -> frozenset:
+    # Short and numeric words tell "Hepatitis B" from "Hepatitis C" and type 1
+    # from type 2 diabetes; n-gram similarity barely sees them, so they must
+    # match exactly. So must "39.5" and "39 5", or "y > 5" and "y < 5"
+    return frozenset(
+        w for w in canonical.split()
+        if len(w) <= 2 or any(c.isdigit() for c in w)) | frozenset(
+            _LITERALS.findall(query))
+
+
+class Match(NamedTuple):
+    similarity: float
+    query: str
+    key: str
+
+
+class QueryIndex:
+    """Append-only character n-gram TF-IDF index over answered queries."""
+
+    def __init__(self):
+        from sklearn.feature_extraction.text import HashingVectorizer
+
+        self._vectorizer = HashingVectorizer(analyzer='char_wb',
+                                             ngram_range=(2, 4),
+                                             n_features=_FEATURES,
+                                             alternate_sign=False,
+                                             norm=None)
+        self._counts = []  # raw n-gram counts per query
+        self._queries = []
+        self._keys = []
+        self._markers = []
+        self._known = set()
+        self._document_frequency = None
+        self._idf = None
+        self._neighbors = None  # fitted lazily after additions
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, query: str, key: str) -> None:
+        import numpy as np
+
+        if key in self._known:
+            return
+        canonical = canonical_query(query)
+        counts = self._vectorizer.transform([canonical])
+        if self._document_frequency is None:
+            self._document_frequency = np.zeros(_FEATURES)
+        self._document_frequency[counts.indices] += 1
+        self._counts.append(counts)
+        self._queries.append(query)
+        self._keys.append(key)
+        self._markers.append(_markers(query, canonical))
+        self._known.add(key)
+        self._neighbors = None
+
+    def _weigh(self, counts):
+        from sklearn.preprocessing import normalize
+
+        return normalize(counts.multiply(self._idf).tocsr())
+
+    def nearest(self, query: str, k: int = 5) -> list:
+        """Up to ``k`` answered queries closest to ``query``, best first;
+        queries whose short or numeric words, numbers or signs differ are
+        left out."""
+        import numpy as np
+        import scipy.sparse as sp
+        from sklearn.neighbors import NearestNeighbors
+
+        if not self._keys:
+            return []
+        if self._neighbors is None:
+            documents = len(self._keys)
+            self._idf = np.log(
+                (1 + documents) / (1 + self._document_frequency)) + 1
+            self._neighbors = NearestNeighbors(metric='cosine',
+                                               algorithm='brute').fit(
+                                                   self._weigh(
+                                                       sp.vstack(
+                                                           self._counts)))
+        canonical = canonical_query(query)
+        vector = self._weigh(self._vectorizer.transform([canonical]))
+        distances, indexes = self._neighbors.kneighbors(
+            vector, n_neighbors=min(k, len(self._keys)))
+        markers = _markers(query, canonical)
+        return [
+            Match(1.0 - float(distance), self._queries[i], self._keys[i])
+            for distance, i in zip(distances[0], indexes[0])
+            if self._markers[i] == markers
+        ]
+
+
+class SimilarQueries:
+    """One ``QueryIndex`` per result store namespace, fed from the store."""
+
+    def __init__(self, store: ResultStore):
+        self.store = store
+        self._indexes = {}  # namespace -> (QueryIndex, newest created seen)
+        self._lock = threading.Lock()
+
+    def find(self, namespace: str, query: str,
+             threshold: float) -> Optional[tuple]:
+        """(Match, stored run) for the closest answered query at or above
+        ``threshold``, or None."""
+        with self._lock:
+            index, seen = self._indexes.get(namespace) or (QueryIndex(), 0.0)
+            for created, answered, key in self.store.queries(namespace, seen):
+                index.add(answered, key)
+                seen = created
+            self._indexes[namespace] = (index, seen)
+            matches = index.nearest(query)
+        for match in matches:
+            if match.similarity < threshold:
+                break
+            stored = self.store.get(match.key)
+            # Entries expire from the store before they leave the index
+            if stored:
+                return match, stored
+        return None
+
+
+_similar = None
+_similar_lock = threading.Lock()
+
+
+def get_similar_queries() -> SimilarQueries:
+    """Return the process-wide similar-query lookup over the result store."""
+    global _similar
+    if _similar is None:
+        with _similar_lock:
+            if _similar is None:
+                _similar = SimilarQueries(get_result_store())
+    return _similar
@@ -0,0 +1,79 @@
+"""Live token stream of a crew's final task.
+
+The last task of every crew is the writer/synthesizer whose output becomes
+the page result. The scheduler makes a ``TokenStream`` current while that
+task executes; the callback handler the crew factory attaches to every chat
+model appends each new token to it. The page shows ``TokenStream.text`` while
+the job runs. Streaming only changes how the provider delivers the response:
+the agent still receives the full message, so the final output is unchanged.
+"""
+import contextlib
+import contextvars
+import threading
+from typing import Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+_FINAL_ANSWER = 'Final Answer:'
+
+_current_stream = contextvars.ContextVar('ranvier_current_stream',
+                                         default=None)
+
+
+class TokenStream:
+    """Text of the LLM call currently streaming for the final task."""
+
+    def __init__(self):
+        self._parts = []
+        self._lock = threading.Lock()
+
+    def new_call(self) -> None:
+        # An agent may call the model several times; show the latest call
+        with self._lock:
+            self._parts = []
+
+    def append(self, token: str) -> None:
+        with self._lock:
+            self._parts.append(token)
+
+    @property
+    def text(self) -> str:
+        """The answer streamed so far, without the agent's reasoning."""
+        with self._lock:
+            text = ''.join(self._parts)
+        if _FINAL_ANSWER in text:
+            return text.split(_FINAL_ANSWER, 1)[1].lstrip()
+        return ''
+
+
+@contextlib.contextmanager
+def streaming_to(stream: Optional[TokenStream]):
+    """Send the tokens of LLM calls made in the enclosed block to ``stream``."""
+    if stream is None:
+        yield
+        return
+    token = _current_stream.set(stream)
+    try:
+        yield
+    finally:
+        _current_stream.reset(token)
+
+
+class StreamingCallbackHandler(BaseCallbackHandler):
+    """Forwards new tokens to the stream that is current in their thread."""
+
+    def on_llm_start(self, serialized, prompts, **kwargs):
+        stream = _current_stream.get()
+        if stream is not None:
+            stream.new_call()
+
+    def on_chat_model_start(self, serialized, messages, **kwargs):
+        self.on_llm_start(serialized, [], **kwargs)
+
+    def on_llm_new_token(self, token, **kwargs):
+        stream = _current_stream.get()
+        if stream is not None:
+            stream.append(token)
+
+
+callback_handler = StreamingCallbackHandler()
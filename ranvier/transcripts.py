@@ -0,0 +1,97 @@
+"""Sampled transcripts of the prompts and responses of crew runs.
+
+Agents used to run with ``verbose=True``, so every prompt and every response
+of every run was printed to stdout from the thread that made the call. Agents
+are now quiet unless ``RANVIER_VERBOSE_AGENTS`` is set. Instead, when
+``RANVIER_TRANSCRIPT_FILE`` is set, ``pipeline.run`` picks a
+``RANVIER_TRANSCRIPT_SAMPLE_RATE`` share of runs. The scheduler makes their
+transcript label current while each task executes, and the callback handler
+the crew factory attaches to every chat model logs that task's calls to the
+``ranvier.transcript`` logger. ``ranvier.logs`` writes that logger to a
+rotating file from a background thread and formats the messages there.
+"""
+import contextlib
+import contextvars
+import logging
+import random
+from typing import Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from ranvier import settings
+
+logger = logging.getLogger('ranvier.transcript')
+
+_current_label = contextvars.ContextVar('ranvier_current_transcript',
+                                        default=None)
+
+
+def sample(page: str, run_id: str) -> Optional[str]:
+    """Transcript label of a run picked for capture, or None."""
+    # Without a handler (see ranvier.logs.configure) nothing would be written
+    if not logger.handlers or random.random() >= settings.TRANSCRIPT_SAMPLE_RATE:
+        return None
+    return f'{page} {run_id}'
+
+
+@contextlib.contextmanager
+def transcribing(label: Optional[str]):
+    """Log the LLM calls made in the enclosed block under ``label``."""
+    if label is None:
+        yield
+        return
+    token = _current_label.set(label)
+    try:
+        yield
+    finally:
+        _current_label.reset(token)
+
+
+class _Messages:
+    # Rendered by the logging thread, not by the thread making the call
+
+    def __init__(self, batches):
+        self.batches = batches
+
+    def __str__(self) -> str:
+        return '\n\n'.join(f'[{getattr(m, "type", "text")}] '
+                           f'{getattr(m, "content", m)}'
+                           for batch in self.batches for m in batch)
+
+
+class _Generations:
+
+    def __init__(self, response):
+        self.response = response
+
+    def __str__(self) -> str:
+        return '\n\n'.join(generation.text
+                           for generations in self.response.generations
+                           for generation in generations)
+
+
+class TranscriptCallbackHandler(BaseCallbackHandler):
+    """Logs the calls of the task whose transcript is current."""
+
+    def on_llm_start(self, serialized, prompts, **kwargs):
+        label = _current_label.get()
+        if label is not None:
+            logger.info('%s prompt:\n%s', label, _Messages([prompts]))
+
+    def on_chat_model_start(self, serialized, messages, **kwargs):
+        label = _current_label.get()
+        if label is not None:
+            logger.info('%s prompt:\n%s', label, _Messages(messages))
+
+    def on_llm_end(self, response, **kwargs):
+        label = _current_label.get()
+        if label is not None:
+            logger.info('%s response:\n%s', label, _Generations(response))
+
+    def on_llm_error(self, error, **kwargs):
+        label = _current_label.get()
+        if label is not None:
+            logger.info('%s error: %s', label, error)
+
+
+callback_handler = TranscriptCallbackHandler()
@@ -0,0 +1,331 @@
+"""Streamlit widgets shared by the pages."""
+import os
+import pickle
+import time
+from typing import Any, Callable, Optional
+
+import streamlit as st
+
+from ranvier import settings
+from ranvier.crew_factory import Routes
+from ranvier.export import export, formats
+from ranvier.http_pool import connection_pool_stats
+from ranvier.jobs import Job, get_job_manager
+from ranvier.llm_cache import get_response_cache
+from ranvier.profiling import RunProfile
+from ranvier.rate_limit import rate_limit_stats
+from ranvier.run_records import get_run_records
+
+
+_API_KEYS = {
+    'google': 'GOOGLE_API_KEY',
+    'groq': 'GROQ_API_KEY',
+    'openai': 'OPENAI_API_KEY',
+    'anthropic': 'ANTHROPIC_API_KEY',
+}
+
+
+def require_api_keys(
+        providers,
+        message: str = ('{key} environment variable not set. Please set the '
+                        '{key} environment variable.')
+) -> None:
+    """Stop the page when one of ``providers`` has no API key."""
+    if settings.FAKE_LLM:
+        return
+    for provider in dict.fromkeys(providers):
+        key = _API_KEYS.get(provider)
+        if key and not os.getenv(key):
+            st.error(message.format(key=key))
+            st.stop()
+
+
+def response_cache_toggle() -> bool:
+    """Render the sidebar switch for the LLM response cache.
+
+    Returns whether this session wants cached responses; pages pass the value
+    on as ``LLMConfig.use_cache``.
+    """
+    use_cache = st.sidebar.toggle(
+        'Use response cache',
+        value=True,
+        help='Replay identical temperature-0 prompts from the local cache '
+        'instead of calling the provider again.')
+    stats = get_response_cache().stats()
+    st.sidebar.caption(
+        f"Response cache: {stats['hits']} hits / {stats['misses']} misses, "
+        f"{stats['entries']} entries ({stats['bytes'] / 1e6:.1f} MB)")
+    return use_cache
+
+
+def context_budget_input() -> Optional[int]:
+    """Render the sidebar controls for compacting the synthesis context.
+
+    Returns the token budget for the synthesis task's upstream context, or
+    None when compaction is off.
+    """
+    compact = st.sidebar.toggle(
+        'Compact synthesis context',
+        value=False,
+        help='Trim the upstream outputs the final task reads to the most '
+        'relevant sentences, chosen locally with TF-IDF.')
+    if not compact:
+        return None
+    return int(
+        st.sidebar.number_input('Context budget (tokens)',
+                                min_value=500,
+                                step=500,
+                                value=settings.CONTEXT_BUDGET_TOKENS))
+
+
+def similar_query_threshold() -> float:
+    """Render the sidebar slider for reusing results of similar queries.
+
+    Returns the similarity a stored query needs to be served in place of a
+    new one; 1.0 means only exact repeats are.
+    """
+    return st.sidebar.slider(
+        'Reuse results of similar queries',
+        min_value=0.5,
+        max_value=1.0,
+        step=0.05,
+        value=settings.SIMILAR_QUERY_THRESHOLD,
+        help='Serve the stored result of an earlier query this alike, such '
+        'as "Meniere" for "Ménière\'s disease". 1.0 only reuses exact '
+        'repeats.')
+
+
+def rate_limit_status() -> None:
+    """Show in the sidebar how many LLM calls wait for each model's quota."""
+    stats = rate_limit_stats()
+    if not stats:
+        return
+    lines = [
+        f"{key}: {s['queued']} queued, {s['rate_limited']} × 429, "
+        f"{s['waited_seconds']:.0f} s waited" for key, s in sorted(stats.items())
+    ]
+    st.sidebar.caption("LLM rate limits  \n" + "  \n".join(lines))
+
+
+def connection_pool_status() -> None:
+    """Show in the sidebar how often LLM calls reused a pooled connection."""
+    stats = {
+        provider: s
+        for provider, s in connection_pool_stats().items() if s['requests']
+    }
+    if not stats:
+        return
+    lines = [
+        f"{provider}: {s['reused']}/{s['requests']} calls reused, "
+        f"{s['connections']} new ({s['connect_seconds'] * 1000:.0f} ms)"
+        for provider, s in sorted(stats.items())
+    ]
+    st.sidebar.caption("LLM connections  \n" + "  \n".join(lines))
+
+
+def joined_runs_status() -> None:
+    """Show in the sidebar how many identical runs joined a running one."""
+    joined = get_job_manager().stats()['joined']
+    if joined:
+        st.sidebar.caption(f"Identical runs joined: {joined} crew runs saved")
+
+
+def model_routing(routes: Routes) -> None:
+    """Show in the sidebar which model each agent role and task runs on."""
+    lines = [f"Default: {routes.default.route}"]
+    lines += [f"{role}: {config.route}" for role, config in routes.agents]
+    lines += [
+        f"Task {index + 1}: {config.route}" for index, config in routes.tasks
+    ]
+    st.sidebar.caption("Model routing  \n" + "  \n".join(lines))
+
+
+def start_job(key: str,
+              page: str,
+              fn: Callable[[Job], Any],
+              dedup_key: Optional[str] = None) -> Job:
+    """Submit ``fn`` to the background job runner and remember it under ``key``.
+
+    The job id goes into the session state and into the URL, so the job is
+    found again after a rerun as well as after a reconnect. A job already
+    running under the same ``dedup_key`` is joined instead of started again.
+    """
+    job = get_job_manager().submit(page, fn, key=dedup_key)
+    st.session_state[key] = job.id
+    st.query_params[key] = job.id
+    return job
+
+
+def follow_job(key: str,
+               running_message: str,
+               show_progress: Optional[Callable[[Job], None]] = None
+               ) -> Optional[Job]:
+    """Poll the job remembered under ``key``.
+
+    While the job runs this shows ``running_message`` (plus
+    ``show_progress(job)`` if given, and the final answer as it streams in)
+    and reruns the page every second, so it does not return. A finished job
+    is returned once per session, to be copied into the session state;
+    otherwise the result is None.
+    """
+    job_id = st.session_state.get(key) or st.query_params.get(key)
+    job = get_job_manager().get(job_id) if job_id else None
+    if job is None:
+        return None
+    st.session_state[key] = job.id
+    if job.active:
+        st.info(running_message)
+        if show_progress is not None:
+            show_progress(job)
+        streamed = job.stream.text
+        if streamed:
+            st.markdown(streamed)
+        # Add a small delay to prevent excessive reruns
+        time.sleep(0.5 if streamed else 1)
+        st.rerun()
+    if st.session_state.get(f'{key}_collected') == job.id:
+        return None
+    st.session_state[f'{key}_collected'] = job.id
+    return job
+
+
+def _session_id() -> str:
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else 'local'
+
+
+def keep_run(key: str, run: dict) -> None:
+    """Store a finished run compactly and keep only its handle under ``key``.
+
+    ``run`` holds plain data: the answer, the task records and optionally a
+    ``RunProfile`` under ``'profile'``.
+    """
+    record = dict(run)
+    if record.get('profile') is not None:
+        record['profile'] = record['profile'].to_dict()
+    st.session_state[key] = get_run_records().put(_session_id(), record)
+
+
+def kept_run(key: str) -> Optional[dict]:
+    """Return the run kept under ``key``, or None if there is none left."""
+    handle = st.session_state.get(key)
+    if handle is None:
+        return None
+    run = get_run_records().get(handle)
+    if run is None:
+        # Evicted with its idle session or by newer runs
+        del st.session_state[key]
+        return None
+    if run.get('profile') is not None:
+        run = dict(run, profile=RunProfile.from_dict(run['profile']))
+    return run
+
+
+def run_downloads(key: str,
+                  run: dict,
+                  name: str,
+                  label: str = 'Download',
+                  format_label: str = 'Download format',
+                  save_label: str = 'Save {file_name}') -> None:
+    """Offer ``run`` for download in a format of the user's choice.
+
+    Nothing is rendered until the user presses ``label``; the bytes then go
+    straight from memory to a download button, without any file on disk.
+    """
+    choices = formats()
+    columns = st.columns([2, 1])
+    choice = columns[0].selectbox(format_label,
+                                  list(choices),
+                                  key=f'{key}_format',
+                                  label_visibility='collapsed')
+    if columns[1].button(label, key=f'{key}_download'):
+        file_name = f'{name}.{choices[choice].extension}'
+        st.download_button(save_label.format(file_name=file_name),
+                           data=export(run, choice),
+                           file_name=file_name,
+                           mime=choices[choice].mime,
+                           key=f'{key}_save')
+
+
+def session_footprint() -> None:
+    """Show in the sidebar how much memory and storage this session holds."""
+    state = 0
+    for value in list(st.session_state.values()):
+        try:
+            state += len(pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+        except Exception:
+            pass
+    records = get_run_records().footprint(_session_id())
+    st.sidebar.caption(
+        f"Session: {state / 1e3:.1f} kB in state, {records['records']} "
+        f"stored runs ({records['stored_bytes'] / 1e3:.1f} kB compressed, "
+        f"{records['cached_bytes'] / 1e3:.1f} kB in memory)")
+
+
+def run_profile_expander(profile: RunProfile) -> None:
+    """Render the timing waterfall and per-task breakdown of a run."""
+    # Only needed once a run has finished; keeps altair out of cold start
+    import altair as alt
+
+    with st.expander("Run profile"):
+        if not profile.tasks or profile.started is None:
+            st.write("No task timings were recorded for this run.")
+            return
+        origin = profile.started
+        bars = []
+        rows = []
+        for timing in sorted(profile.tasks, key=lambda t: t.index):
+            label = f"{timing.index + 1}. {timing.agent}"
+            end = timing.finished or timing.started or timing.ready
+            bars.append({'task': label, 'phase': 'queue wait',
+                         'start': timing.ready - origin,
+                         'end': (timing.started or timing.ready) - origin})
+            if timing.started is not None:
+                bars.append({'task': label, 'phase': 'task',
+                             'start': timing.started - origin,
+                             'end': end - origin})
+            for call in timing.llm_calls:
+                bars.append({'task': label, 'phase': 'LLM call',
+                             'start': call.started - origin,
+                             'end': (call.finished or end) - origin})
+            rows.append({
+                'task': label,
+                'queue wait (s)': round(timing.queue_wait, 2),
+                'duration (s)': round(timing.seconds, 2),
+                'LLM calls': len(timing.llm_calls),
+                'LLM latency (s)': round(timing.llm_seconds, 2),
+                'prompt tokens': timing.prompt_tokens,
+                'completion tokens': timing.completion_tokens,
+                'retries': timing.retries,
+                'context tokens saved': timing.context_tokens_saved,
+            })
+
+        st.caption(f"Wall clock {profile.seconds:.1f} s, waited "
+                   f"{profile.queue_wait:.1f} s for a free runner, "
+                   f"{sum(r['prompt tokens'] for r in rows)} prompt / "
+                   f"{sum(r['completion tokens'] for r in rows)} completion "
+                   "tokens, "
+                   f"{sum(r['context tokens saved'] for r in rows)} context "
+                   "tokens saved by compaction")
+        chart = alt.Chart(alt.Data(values=bars)).mark_bar().encode(
+            x=alt.X('start:Q', title='seconds since start'),
+            x2='end:Q',
+            y=alt.Y('task:N', sort=None, title=None),
+            color=alt.Color('phase:N',
+                            scale=alt.Scale(
+                                domain=['queue wait', 'task', 'LLM call'],
+                                range=['#d3d3d3', '#4c78a8', '#f58518'])),
+            tooltip=['task:N', 'phase:N', 'start:Q', 'end:Q'])
+        st.altair_chart(chart, use_container_width=True)
+        st.dataframe(rows, use_container_width=True)
+        st.dataframe([{
+            'model': route,
+            'LLM calls': r['calls'],
+            'LLM latency (s)': round(r['seconds'], 2),
+            'mean latency (s)': round(r['seconds'] / r['calls'], 2),
+            'prompt tokens': r['prompt_tokens'],
+            'completion tokens': r['completion_tokens'],
+        } for route, r in sorted(profile.by_route().items())],
+                     use_container_width=True)